@@ -0,0 +1,385 @@
+"""Benchmarks for parsing, solving, validating and session I/O.
+
+Builds a synthetic naming session, times the main entry points with timeit and
+writes the results as JSON so runs from different commits can be compared.
+
+Usage:
+
+    python benchmarks/bench_naming.py --output before.json
+    # ... change code ...
+    python benchmarks/bench_naming.py --output after.json --compare before.json
+
+The checkout's src directory is benchmarked, not an installed vfxnaming.
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+import vfxnaming as n  # noqa: E402
+from vfxnaming import naming  # noqa: E402
+from vfxnaming.logger import logger  # noqa: E402
+from vfxnaming.registry import get_registry  # noqa: E402
+
+RESULTS_VERSION = "1.0"
+
+
+def build_session(token_count: int = 20, option_count: int = 10, depth: int = 4) -> Dict:
+    """Fill the current session with synthetic tokens and rules.
+
+    Args:
+        token_count (int, optional): Number of option tokens. Defaults to 20.
+
+        option_count (int, optional): Options per token. Defaults to 10.
+
+        depth (int, optional): Length of the {@reference} chain. Defaults to 4.
+
+    Returns:
+        dict: {rule_name: [sample names]} valid for each rule.
+    """
+    n.reset_tokens()
+    n.reset_rules()
+    token_count = max(token_count, depth + 2, 4)
+    token_names = [f"t{index:02d}" for index in range(token_count)]
+    for token_name in token_names:
+        options = {
+            f"{token_name}opt{index:02d}": f"{token_name.upper()}O{index:02d}"
+            for index in range(option_count)
+        }
+        n.add_token(token_name, **options)
+    n.add_token_number("number")
+
+    flat = "_".join(f"{{{token_name}}}" for token_name in token_names[:6])
+    n.add_rule("flat", f"{flat}_{{number}}")
+    n.add_rule("repeated", "{t00}-{t01}_{t00}-{t01}_{t00}-{t01}_{number}")
+    n.add_rule("chain0", "{t00}_{t01}")
+    for index in range(1, depth + 1):
+        n.add_rule(f"chain{index}", f"{{@chain{index - 1}}}_{{{token_names[index + 1]}}}")
+    n.add_rule("path", "{t00}/{t01}/{t02}/{t00}_{t01}_{t02}_{number}.{t03}")
+
+    seeded = random.Random(1234)
+    samples = dict()
+    for rule_name in n.get_rules():
+        rule = n.get_rule(rule_name)
+        names = list()
+        for _ in range(50):
+            values = {
+                field: seeded.choice(list(n.get_token(field).options))
+                for field in rule.fields
+                if field != "number"
+            }
+            values["number"] = seeded.randint(1, 999)
+            names.append(n.solve(rule=rule_name, **values))
+        samples[rule_name] = names
+    n.set_active_rule("flat")
+    return samples
+
+
+def build_classify_session(
+    rule_count: int = 300, token_count: int = 20, option_count: int = 10
+) -> Tuple[n.NamingSession, List[str]]:
+    """Build a separate session with many rules to classify names against. A third
+    of the rules start with one of a few literal prefixes, the rest with a token.
+
+    Returns:
+        tuple: (NamingSession, sample names built with every third rule)
+    """
+    session = n.NamingSession()
+    seeded = random.Random(4321)
+    token_names = [f"t{index:02d}" for index in range(max(token_count, 5))]
+    names = list()
+    with session:
+        for token_name in token_names:
+            options = {
+                f"{token_name}opt{index:02d}": f"{token_name.upper()}O{index:02d}"
+                for index in range(option_count)
+            }
+            n.add_token(token_name, **options)
+        n.add_token_number("number")
+        for index in range(rule_count):
+            fields = seeded.sample(token_names, seeded.randint(2, 5))
+            pattern = "".join(f"{{{field}}}{seeded.choice('_-.')}" for field in fields)
+            if index % 3 == 0:
+                pattern = f"{seeded.choice(['chr', 'prp', 'env', 'set'])}_{pattern}"
+            n.add_rule(f"rule{index:03d}", f"{pattern}{{number}}")
+        for index in range(0, rule_count, 3):
+            rule = n.get_rule(f"rule{index:03d}")
+            values = {
+                field: seeded.choice(list(n.get_token(field).options))
+                for field in rule.fields
+                if field != "number"
+            }
+            names.append(n.solve(rule=rule.name, number=seeded.randint(1, 999), **values))
+    return session, names
+
+
+def collect_benchmarks(
+    samples: Dict,
+    repo: Path,
+    classify_session: n.NamingSession,
+    classify_names: List[str],
+) -> List[Tuple[str, Callable, int]]:
+    """
+    Returns:
+        list: (benchmark name, callable, calls per timing) for each benchmark.
+    """
+    deepest = max(
+        (name for name in samples if name.startswith("chain")),
+        key=lambda name: int(name[len("chain") :]),  # noqa: E203
+    )
+    benchmarks = list()
+
+    def over_names(function: Callable, names: List[str]) -> Callable:
+        def run():
+            for name in names:
+                function(name)
+
+        return run
+
+    for rule_name in ("flat", "repeated", deepest, "path"):
+        names = samples[rule_name]
+        rule = n.get_rule(rule_name)
+        values = n.parse(names[0], rule=rule_name)
+        benchmarks.extend(
+            [
+                (
+                    f"naming.parse[{rule_name}]",
+                    over_names(lambda name, r=rule_name: n.parse(name, rule=r), names),
+                    len(names),
+                ),
+                (
+                    f"naming.solve[{rule_name}]",
+                    lambda r=rule_name, v=values: n.solve(rule=r, **v),
+                    1,
+                ),
+                (
+                    f"naming.validate[{rule_name}]",
+                    over_names(lambda name, r=rule_name: n.validate(name, [r]), names),
+                    len(names),
+                ),
+                (f"Rule.parse[{rule_name}]", over_names(rule.parse, names), len(names)),
+                (
+                    f"Rule.validate[{rule_name}]",
+                    over_names(rule.validate, names),
+                    len(names),
+                ),
+            ]
+        )
+
+    # Names from other rules, the common case when auditing
+    mismatched = samples["path"] + samples["repeated"]
+    benchmarks.append(
+        (
+            "Rule.validate[flat,mismatch]",
+            over_names(n.get_rule("flat").validate, mismatched),
+            len(mismatched),
+        )
+    )
+
+    # Matching a name against every rule in a large set, classify() against a
+    # plain loop over each rule's own expression.
+    rule_count = len(classify_session.get_rules())
+    classify_rules = list(classify_session.get_rules().values())
+
+    def classify_loop():
+        with classify_session:
+            for name in classify_names:
+                [rule for rule in classify_rules if rule.regex().search(name)]
+
+    benchmarks.extend(
+        [
+            (
+                f"naming.classify[{rule_count} rules]",
+                over_names(classify_session.classify, classify_names),
+                len(classify_names),
+            ),
+            (
+                f"Rule.regex loop[{rule_count} rules]",
+                classify_loop,
+                len(classify_names),
+            ),
+        ]
+    )
+
+    def get_rules():
+        # Rules view is only built once per change, time building it
+        get_registry().rules_view = None
+        n.get_rules()
+
+    def save():
+        n.save_session(repo)
+
+    def load():
+        assert n.load_session(repo, use_snapshot=False)
+
+    def load_snapshot():
+        assert n.load_session(repo)
+
+    # Loading benchmarks need the repo written, even if saving isn't timed
+    save()
+    assert naming._load_session_snapshot(repo), f"Session snapshot not usable: {repo}"
+    benchmarks.extend(
+        [
+            ("rules.get_rules", get_rules, 1),
+            ("naming.save_session", save, 1),
+            ("naming.load_session", load, 1),
+            ("naming.load_session[snapshot]", load_snapshot, 1),
+        ]
+    )
+    return benchmarks
+
+
+def run_benchmarks(
+    benchmarks: List[Tuple[str, Callable, int]],
+    repeat: int = 5,
+    min_time: float = 0.2,
+    selected: str = "",
+) -> Dict:
+    """Time each benchmark repeat times, calling it enough times to take about
+    min_time seconds per timing.
+
+    Returns:
+        dict: {benchmark name: {'calls', 'repeat', 'best_us', 'median_us'}} with
+        microseconds per call.
+    """
+    results = dict()
+    for bench_name, function, calls in benchmarks:
+        if selected and selected not in bench_name:
+            continue
+        timer = timeit.Timer(function)
+        number, elapsed = timer.autorange()
+        number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+        timings = [
+            elapsed / (number * calls) * 1e6
+            for elapsed in timer.repeat(repeat=repeat, number=number)
+        ]
+        results[bench_name] = {
+            "calls": number * calls,
+            "repeat": repeat,
+            "best_us": round(min(timings), 3),
+            "median_us": round(statistics.median(timings), 3),
+        }
+        print(f"{bench_name:<40} {results[bench_name]['best_us']:>12.3f} us", flush=True)
+    return results
+
+
+def compare(results: Dict, baseline: Dict, threshold: float = 0.1) -> List[str]:
+    """Print best time ratios against a baseline run.
+
+    Returns:
+        list: Names of benchmarks slower than baseline by more than threshold.
+    """
+    regressions = list()
+    print(f"\n{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for bench_name, current in results.items():
+        previous = baseline.get("results", {}).get(bench_name)
+        if previous is None:
+            continue
+        ratio = current["best_us"] / max(previous["best_us"], 1e-9)
+        flag = ""
+        if ratio > 1.0 + threshold:
+            regressions.append(bench_name)
+            flag = "  SLOWER"
+        print(
+            f"{bench_name:<40} {previous['best_us']:>12.3f} "
+            f"{current['best_us']:>12.3f} {ratio:>8.2f}{flag}"
+        )
+    return regressions
+
+
+def git_revision() -> str:
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return output.stdout.strip()
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=20, help="Option tokens to create.")
+    parser.add_argument("--options", type=int, default=10, help="Options per token.")
+    parser.add_argument(
+        "--depth", type=int, default=4, help="Rule reference chain length."
+    )
+    parser.add_argument(
+        "--classify-rules", type=int, default=300, help="Rules to classify names with."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timings per benchmark.")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="Seconds per timing, roughly."
+    )
+    parser.add_argument(
+        "--filter", default="", help="Only run benchmarks containing this."
+    )
+    parser.add_argument("--output", type=Path, help="JSON file to write results to.")
+    parser.add_argument("--compare", type=Path, help="JSON results to compare against.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Ratio over baseline reported as a regression. Defaults to 0.1",
+    )
+    args = parser.parse_args(argv)
+
+    # Failed validations log warnings, keep them out of the timings
+    logger.logger_obj.setLevel(logging.ERROR)
+    repo = Path(tempfile.mkdtemp(prefix="vfxnaming_bench_"))
+    try:
+        samples = build_session(args.tokens, args.options, args.depth)
+        classify_session, classify_names = build_classify_session(
+            args.classify_rules, args.tokens, args.options
+        )
+        benchmarks = collect_benchmarks(samples, repo, classify_session, classify_names)
+        results = run_benchmarks(benchmarks, args.repeat, args.min_time, args.filter)
+    finally:
+        shutil.rmtree(repo, ignore_errors=True)
+
+    report = {
+        "version": RESULTS_VERSION,
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {
+            "tokens": args.tokens,
+            "options": args.options,
+            "depth": args.depth,
+            "classify_rules": args.classify_rules,
+            "repeat": args.repeat,
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(report, fp, indent=4)
+
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,16 @@
-from vfxnaming.naming import parse, solve, validate, get_repo, save_session, load_session  # noqa: F401
+from vfxnaming.naming import (  # noqa: F401
+    parse,
+    parse_many,
+    solve,
+    solve_many,
+    validate,
+    validate_many,
+    classify,
+    scan,
+    get_repo,
+    save_session,
+    load_session,
+)
 from vfxnaming.rules import (  # noqa: F401
     add_rule,
     remove_rule,
@@ -8,9 +20,14 @@ from vfxnaming.rules import (  # noqa: F401
     set_active_rule,
     get_rule,
     get_rules,
+    copy_rules,
+    get_rule_set,
     save_rule,
     load_rule,
     Rule,
+    RuleSet,
+    ValidationCode,
+    ValidationResult,
 )
 from vfxnaming.tokens import (  # noqa: F401
     add_token,
@@ -25,4 +42,6 @@ from vfxnaming.tokens import (  # noqa: F401
     Token,
     TokenNumber,
 )
+from vfxnaming.session import NamingSession  # noqa: F401
+from vfxnaming.watcher import SessionWatcher  # noqa: F401
 from vfxnaming.error import ParsingError, SolvingError, TokenError  # noqa: F401
@@ -1,9 +1,17 @@
 import logging
 import sys
 import json
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import date
 from pathlib import Path
-from typing import AnyStr, Tuple
+from typing import AnyStr, Iterator, Tuple, Union
+
+# {(level, message template): count} for messages held back by quiet_batch()
+_batch_counts: ContextVar[Union[Counter, None]] = ContextVar(
+    "vfxnaming_batch_counts", default=None
+)
 
 
 class Logger:
@@ -43,15 +51,34 @@ class Logger:
     def set_level(self, level):
         self.logger_obj.setLevel(level)
 
+    def is_enabled_for(self, level) -> bool:
+        """Check before building expensive log messages on hot paths.
+
+        Returns:
+            bool: True if a message with given level would be handled.
+        """
+        return self.logger_obj.isEnabledFor(level)
+
     def debug(self, msg: AnyStr, *args, **kwargs):
         self.logger_obj.debug(msg, *args, **kwargs)
 
     def info(self, msg: AnyStr, *args, **kwargs):
+        if self.__hold_back(logging.INFO, msg):
+            return
         self.logger_obj.info(msg, *args, **kwargs)
 
     def warning(self, msg: AnyStr, *args, **kwargs):
+        if self.__hold_back(logging.WARNING, msg):
+            return
         self.logger_obj.warning(msg, *args, **kwargs)
 
+    def __hold_back(self, level: int, msg: AnyStr) -> bool:
+        counts = _batch_counts.get()
+        if counts is None or not self.logger_obj.isEnabledFor(level):
+            return False
+        counts[(level, msg)] += 1
+        return True
+
     def error(self, msg: AnyStr, *args, **kwargs):
         self.logger_obj.error(msg, *args, **kwargs)
 
@@ -132,5 +159,66 @@ def init_logger(
 logger, logger_gui = init_logger("vfxnaming")
 
 
+def get_batch_counts() -> Union[Counter, None]:
+    """
+    Returns:
+        Counter: Messages held back by the quiet_batch() active in the current
+        thread or context, None if there's none.
+    """
+    return _batch_counts.get()
+
+
+@contextmanager
+def quiet_batch(summary_logger: Union[Logger, None] = None) -> Iterator[Counter]:
+    """Hold back info and warning messages logged in the current thread or context,
+    and log a summary of them on exit instead. Use it when working with many names
+    at once, e.g.: auditing a whole directory, so they don't flood the output.
+
+    Messages are grouped by their template, so log with %-style arguments
+    (e.g.: logger.warning("Name %s does not match", name)) for a useful summary.
+
+    .. code-block:: python
+
+        with quiet_batch():
+            invalid = [name for name in names if not n.validate(name)]
+
+    Args:
+        ``summary_logger`` (Logger, optional): Where to log the summary to.
+        Defaults to the vfxnaming logger.
+
+    Yields:
+        Counter: {(level, message template): count} of held back messages.
+    """
+    counts = _batch_counts.get()
+    if counts is not None:
+        # Nested batch, the outer one reports
+        yield counts
+        return
+    counts = Counter()
+    token = _batch_counts.set(counts)
+    try:
+        yield counts
+    finally:
+        _batch_counts.reset(token)
+        summary_logger = summary_logger or logger
+        for level in (logging.WARNING, logging.INFO):
+            messages = sorted(
+                (
+                    (count, msg)
+                    for (msg_level, msg), count in counts.items()
+                    if msg_level == level
+                ),
+                reverse=True,
+            )
+            if not messages:
+                continue
+            summary_logger.log(
+                level,
+                "%d messages held back during batch:\n%s",
+                sum(count for count, _ in messages),
+                "\n".join(f"    {count} x {msg}" for count, msg in messages),
+            )
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,196 @@
+import functools
+import math
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Tuple
+
+# Durations kept per (operation, rule) to compute percentiles from
+SAMPLES_SIZE = 1024
+PERCENTILES = (0.5, 0.9, 0.99)
+
+
+class Metrics(object):
+    """Call counts, latencies and cache counters collected from vfxnaming hot paths.
+
+    Disabled by default. While disabled, instrumented code only checks ``enabled``
+    and nothing is recorded.
+    """
+
+    def __init__(self):
+        self.enabled: bool = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # {(operation, rule_name): [count, total seconds, max seconds]}
+            self._calls: Dict[Tuple[str, str], List] = dict()
+            self._samples: Dict[Tuple[str, str], Deque[float]] = defaultdict(
+                functools.partial(deque, maxlen=SAMPLES_SIZE)
+            )
+            # {(counter, rule_name or ""): count}
+            self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    def record(self, operation: str, rule_name: str, seconds: float):
+        key = (operation, rule_name)
+        with self._lock:
+            calls = self._calls.get(key)
+            if calls is None:
+                calls = self._calls[key] = [0, 0.0, 0.0]
+            calls[0] += 1
+            calls[1] += seconds
+            calls[2] = max(calls[2], seconds)
+            self._samples[key].append(seconds)
+
+    def count(self, counter: str, rule_name: str = "", amount: int = 1):
+        with self._lock:
+            self._counters[(counter, rule_name)] += amount
+
+    def as_dict(self) -> Dict:
+        """
+        Returns:
+            dict: {'operations': {operation: {rule_name: {'count', 'total_seconds',
+            'max_seconds', 'p50', 'p90', 'p99'}}}, 'counters': {counter: {rule_name:
+            count}}, 'cache_hit_rates': {cache: rate}}. Rule name is '' for counters
+            not tied to a rule.
+        """
+        with self._lock:
+            calls = {key: list(value) for key, value in self._calls.items()}
+            samples = {key: sorted(value) for key, value in self._samples.items()}
+            counters = dict(self._counters)
+
+        operations = defaultdict(dict)
+        for (operation, rule_name), (count, total, maximum) in sorted(calls.items()):
+            stats = {"count": count, "total_seconds": total, "max_seconds": maximum}
+            for percentile in PERCENTILES:
+                stats[_percentile_key(percentile)] = _percentile(
+                    samples[(operation, rule_name)], percentile
+                )
+            operations[operation][rule_name] = stats
+
+        counters_dict = defaultdict(dict)
+        cache_totals = defaultdict(lambda: [0, 0])
+        for (counter, rule_name), count in sorted(counters.items()):
+            counters_dict[counter][rule_name] = count
+            for suffix, index in (("_cache_hits", 0), ("_cache_misses", 1)):
+                if counter.endswith(suffix):
+                    cache_totals[counter[: -len(suffix)]][index] += count
+        cache_hit_rates = {
+            cache: hits / float(hits + misses)
+            for cache, (hits, misses) in sorted(cache_totals.items())
+            if hits + misses
+        }
+        return {
+            "operations": dict(operations),
+            "counters": dict(counters_dict),
+            "cache_hit_rates": cache_hit_rates,
+        }
+
+    def to_prometheus(self, prefix: str = "vfxnaming") -> str:
+        """
+        Returns:
+            str: Collected metrics in Prometheus text exposition format.
+        """
+        data = self.as_dict()
+        lines = list()
+        if data["operations"]:
+            lines.append(f"# TYPE {prefix}_calls_total counter")
+            for operation, by_rule in data["operations"].items():
+                for rule_name, stats in by_rule.items():
+                    labels = _labels(operation=operation, rule=rule_name)
+                    lines.append(f"{prefix}_calls_total{{{labels}}} {stats['count']}")
+            lines.append(f"# TYPE {prefix}_call_seconds summary")
+            for operation, by_rule in data["operations"].items():
+                for rule_name, stats in by_rule.items():
+                    labels = _labels(operation=operation, rule=rule_name)
+                    for percentile in PERCENTILES:
+                        value = stats[_percentile_key(percentile)]
+                        lines.append(
+                            f'{prefix}_call_seconds{{{labels},quantile="{percentile}"}} '
+                            f"{value!r}"
+                        )
+                    total = stats["total_seconds"]
+                    lines.append(f"{prefix}_call_seconds_sum{{{labels}}} {total!r}")
+                    lines.append(
+                        f"{prefix}_call_seconds_count{{{labels}}} {stats['count']}"
+                    )
+        for counter, by_rule in data["counters"].items():
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            for rule_name, count in by_rule.items():
+                labels = f"{{{_labels(rule=rule_name)}}}" if rule_name else ""
+                lines.append(f"{prefix}_{counter}_total{labels} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    # Nearest rank on already sorted values
+    if not values:
+        return 0.0
+    rank = max(1, int(math.ceil(percentile * len(values))))
+    return values[rank - 1]
+
+
+def _percentile_key(percentile: float) -> str:
+    return f"p{int(percentile * 100)}"
+
+
+def _labels(**labels) -> str:
+    escaped = list()
+    for key, value in labels.items():
+        value = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        escaped.append(f'{key}="{value}"')
+    return ",".join(escaped)
+
+
+metrics = Metrics()
+
+
+def instrumented(operation: str) -> Callable:
+    """Decorator for Rule methods recording calls and latency per rule in metrics,
+    under given operation name.
+    """
+
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if not metrics.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                metrics.record(operation, self.name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def enable():
+    """Start collecting metrics."""
+    metrics.enabled = True
+
+
+def disable():
+    """Stop collecting metrics. Already collected ones are kept until reset()."""
+    metrics.enabled = False
+
+
+def is_enabled() -> bool:
+    return metrics.enabled
+
+
+def reset():
+    """Discard all collected metrics."""
+    metrics.reset()
+
+
+def get_metrics() -> Dict:
+    """See Metrics.as_dict()"""
+    return metrics.as_dict()
+
+
+def to_prometheus(prefix: str = "vfxnaming") -> str:
+    """See Metrics.to_prometheus()"""
+    return metrics.to_prometheus(prefix)
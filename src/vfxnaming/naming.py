@@ -19,22 +19,33 @@
 import os
 import re
 import json
+import hashlib
+import logging
 import traceback
 import shutil
+import tempfile
 import vfxnaming.rules as rules
 import vfxnaming.tokens as tokens
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import AnyStr, Dict, Union, Iterable
+from typing import AnyStr, Dict, List, Tuple, Union, Iterable, Iterator
 
-from vfxnaming.logger import logger
-from vfxnaming.error import SolvingError, RepoError
+from vfxnaming.logger import get_batch_counts, logger, quiet_batch
+from vfxnaming.metrics import metrics
+from vfxnaming.error import SolvingError, RepoError, RuleError, TokenError
+from vfxnaming.registry import Registry, activate_registry
+from vfxnaming.serialize import SESSION_SNAPSHOT_FILE, discard_session_snapshot
 
 
 NAMING_REPO_ENV = "NAMING_REPO"
+NAMING_CACHE_ENV = "NAMING_CACHE"
 
 
-def parse(name: AnyStr) -> Dict:
-    """Get metadata from a name string recognized by the currently active rule.
+def parse(name: AnyStr, rule: Union[str, rules.Rule, None] = None) -> Dict:
+    """Get metadata from a name string recognized by the currently active rule,
+    or by given rule.
 
     -For rules with repeated tokens:
 
@@ -45,16 +56,56 @@ def parse(name: AnyStr) -> Dict:
     Args:
         name (str): Name string e.g.: C_helmet_001_MSH
 
+        rule (str or Rule, optional): Rule to parse with. Defaults to the active rule.
+
+    Raises:
+        RuleError: Given rule could not be found in current session.
+
     Returns:
         dict: A dictionary with keys as tokens and values as given name parts.
         e.g.: {'side':'C', 'part':'helmet', 'number': 1, 'type':'MSH'}
     """
-    rule = rules.get_active_rule()
+    rule = _resolve_rule(rule)
     return rule.parse(name)
 
 
-def solve(*args, **kwargs) -> AnyStr:
-    """Given arguments are used to build a name following currently active rule.
+def parse_many(
+    names: Iterable[AnyStr],
+    rule: Union[str, rules.Rule, None] = None,
+    columnar: bool = False,
+    errors: Union[List, None] = None,
+) -> Union[List[Union[Dict, None]], Dict[str, List]]:
+    """Get metadata from many name strings at once. The rule is resolved and its
+    compiled pattern is reused for every name, and failures are reported in
+    ``errors`` instead of raising.
+
+    Args:
+        names (iterable): Name strings e.g.: ['C_helmet_001_MSH', 'L_helmet_002_MSH']
+
+        rule (str or Rule, optional): Rule to parse with. Defaults to the active rule.
+
+        columnar (bool, optional): If True, return {token: [value, ...]} instead of
+        a list of dictionaries, ready to be used as a DataFrame constructor.
+
+        errors (list, optional): If given, (index, name, error) tuples are appended
+        to it for every name that couldn't be parsed.
+
+    Raises:
+        RuleError: Given rule could not be found in current session.
+
+    Returns:
+        list: A dictionary per name, or None for names that couldn't be parsed.
+
+        dict: If columnar, {token: [value, ...]} with None for names that couldn't be
+        parsed.
+    """
+    rule = _resolve_rule(rule)
+    return rule.parse_many(names, columnar=columnar, errors=errors)
+
+
+def solve(*args, rule: Union[str, rules.Rule, None] = None, **kwargs) -> AnyStr:
+    """Given arguments are used to build a name following currently active rule,
+    or given rule.
 
     -For rules with repeated tokens:
 
@@ -73,70 +124,136 @@ def solve(*args, **kwargs) -> AnyStr:
 
     i.e.: side1='C', side4='L'
 
+    Args:
+        rule (str or Rule, optional): Rule to solve with. Defaults to the active rule.
+
     Raises:
         SolvingError: A required token was passed as None to keyword arguments.
         SolvingError: Missing argument for one field in currently active rule.
+        RuleError: Given rule could not be found in current session.
 
     Returns:
         str: A string with the resulting name.
     """
-    rule: rules.Rule = rules.get_active_rule()
+    rule = _resolve_rule(rule)
+    plan = rule.plan
+    field_tokens = [tokens.get_token(field) for field in plan.fields]
+    values = _solve_values(plan, field_tokens, args, kwargs)
+    logger.debug("Solving rule '%s' with values %s", rule.name, values)
+    return rule.solve(**values)
+
+
+def solve_many(
+    rows: Union[Iterable[Dict], Dict[str, Iterable]],
+    rule: Union[str, rules.Rule, None] = None,
+    errors: Union[List, None] = None,
+    as_generator: bool = False,
+) -> Union[List[Union[AnyStr, None]], Iterator[Union[AnyStr, None]]]:
+    """Build many names at once. Token objects and the rule's solving pattern are
+    resolved once for the whole batch, and rows that can't be solved are reported
+    in ``errors`` instead of raising.
+
+    Each row follows the same keyword arguments rules as solve(), including
+    repeated tokens with incremental digits, defaults and fallbacks.
+
+    Args:
+        rows (iterable or dict): Dictionaries of {token: value}, or a single
+        dictionary of {token: [value, ...]} columns with equal lengths.
+
+        rule (str or Rule, optional): Rule to solve with. Defaults to the active rule.
+
+        errors (list, optional): If given, (index, row, error) tuples are appended
+        to it for every row that couldn't be solved.
+
+        as_generator (bool, optional): If True, names are yielded as rows are
+        consumed instead of returned as a list. Defaults to False.
+
+    Raises:
+        RuleError: Given rule could not be found in current session.
+
+        SolvingError: Given columns do not have equal lengths.
+
+    Returns:
+        list: A name per row, or None for rows that couldn't be solved.
+    """
+    rule = _resolve_rule(rule)
+    plan = rule.plan
+    field_tokens = [tokens.get_token(field) for field in plan.fields]
+    digits_pattern = plan.digits_pattern
+
+    if isinstance(rows, dict):
+        keys = list(rows.keys())
+        columns = [list(rows[key]) for key in keys]
+        if len({len(column) for column in columns}) > 1:
+            raise SolvingError(f"Columns must have equal lengths: {', '.join(keys)}")
+        rows = (dict(zip(keys, values)) for values in zip(*columns))
+
+    def _solve_rows():
+        for index, row in enumerate(rows):
+            try:
+                values = _solve_values(plan, field_tokens, (), row)
+                yield digits_pattern.format(**values)
+            except KeyError as why:
+                if errors is not None:
+                    errors.append(
+                        (
+                            index,
+                            row,
+                            SolvingError(
+                                "Arguments passed do not match with naming rule "
+                                f"fields {rule.pattern}\n{why}"
+                            ),
+                        )
+                    )
+                yield None
+            except (SolvingError, TokenError) as why:
+                if errors is not None:
+                    errors.append((index, row, why))
+                yield None
+
+    if as_generator:
+        return _solve_rows()
+    return list(_solve_rows())
+
+
+def _solve_values(
+    plan: rules.RulePlan, field_tokens: List, args: Iterable, kwargs: Dict
+) -> Dict:
     # * This accounts for those cases where a token is used more than once in a rule
-    repeated_fields = dict()
-    for each in rule.fields:
-        if each not in repeated_fields.keys():
-            if rule.fields.count(each) > 1:
-                repeated_fields[each] = 1
-    fields_with_digits = list()
-    for each in rule.fields:
-        if each in repeated_fields.keys():
-            counter = repeated_fields.get(each)
-            repeated_fields[each] = counter + 1
-            fields_with_digits.append(f"{each}{counter}")
-        else:
-            fields_with_digits.append(each)
     values = {}
     i = 0
-    fields_inc = 0
-    for f in fields_with_digits:
-        token = tokens.get_token(rule.fields[fields_inc])
-        if token:
-            # Explicitly passed as keyword argument
-            if kwargs.get(f) is not None:
-                values[f] = token.solve(kwargs.get(f))
-                fields_inc += 1
-                continue
-            # Explicitly passed as keyword argument without repetitive digits
-            # Use passed argument for all field repetitions
-            elif kwargs.get(rule.fields[fields_inc]) is not None:
-                values[f] = token.solve(kwargs.get(rule.fields[fields_inc]))
-                fields_inc += 1
-                continue
-            elif token.required and kwargs.get(f) is None and len(args) == 0:
-                if isinstance(token, tokens.Token):
-                    if len(token.fallback):
-                        values[f] = token.fallback
-                        fields_inc += 1
-                        continue
-                else:
-                    raise SolvingError(
-                        f"Token {token.name} is required but was not passed."
-                    )
-            # Not required and not passed as keyword argument
-            elif not token.required and kwargs.get(f) is None:
-                values[f] = token.solve()
-                fields_inc += 1
-                continue
-            # Implicitly passed as positional argument
-            try:
-                values[f] = token.solve(args[i])
-                i += 1
-                fields_inc += 1
-                continue
-            except IndexError as why:
-                raise SolvingError(f"Missing argument for field '{f}'\n{why}")
-    logger.debug(f"Solving rule '{rule.name}' with values {values}")
-    return rule.solve(**values)
+    for f, field, token in zip(plan.fields_with_digits, plan.fields, field_tokens):
+        if not token:
+            # Remaining fields are left for rule.solve() to report as missing
+            break
+        # Explicitly passed as keyword argument
+        if kwargs.get(f) is not None:
+            values[f] = token.solve(kwargs.get(f))
+            continue
+        # Explicitly passed as keyword argument without repetitive digits
+        # Use passed argument for all field repetitions
+        elif kwargs.get(field) is not None:
+            values[f] = token.solve(kwargs.get(field))
+            continue
+        elif token.required and kwargs.get(f) is None and len(args) == 0:
+            if isinstance(token, tokens.Token):
+                if len(token.fallback):
+                    values[f] = token.fallback
+                    continue
+            else:
+                raise SolvingError(f"Token {token.name} is required but was not passed.")
+        # Not required and not passed as keyword argument
+        elif not token.required and kwargs.get(f) is None:
+            values[f] = token.solve()
+            continue
+        # Implicitly passed as positional argument
+        try:
+            values[f] = token.solve(args[i])
+            i += 1
+            continue
+        except IndexError as why:
+            raise SolvingError(f"Missing argument for field '{f}'\n{why}")
+    return values
 
 
 def validate(  # noqa: C901
@@ -175,35 +292,21 @@ def validate(  # noqa: C901
     Returns:
         list: List of validated rules. Empty list if no rule could be validated.
     """
-    previously_active_rule = rules.get_active_rule()
     if not len(with_rules):
-        with_rules = [previously_active_rule.name]
+        with_rules = [rules.get_active_rule().name]
     validated: Iterable[rules.Rule] = []
     for with_rule in with_rules:
         rule = rules.get_rule(with_rule)
         if not rule:
-            logger.warning(f"Rule {with_rule} not found.")
+            logger.warning("Rule %s not found.", with_rule)
             continue
 
-        rules.set_active_rule(with_rule)
         # * This accounts for those cases where a token is used more than once in a rule
-        repeated_fields = dict()
-        for each in rule.fields:
-            if each not in repeated_fields.keys():
-                if rule.fields.count(each) > 1:
-                    repeated_fields[each] = 1
-        fields_with_digits = list()
-        for each in rule.fields:
-            if each in repeated_fields.keys():
-                counter = repeated_fields.get(each)
-                repeated_fields[each] = counter + 1
-                fields_with_digits.append(f"{each}{counter}")
-            else:
-                fields_with_digits.append(each)
+        plan = rule.plan
         values = {}
         fields_inc = 0
-        for f in fields_with_digits:
-            token = tokens.get_token(rule.fields[fields_inc])
+        for f in plan.fields_with_digits:
+            token = tokens.get_token(plan.fields[fields_inc])
             if token:
                 # Explicitly passed as keyword argument
                 if kwargs.get(f) is not None:
@@ -212,29 +315,298 @@ def validate(  # noqa: C901
                     continue
                 # Explicitly passed as keyword argument without repetitive digits
                 # Use passed argument for all field repetitions
-                elif kwargs.get(rule.fields[fields_inc]) is not None:
-                    values[f] = token.solve(kwargs.get(rule.fields[fields_inc]))
+                elif kwargs.get(plan.fields[fields_inc]) is not None:
+                    values[f] = token.solve(kwargs.get(plan.fields[fields_inc]))
                     fields_inc += 1
                     continue
                 fields_inc += 1
-        logger.debug(f"Validating rule '{rule.name}' with values {values}")
+        logger.debug("Validating rule '%s' with values %s", rule.name, values)
         validation = rule.validate(name, strict, **values)
         if validation:
-            rules.set_active_rule(previously_active_rule)
             validated.append(rule)
-    rules.set_active_rule(previously_active_rule)
     if not len(validated):
-        logger.warning(
-            f"Could not validate {name} with any of the given "
-            f"rules {', '.join([rule for rule in with_rules])}."
-        )
-    else:
+        if logger.is_enabled_for(logging.WARNING):
+            logger.warning(
+                "Could not validate %s with any of the given rules %s.",
+                name,
+                ", ".join(with_rules),
+            )
+    elif logger.is_enabled_for(logging.INFO):
         logger.info(
-            f"Name {name} validated with rules: {', '.join([rule.name for rule in validated])}."
+            "Name %s validated with rules: %s.",
+            name,
+            ", ".join(rule.name for rule in validated),
         )
     return validated
 
 
+def _resolve_rule(rule: Union[str, rules.Rule, None]) -> rules.Rule:
+    if rule is None:
+        rule = rules.get_active_rule()
+        if rule is None:
+            raise RuleError("No active rule found in current session.")
+    elif not isinstance(rule, rules.Rule):
+        rule_name = rule
+        rule = rules.get_rule(rule_name)
+        if rule is None:
+            raise RuleError(f"Rule {rule_name} not found.")
+    return rule
+
+
+def classify(
+    name: AnyStr, with_rules: Union[Iterable[str], None] = None, strict: bool = False
+) -> List[Tuple[rules.Rule, Dict]]:
+    """Find which rules parse given name, scanning it once against all of them.
+
+    Args:
+        name (str): Name string e.g.: C_helmet_001_MSH
+
+        with_rules (list, optional): Rule names to classify against. Defaults to
+        all rules in current session.
+
+        strict (bool, optional): If False, it'll accept casing mismatches.
+
+    Raises:
+        RuleError: A given rule name could not be found in current session.
+
+    Returns:
+        list: (Rule, parsed dictionary) for each matching rule. Empty list if
+        no rule matches.
+    """
+    return rules.get_rule_set(with_rules, strict).match(name)
+
+
+def validate_many(
+    names: Iterable[AnyStr],
+    with_rules: Union[Iterable[Union[str, rules.Rule]], None] = None,
+    strict: bool = False,
+    workers: int = 1,
+    chunk_size: int = 2000,
+    as_generator: bool = False,
+) -> Union[List[int], Iterator[int]]:
+    """Validate many name strings against a list of rules.
+
+    With workers > 1 the current session is sent once to a pool of processes, and
+    names are sent to them in chunks of ``chunk_size``, so validation runs on
+    several cores. Only a few chunks are in flight at any time, so ``names`` can
+    be a lazy iterable of any size when ``as_generator`` is True.
+
+    Inside a vfxnaming.logger.quiet_batch() messages logged by workers are held
+    back too and added to its summary.
+
+    Args:
+        names (iterable): Name strings e.g.: ['C_helmet_001_MSH', 'L_helmet_002_MSH']
+
+        with_rules (list, optional): Rule names or Rule objects to validate against.
+        Defaults to the active rule.
+
+        strict (bool, optional): If False, it'll try to accept casing mismatches.
+
+        workers (int, optional): Number of processes to validate with. Defaults to 1,
+        validating in the current process.
+
+        chunk_size (int, optional): Number of names sent to a worker at once.
+
+        as_generator (bool, optional): If True, yield results as they're ready
+        instead of returning a list.
+
+    Raises:
+        RuleError: A given rule could not be found in current session.
+
+    Returns:
+        list: An int per name, in the same order, where bit ``i`` is set if the
+        name is valid for ``with_rules[i]``. e.g.: 0b101 validates with first and
+        third rules, 0 with none.
+    """
+    rule_objs = [_resolve_rule(rule) for rule in (with_rules or [None])]
+    if workers <= 1:
+        results = (_validation_bits(rule_objs, name, strict) for name in names)
+    else:
+        results = _validate_many_parallel(names, rule_objs, strict, workers, chunk_size)
+    if as_generator:
+        return results
+    return list(results)
+
+
+def _validation_bits(rule_objs: List[rules.Rule], name: AnyStr, strict: bool) -> int:
+    bits = 0
+    for index, rule in enumerate(rule_objs):
+        if rule.validate(name, strict):
+            bits |= 1 << index
+    return bits
+
+
+def _validate_many_parallel(
+    names: Iterable[AnyStr],
+    rule_objs: List[rules.Rule],
+    strict: bool,
+    workers: int,
+    chunk_size: int,
+) -> Iterator[int]:
+    payload = {
+        "tokens": [token.data() for token in tokens.get_tokens().values()],
+        "rules": [rule.data() for rule in rules.get_rules().values()],
+        "validate": [rule.data() for rule in rule_objs],
+        "strict": strict,
+    }
+    # Workers hold back their messages too, and send them back with results
+    batch_counts = get_batch_counts()
+    quiet = batch_counts is not None
+    names = iter(names)
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_validate_worker, initargs=(payload,)
+    ) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(names, chunk_size))
+            if chunk:
+                pending.append(executor.submit(_validate_chunk, chunk, quiet))
+            # Keep a couple of chunks per worker in flight, so memory stays bounded
+            while pending and (len(pending) >= workers * 2 or not chunk):
+                results, counts = pending.popleft().result()
+                if quiet:
+                    batch_counts.update(counts)
+                yield from results
+            if not chunk:
+                break
+
+
+# Set in validate_many() worker processes by _init_validate_worker()
+_worker_rules: List[rules.Rule] = []
+_worker_strict = False
+
+
+def _init_validate_worker(payload: Dict):
+    global _worker_rules, _worker_strict
+    activate_registry(Registry())
+    for data in payload["tokens"]:
+        tokens.load_token_data(data)
+    for data in payload["rules"]:
+        rules.load_rule_data(data)
+    _worker_rules = list()
+    for data in payload["validate"]:
+        # Registered rules keep their expansions memoized, copies expand on every use
+        rule = rules.get_rule(data.get("_name"))
+        if rule is None or rule.data() != data:
+            rule = rules.Rule.from_data(data)
+        _worker_rules.append(rule)
+    _worker_strict = payload["strict"]
+
+
+def _validate_chunk(names: List[AnyStr], quiet: bool = False) -> Tuple[List[int], Dict]:
+    if not quiet:
+        return [
+            _validation_bits(_worker_rules, name, _worker_strict) for name in names
+        ], {}
+    with quiet_batch() as counts:
+        results = [
+            _validation_bits(_worker_rules, name, _worker_strict) for name in names
+        ]
+        held_back = dict(counts)
+        # Parent process logs the summary
+        counts.clear()
+    return results, held_back
+
+
+def scan(
+    root: Union[Path, str],
+    with_rules: Union[Iterable[Union[str, rules.Rule]], None] = None,
+    recursive: bool = True,
+    match_path: bool = False,
+    prune: bool = True,
+    strict: bool = False,
+    include_dirs: bool = False,
+) -> Iterator[Tuple[Path, rules.Rule, Dict]]:
+    """Walk a directory and parse the names found in it as they're read, without
+    building any listing in memory.
+
+    Args:
+        root (Path): Directory to scan.
+
+        with_rules (list, optional): Rule names or Rule objects to parse with.
+        Defaults to the active rule.
+
+        recursive (bool, optional): If False, only entries directly under root are
+        scanned. Defaults to True.
+
+        match_path (bool, optional): If True, rules are matched against the path
+        relative to root, using '/' separators, instead of the entry name. Useful
+        for path rules like '{show}/{seq}/{shot}_{version}'. Defaults to False.
+
+        prune (bool, optional): When matching paths, skip directories that can't
+        be part of a path starting with the literal text at the beginning of any
+        of the rules. Defaults to True.
+
+        strict (bool, optional): If False, it'll accept casing mismatches.
+
+        include_dirs (bool, optional): If True, directories are parsed too, not
+        only files. Defaults to False.
+
+    Raises:
+        RuleError: A given rule could not be found in current session.
+
+    Yields:
+        tuple: (path, Rule, parsed dictionary) for each entry and each rule parsing it.
+    """
+    rule_objs = [_resolve_rule(rule) for rule in (with_rules or [None])]
+    rule_set = rules.RuleSet(rule_objs, strict)
+    prefixes = None
+    if match_path and prune:
+        prefixes = [_literal_prefix(rule, strict) for rule in rule_objs]
+        if any(prefix is None for prefix in prefixes):
+            # Some rule can match anywhere in the path, nothing can be pruned
+            prefixes = None
+
+    stack = [(str(root), "")]
+    while stack:
+        dirpath, relpath = stack.pop()
+        try:
+            entries = os.scandir(dirpath)
+        except OSError as why:
+            logger.debug(f"Could not scan {dirpath}\n{why}")
+            continue
+        subdirs = list()
+        with entries:
+            for entry in entries:
+                entry_relpath = f"{relpath}{entry.name}"
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    dir_relpath = f"{entry_relpath}/"
+                    if recursive and (
+                        prefixes is None or _may_contain(dir_relpath, prefixes, strict)
+                    ):
+                        subdirs.append((entry.path, dir_relpath))
+                    if not include_dirs:
+                        continue
+                name = entry_relpath if match_path else entry.name
+                for rule, parsed in rule_set.match(name):
+                    yield Path(entry.path), rule, parsed
+        # Depth first, keeping the order directories were found in
+        stack.extend(reversed(subdirs))
+
+
+def _literal_prefix(rule: rules.Rule, strict: bool) -> Union[str, None]:
+    """Literal text every name parsed by given rule starts with, or None if the
+    rule isn't anchored to the start.
+    """
+    if not rule.anchor & rules.Rule.ANCHOR_START:
+        return None
+    prefix = rule.plan.expanded_pattern.split("{", 1)[0]
+    return prefix if strict else prefix.lower()
+
+
+def _may_contain(dir_relpath: str, prefixes: List[str], strict: bool) -> bool:
+    if not strict:
+        dir_relpath = dir_relpath.lower()
+    return any(
+        dir_relpath.startswith(prefix) or prefix.startswith(dir_relpath)
+        for prefix in prefixes
+    )
+
+
 def validate_repo(repo: Path) -> bool:
     """Valides repo by checking if it contains a vfxnaming.conf file.
 
@@ -264,8 +636,8 @@ def validate_tokens_and_referenced_rules(pattern: str) -> bool:
     regex = re.compile(r"{(?P<placeholder>.+?)(:(?P<expression>(\\}|.)+?))?}")
     matches = regex.finditer(pattern)
 
-    all_rules = list(rules.get_rules().keys())
-    all_tokens = list(tokens.get_tokens().keys())
+    all_rules = rules.get_rules()
+    all_tokens = tokens.get_tokens()
 
     rules_used = []
     tokens_used = []
@@ -346,7 +718,9 @@ def get_repo(force_repo: Union[Path, str] = None) -> Path:
     raise RepoError(f"VFXNaming repo directory doesn't exist: {root}")
 
 
-def save_session(repo: Union[Path, None] = None, override=True):
+def save_session(
+    repo: Union[Path, None] = None, override=True, snapshot=True, incremental=False
+) -> Union[bool, Dict[str, List[str]]]:
     """Save rules, tokens and config files to the repository.
 
     Raises:
@@ -361,15 +735,25 @@ def save_session(repo: Union[Path, None] = None, override=True):
 
         ``override`` (bool, optional): If True, it'll remove given directory and recreate it.
 
+        ``snapshot`` (bool, optional): If True, it'll also write the whole session to a
+        single vfxnaming.session file that load_session() can read in one go.
+
+        ``incremental`` (bool, optional): If True, ``override`` is ignored and only files
+        whose content differs from current session are written, each one atomically.
+        Token and Rule files not in current session are removed.
+
     Returns:
         [bool]: True if saving session operation was successful.
+
+        [dict]: If incremental, {"added": [...], "changed": [...], "removed": [...]}
+        with the file names that were written or removed.
     """
     # Validations
     rules.validate_rules()
     tokens.validate_tokens()
 
     repo = repo or get_repo()
-    if override:
+    if override and not incremental:
         try:
             shutil.rmtree(repo)
         except (IOError, OSError) as why:
@@ -380,33 +764,355 @@ def save_session(repo: Union[Path, None] = None, override=True):
         except (IOError, OSError) as why:
             raise RepoError(why, traceback.format_exc())
 
-    # Save tokens
-    for name, token in tokens.get_tokens().items():
-        logger.debug(f"Saving token: {name} in {repo}")
-        tokens.save_token(name, repo)
-    # Save rules
-    for name, template in rules.get_rules().items():
-        if not isinstance(template, rules.Rule):
-            continue
-        logger.debug(f"Saving template: {name} in {repo}")
-        rules.save_rule(name, repo)
-    # extra configuration
     active = rules.get_active_rule()
     config = {"set_active_rule": active.name if active else None}
-    filepath = os.path.join(repo, "vfxnaming.conf")
-    logger.debug(f"Saving active rule: {active.name} in {filepath}")
-    with open(filepath, "w") as fp:
-        json.dump(config, fp, indent=4)
+    if incremental:
+        changes = _save_session_incremental(repo, config)
+    else:
+        # Save tokens
+        for name, token in tokens.get_tokens().items():
+            logger.debug(f"Saving token: {name} in {repo}")
+            tokens.save_token(name, repo)
+        # Save rules
+        for name, template in rules.get_rules().items():
+            if not isinstance(template, rules.Rule):
+                continue
+            logger.debug(f"Saving template: {name} in {repo}")
+            rules.save_rule(name, repo)
+        # extra configuration
+        filepath = os.path.join(repo, "vfxnaming.conf")
+        logger.debug(f"Saving active rule: {config['set_active_rule']} in {filepath}")
+        with open(filepath, "w") as fp:
+            json.dump(config, fp, indent=4)
+
+    if snapshot:
+        _save_session_snapshot(repo, config)
+    else:
+        discard_session_snapshot(repo)
+    if incremental:
+        return changes
     return True
 
 
-def load_session(repo: Union[Path, None] = None) -> bool:
+def _save_session_incremental(repo: Path, config: Dict) -> Dict[str, List[str]]:
+    """Write only the files whose content differs from current session and remove
+    the Token and Rule files that are no longer in it."""
+    expected = dict()
+    for name, token in tokens.get_tokens().items():
+        expected[f"{name}.token"] = token.data()
+    for name, rule in rules.get_rules().items():
+        expected[f"{name}.rule"] = rule.data()
+    expected["vfxnaming.conf"] = config
+
+    # load_session() reads Token and Rule files from subdirectories too, keep each
+    # one where it is. {file name: path relative to repo}
+    on_disk = dict()
+    removed = list()
+    for relative_path in sorted(_repo_manifest(repo).keys()):
+        file_name = relative_path.rsplit("/", 1)[-1]
+        if file_name == "vfxnaming.conf" and relative_path != file_name:
+            # Only the one at the root is read
+            continue
+        if file_name in expected and file_name not in on_disk:
+            on_disk[file_name] = relative_path
+        else:
+            removed.append(relative_path)
+
+    changes = {"added": [], "changed": [], "removed": []}
+    for relative_path in removed:
+        logger.debug(f"Removing: {relative_path} from {repo}")
+        try:
+            os.remove(repo / relative_path)
+        except (IOError, OSError) as why:
+            raise RepoError(why, traceback.format_exc())
+        changes["removed"].append(relative_path)
+
+    for file_name, data in expected.items():
+        relative_path = on_disk.get(file_name, file_name)
+        filepath = repo / relative_path
+        if file_name in on_disk:
+            try:
+                with open(filepath) as fp:
+                    saved_data = json.load(fp)
+            except (IOError, OSError, ValueError):
+                saved_data = None
+            # Round trip through JSON so tuples and lists compare equal
+            if saved_data == json.loads(json.dumps(data)):
+                continue
+            changes["changed"].append(relative_path)
+        else:
+            changes["added"].append(relative_path)
+        logger.debug(f"Saving: {relative_path} in {repo}")
+        indent = 4 if file_name == "vfxnaming.conf" else None
+        _write_json_atomic(filepath, data, indent=indent)
+    return changes
+
+
+def _write_json_atomic(filepath: Path, data, **kwargs):
+    """Write data to a temporary file next to filepath and rename it into place,
+    so readers never find a partially written file."""
+    _write_atomic(filepath, json.dumps(data, **kwargs).encode("utf-8"))
+
+
+def _write_atomic(filepath: Path, content: bytes):
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f".{filepath.name}.", suffix=".tmp", dir=filepath.parent
+    )
+    try:
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(content)
+        os.replace(temp_path, filepath)
+    except BaseException as why:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        if isinstance(why, (IOError, OSError)):
+            raise RepoError(why, traceback.format_exc())
+        raise
+
+
+def _session_payload(config: Dict) -> Dict:
+    return {
+        "tokens": [token.data() for token in tokens.get_tokens().values()],
+        "rules": [rule.data() for rule in rules.get_rules().values()],
+        "config": config,
+    }
+
+
+def _session_hash(payload: Dict) -> str:
+    content = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def _repo_manifest(repo: Path) -> Dict[str, List[int]]:
+    """Modification time and size of every file load_session() reads from given repo."""
+    manifest = dict()
+    for dirpath, dirnames, filenames in os.walk(repo):
+        for filename in filenames:
+            if filename.endswith((".token", ".rule")) or filename == "vfxnaming.conf":
+                filepath = Path(dirpath) / filename
+                stat = filepath.stat()
+                manifest[filepath.relative_to(repo).as_posix()] = [
+                    stat.st_mtime_ns,
+                    stat.st_size,
+                ]
+    return manifest
+
+
+def _repo_directories(repo: Path) -> List[str]:
+    """Every subdirectory of given repo, relative to it."""
+    directories = list()
+    for dirpath, dirnames, filenames in os.walk(repo):
+        for dirname in dirnames:
+            directories.append((Path(dirpath) / dirname).relative_to(repo).as_posix())
+    return directories
+
+
+def _snapshot_stamp(repo: Path, directories: Iterable[str]) -> Dict:
+    """Modification times of given repo subdirectories, which change when files are
+    added, removed or renamed in them, and of vfxnaming.conf."""
+    config = (repo / "vfxnaming.conf").stat()
+    return {
+        "directories": {
+            directory: (repo / directory).stat().st_mtime_ns for directory in directories
+        },
+        "config": [config.st_mtime_ns, config.st_size],
+    }
+
+
+def _save_session_snapshot(repo: Path, config: Dict):
+    manifest = _repo_manifest(repo)
+    saved_files = {f"{name}.token" for name in tokens.get_tokens().keys()}
+    saved_files.update(f"{name}.rule" for name in rules.get_rules().keys())
+    saved_files.add("vfxnaming.conf")
+    if set(manifest.keys()) != saved_files:
+        # The repo has files this session doesn't know about, the snapshot
+        # wouldn't describe what load_session() finds in it.
+        logger.debug(f"Repo {repo} has files not in current session, skipping snapshot")
+        discard_session_snapshot(repo)
+        return
+    payload = json.dumps(_session_payload(config), separators=(",", ":")).encode("utf-8")
+    # A header line to check the snapshot against before decoding the payload
+    header = {
+        "version": "1.1",
+        "hash": hashlib.sha256(payload).hexdigest(),
+        **_snapshot_stamp(repo, _repo_directories(repo)),
+    }
+    filepath = repo / SESSION_SNAPSHOT_FILE
+    logger.debug(f"Saving session snapshot: {filepath}")
+    content = json.dumps(header, separators=(",", ":")).encode("utf-8")
+    _write_atomic(filepath, content + b"\n" + payload)
+    # Renaming it into place changed the repo modification time, the snapshot keeps
+    # it as its own so changes to the repo root made after it can be told apart.
+    repo_mtime = repo.stat().st_mtime_ns
+    os.utime(filepath, ns=(repo_mtime, repo_mtime))
+
+
+def _load_session_snapshot(
+    repo: Path, lazy: bool = False, cache_dir: Union[Path, None] = None
+) -> bool:
+    """Load session from given repo snapshot if it's still up to date with the repo files.
+
+    Only the modification times of the repo directories and vfxnaming.conf are
+    checked, so Token and Rule files edited in place by other tools aren't noticed.
+    save_token(), save_rule() and save_session() keep the snapshot up to date.
+
+    Returns:
+        bool: True if session was loaded, False if snapshot is missing or outdated.
+    """
+    filepath = repo / SESSION_SNAPSHOT_FILE
+    try:
+        with open(filepath, "rb") as fp:
+            snapshot_mtime = os.fstat(fp.fileno()).st_mtime_ns
+            header = json.loads(fp.readline())
+            payload = fp.read()
+        if header.get("version") != "1.1":
+            logger.debug(f"Session snapshot version is not supported: {filepath}")
+            return False
+        stamp = _snapshot_stamp(repo, header["directories"].keys())
+        if (
+            repo.stat().st_mtime_ns != snapshot_mtime
+            or stamp["directories"] != header["directories"]
+            or stamp["config"] != header["config"]
+        ):
+            logger.debug(f"Session snapshot is outdated: {filepath}")
+            return False
+        if header["hash"] != hashlib.sha256(payload).hexdigest():
+            logger.warning(
+                f"Session snapshot content does not match its hash: {filepath}"
+            )
+            return False
+        payload = json.loads(payload)
+    except FileNotFoundError:
+        return False
+    except (IOError, OSError, ValueError, KeyError, TypeError, AttributeError) as why:
+        logger.warning(f"Session snapshot could not be read: {filepath}\n{why}")
+        return False
+
+    logger.debug(f"Loading session snapshot: {filepath}")
+    cache_key = _rules_cache_key(payload["rules"]) if cache_dir else None
+    cached_rules = _read_rules_cache(cache_dir, cache_key) if cache_dir else None
+    rules.reset_rules()
+    tokens.reset_tokens()
+    try:
+        for data in payload["tokens"]:
+            tokens.load_token_data(data)
+        _load_rules_data(payload["rules"], lazy, cached_rules)
+    except (RuleError, TokenError, ValueError) as why:
+        logger.warning(f"Session snapshot could not be loaded: {filepath}\n{why}")
+        return False
+    rules.set_active_rule(payload["config"].get("set_active_rule"))
+    if cache_dir and cached_rules is None and not lazy:
+        _write_rules_cache(cache_dir, cache_key)
+    return True
+
+
+def _load_rules_data(
+    rule_datas: List[Dict], lazy: bool = False, cached_rules: Union[Dict, None] = None
+):
+    cached_rules = cached_rules or {}
+    if lazy:
+        for data in rule_datas:
+            name = data.get("_name")
+            rules.add_lazy_rule(name, data, cached_rules.get(name))
+        return
+    loaded = [rules.Rule.from_data(data) for data in rule_datas]
+    # Registered all at once, so dependents are looked up and invalidated only once
+    rules.swap_rules(rule for rule in loaded if rule)
+    # Restore cached data once all rules are in, loading a rule resets its dependents
+    for rule in loaded:
+        if rule and rule.name in cached_rules and rules.get_rule(rule.name) is rule:
+            rule.load_cache_data(cached_rules[rule.name])
+
+
+def _get_cache_dir(cache_dir: Union[Path, str, None] = None) -> Union[Path, None]:
+    if cache_dir is None:
+        cache_dir = os.environ.get(NAMING_CACHE_ENV)
+    if not cache_dir:
+        return None
+    return Path(cache_dir)
+
+
+def _rules_cache_key(rule_datas: List[Dict]) -> str:
+    """Hash of the rules content, independent of the order rules were loaded in."""
+    return _session_hash(
+        {"rules": sorted(rule_datas, key=lambda data: str(data.get("_name")))}
+    )
+
+
+def _read_rules_cache(cache_dir: Path, cache_key: str) -> Union[Dict, None]:
+    """Read rules metadata cached by a previous load_session() of the same rules.
+
+    Returns:
+        dict: {rule_name: Rule.cache_data()} or None if there's no usable cache.
+    """
+    filepath = cache_dir / f"{cache_key}.json"
+    cache = None
+    if filepath.is_file():
+        try:
+            with open(filepath) as fp:
+                cache = json.load(fp)
+            if cache["version"] != "1.1" or not isinstance(cache["rules"], dict):
+                cache = None
+        except (IOError, OSError, ValueError, KeyError, TypeError) as why:
+            logger.warning(f"Rules cache could not be read: {filepath}\n{why}")
+            cache = None
+    if metrics.enabled:
+        metrics.count("rules_cache_misses" if cache is None else "rules_cache_hits")
+    if cache is None:
+        return None
+    logger.debug(f"Using rules cache: {filepath}")
+    return cache["rules"]
+
+
+def _write_rules_cache(cache_dir: Path, cache_key: str):
+    cached_rules = dict()
+    for name, rule in rules.get_rules().items():
+        try:
+            cached_rules[name] = rule.cache_data()
+        except (RuleError, ValueError) as why:
+            logger.debug(f"Rule {name} could not be cached\n{why}")
+    filepath = cache_dir / f"{cache_key}.json"
+    logger.debug(f"Saving rules cache: {filepath}")
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _write_json_atomic(
+            filepath, {"version": "1.1", "rules": cached_rules}, separators=(",", ":")
+        )
+    except (OSError, RepoError) as why:
+        logger.warning(f"Rules cache could not be saved: {filepath}\n{why}")
+
+
+def load_session(
+    repo: Union[Path, None] = None,
+    use_snapshot: bool = True,
+    workers: int = 1,
+    lazy: bool = False,
+    cache_dir: Union[Path, str, None] = None,
+) -> bool:
     """Load rules, tokens and config from a repository, and create
     Python objects in memory to work with them.
 
+    If the repository has an up to date vfxnaming.session snapshot, written by
+    save_session(), the whole session is read from it instead of one file per object.
+
     Args:
         repo (Path, optional): Absolute path to a repository. Defaults to None.
 
+        use_snapshot (bool, optional): If False, always read one file per object.
+
+        workers (int, optional): Number of threads used to read and decode Token
+        and Rule files concurrently. Useful on high latency storage. Objects are
+        always registered in the same order, sorted by file path. Defaults to 1.
+
+        lazy (bool, optional): If True, rules are only indexed by name and each one
+        is read, built and compiled the first time it's used. Defaults to False.
+
+        cache_dir (Path, optional): Directory to keep expanded patterns, fields and
+        regex sources of loaded rules in, keyed by the rules content hash. Later
+        sessions loading the same rules, in this or other processes, reuse them
+        instead of building them again. Defaults to NAMING_CACHE env variable, if
+        set, otherwise no cache is used.
+
     Returns:
         bool: True if loading session operation was successful.
     """
@@ -418,22 +1124,80 @@ def load_session(repo: Union[Path, None] = None) -> bool:
     if not namingconf.exists():
         logger.warning(f"Repo is not valid. vfxnaming.conf not found {namingconf}")
         return False
-    rules.reset_rules()
-    tokens.reset_tokens()
-    # tokens and rules
+    cache_dir = _get_cache_dir(cache_dir)
+    if use_snapshot and _load_session_snapshot(repo, lazy, cache_dir):
+        return True
+
+    token_paths = list()
+    rule_paths = list()
     for dirpath, dirnames, filenames in os.walk(repo):
         for filename in filenames:
-            filepath = Path(dirpath) / filename
             if filename.endswith(".token"):
-                logger.debug(f"Loading token: {filepath}")
-                tokens.load_token(filepath)
+                token_paths.append(Path(dirpath) / filename)
             elif filename.endswith(".rule"):
-                logger.debug(f"Loading rule: {filepath}")
-                rules.load_rule(filepath)
+                rule_paths.append(Path(dirpath) / filename)
+    token_paths.sort()
+    rule_paths.sort()
+    token_datas = _read_json_files(token_paths, workers)
+    logger.debug(f"Loading active rule: {namingconf}")
+    with open(namingconf) as fp:
+        config = json.load(fp)
+
+    rules.reset_rules()
+    tokens.reset_tokens()
+    # tokens and rules
+    for filepath, data in zip(token_paths, token_datas):
+        logger.debug(f"Loading token: {filepath}")
+        if data is not None:
+            tokens.load_token_data(data)
+    if lazy:
+        for filepath in rule_paths:
+            rules.add_lazy_rule(filepath.stem, filepath)
+    else:
+        rule_datas = list()
+        for filepath, data in zip(rule_paths, _read_json_files(rule_paths, workers)):
+            logger.debug(f"Loading rule: {filepath}")
+            if data is not None:
+                rule_datas.append(data)
+        cache_key = _rules_cache_key(rule_datas) if cache_dir else None
+        cached_rules = _read_rules_cache(cache_dir, cache_key) if cache_dir else None
+        _load_rules_data(rule_datas, cached_rules=cached_rules)
+        if cache_dir and cached_rules is None:
+            _write_rules_cache(cache_dir, cache_key)
     # extra configuration
-    if namingconf.exists():
-        logger.debug(f"Loading active rule: {namingconf}")
-        with open(namingconf) as fp:
-            config = json.load(fp)
-        rules.set_active_rule(config.get("set_active_rule"))
+    rules.set_active_rule(config.get("set_active_rule"))
     return True
+
+
+def _read_json_files(filepaths: List[Path], workers: int = 1) -> List[Union[Dict, None]]:
+    """Read and decode given JSON files, using a thread pool if workers > 1.
+
+    Returns:
+        list: Decoded data for each file, in the same order. None for files
+        that couldn't be read.
+    """
+    if workers <= 1 or len(filepaths) <= 1:
+        return _read_json_batch(filepaths)
+    # Batch files so each task reads several of them, keeping executor overhead low
+    batch_size = max(1, len(filepaths) // (workers * 4))
+    batches = [
+        filepaths[index : index + batch_size]  # noqa: E203
+        for index in range(0, len(filepaths), batch_size)
+    ]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list()
+        for batch in executor.map(_read_json_batch, batches):
+            results.extend(batch)
+    return results
+
+
+def _read_json_batch(filepaths: List[Path]) -> List[Union[Dict, None]]:
+    results = list()
+    for filepath in filepaths:
+        try:
+            with open(filepath) as fp:
+                results.append(json.load(fp))
+        except Exception:
+            logger.debug(f"Could not read: {filepath}")
+            results.append(None)
+    return results
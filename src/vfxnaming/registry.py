@@ -0,0 +1,61 @@
+import threading
+from contextvars import ContextVar, Token as ContextToken
+
+
+class Registry(object):
+    """Tokens, rules and everything built from them for one naming session.
+
+    Module functions in vfxnaming.tokens and vfxnaming.rules work with the
+    registry active in the current thread or context, see activate_registry().
+
+    Reading is safe from any number of threads. Changes to the registry and lazy
+    rule builds are serialized with ``lock``.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tokens = dict()
+        self.rules = {"_active": None}
+        # Rules registered but not built yet.
+        # {rule_name: (.rule file Path or Rule.data() dict,
+        #              Rule.cache_data() dict or None)}
+        self.lazy_rules = dict()
+        self.rule_sets = dict()
+        self.rules_view = None
+        self.generation = 0
+        # Expanded patterns of registered rules, computed once.
+        # {rule_name: expanded pattern}
+        self.expansions = dict()
+        # Registered rules referencing each rule name.
+        # {rule_name: {referencing rule_name}}
+        self.dependents = dict()
+
+
+_default_registry = Registry()
+_current_registry = ContextVar("vfxnaming_registry", default=_default_registry)
+
+
+def get_registry() -> Registry:
+    """
+    Returns:
+        Registry: Registry active in the current thread or context. Defaults to the
+        process wide registry used by the module functions.
+    """
+    return _current_registry.get()
+
+
+def get_default_registry() -> Registry:
+    return _default_registry
+
+
+def activate_registry(registry: Registry) -> ContextToken:
+    """Make given registry the active one for the current thread or context.
+
+    Returns:
+        contextvars.Token: Pass it to restore_registry() to go back to the previous one.
+    """
+    return _current_registry.set(registry)
+
+
+def restore_registry(token: ContextToken):
+    _current_registry.reset(token)
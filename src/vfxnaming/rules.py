@@ -1,24 +1,193 @@
 import functools
 import json
+import logging
 import re
 import traceback
-from collections import defaultdict
+from collections import Counter, defaultdict
 from copy import deepcopy
+from enum import IntEnum
 from pathlib import Path
-from typing import AnyStr, Dict, Tuple, Union
-
-from vfxnaming.error import ParsingError, RuleError, SolvingError
+from types import MappingProxyType
+from typing import (
+    AnyStr,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Tuple,
+    Union,
+)
+
+from vfxnaming.error import ParsingError, RuleError, SolvingError, TokenError
 from vfxnaming.logger import logger
-from vfxnaming.serialize import Serializable
-from vfxnaming.tokens import TokenNumber, get_token
+from vfxnaming.metrics import instrumented, metrics
+from vfxnaming.registry import (
+    Registry,
+    activate_registry,
+    get_registry,
+    restore_registry,
+)
+from vfxnaming.serialize import Serializable, discard_session_snapshot
+from vfxnaming.tokens import TokenNumber, get_token, tokens_revision
+
+
+def _in_own_registry(method: Callable) -> Callable:
+    """Decorator for Rule methods making the registry the Rule is registered in the
+    active one while they run, so referenced rules and tokens are looked up there
+    whichever session is active when they're called.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        registry = self._registry
+        if registry is None or registry is get_registry():
+            return method(self, *args, **kwargs)
+        token = activate_registry(registry)
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            restore_registry(token)
+
+    return wrapper
+
+
+class RulePlan(NamedTuple):
+    """Everything parse, solve and validate derive from a Rule's pattern, computed
+    once per expanded pattern and shared by every call.
+
+    Attributes:
+        ``expanded_pattern`` (str): Pattern with all referenced rules expanded.
+
+        ``fields`` (tuple): Token names in pattern order, repetitions included.
+
+        ``repeated_fields`` (tuple): Token names used more than once in the pattern.
+
+        ``fields_with_digits`` (tuple): Fields with an incremental digit appended
+        to repeated tokens. e.g.: ('side1', 'region', 'side2')
+
+        ``expected_separators`` (tuple): Separators found in the pattern outside tokens.
+
+        ``digits_pattern`` (str): Format string used to solve names.
+
+        ``groups`` (tuple): (regex group, token name, result key) for each placeholder,
+        sorted by regex group name.
+
+        ``literals`` (tuple): Fixed text between placeholders, in pattern order.
+
+        ``prefix`` (str): Literal text the pattern starts with, if any.
+
+        ``suffix`` (str): Literal text the pattern ends with, if any.
+
+        ``separator_counts`` (tuple): (separator, count) found in literals. Names
+        need at least that many of each separator to match.
+
+        ``min_length`` (int): Shortest text the pattern can match.
 
-_rules = {"_active": None}
+        ``max_length`` (int): Longest text the pattern can match. None if unbounded.
+    """
+
+    expanded_pattern: str
+    fields: Tuple[str, ...]
+    repeated_fields: Tuple[str, ...]
+    fields_with_digits: Tuple[str, ...]
+    expected_separators: Tuple[str, ...]
+    digits_pattern: str
+    groups: Tuple[Tuple[str, str, str], ...]
+    literals: Tuple[str, ...]
+    prefix: str
+    suffix: str
+    separator_counts: Tuple[Tuple[str, int], ...]
+    min_length: int
+    max_length: Union[int, None]
+
+
+class ValidationCode(IntEnum):
+    """Why a name did not validate with a Rule. See Rule.validate_result()"""
+
+    OK = 0
+    #: Rule's pattern has no separators, names can't be validated with it.
+    NO_SEPARATORS = 1
+    #: Name doesn't have the separators the pattern needs.
+    SEPARATORS_MISMATCH = 2
+    #: Name doesn't match the pattern.
+    NO_MATCH = 3
+    #: Token value is not the one given to validate with.
+    VALUE_MISMATCH = 4
+    #: Token value is the one given to validate with, but casing is different.
+    CASING_MISMATCH = 5
+    #: Token value is not one of its options.
+    UNKNOWN_OPTION = 6
+    #: TokenNumber value doesn't start with its prefix.
+    MISSING_PREFIX = 7
+    #: TokenNumber value doesn't end with its suffix.
+    MISSING_SUFFIX = 8
+    #: TokenNumber value is not digits between its prefix and suffix.
+    NOT_DIGITS = 9
+    #: TokenNumber value doesn't have its padding.
+    PADDING = 10
+
+
+class ValidationResult(object):
+    """Outcome of validating a name with a Rule. Truthy if the name is valid.
+
+    Attributes:
+        ``code`` (ValidationCode): OK or why the name failed.
+
+        ``rule`` (str): Name of the Rule validated with.
+
+        ``token`` (str): Token or result key that failed, if any.
+
+        ``value`` (str): Offending part of the name, or separators count for
+        SEPARATORS_MISMATCH.
+
+        ``expected`` : What the Rule expected instead. Value given to validate
+        with, separators count, prefix, suffix, (prefix, suffix) or padding.
+    """
+
+    __slots__ = ("code", "rule", "token", "value", "expected")
+
+    def __init__(
+        self,
+        code: ValidationCode,
+        rule: AnyStr,
+        token: Union[AnyStr, None] = None,
+        value=None,
+        expected=None,
+    ):
+        self.code: ValidationCode = code
+        self.rule: AnyStr = rule
+        self.token: Union[AnyStr, None] = token
+        self.value = value
+        self.expected = expected
+
+    def __bool__(self) -> bool:
+        return self.code == ValidationCode.OK
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return all(getattr(self, each) == getattr(other, each) for each in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash((self.code, self.rule, self.token, self.value))
+
+    def __repr__(self) -> str:
+        return (
+            f"ValidationResult({self.code.name}, rule={self.rule!r}, "
+            f"token={self.token!r}, value={self.value!r}, expected={self.expected!r})"
+        )
 
 
 class Rule(Serializable):
     """Each rule is managed by an instance of this class. Fields exist for each
     Token and Separator used in the rule definition.
 
+    Once registered in a session, a Rule looks up referenced rules and tokens in
+    that session, even if another one is active when it's used.
+
     Args:
         ``name`` (str): Name that best describes the rule, this will be used as a way
         to query the Rule object.
@@ -41,6 +210,11 @@ class Rule(Serializable):
     )
     __SEPARATORS_REGEX = re.compile(r"[_\-\.:\|/\\]")
     __RULE_REFERENCE_REGEX = re.compile(r"{@(?P<reference>.+?)}")
+    __DEFAULT_EXPRESSION = r"[\w_.\-/:]+"
+    __DEFAULT_REGEX = re.compile(__DEFAULT_EXPRESSION)
+    __PLACEHOLDER_REGEX = re.compile(
+        r"{(?P<placeholder>.+?)(:(?P<expression>(\\}|.)+?))?}"
+    )
     __AT_CODE = "_FXW_"
     ANCHOR_START, ANCHOR_END, ANCHOR_BOTH = (1, 2, 3)
 
@@ -52,7 +226,23 @@ class Rule(Serializable):
             self._nice_name = nice_name
         self._pattern: str = pattern
         self._anchor: int = anchor
-        self._regex: re.Pattern = self.__build_regex()
+        self._regex_cache: Dict[Tuple[str, int, bool], re.Pattern] = {}
+        # Regex sources restored with load_cache_data(). {expanded_pattern: source}
+        self._regex_sources: Dict[str, str] = {}
+        self._plan: Union[RulePlan, None] = None
+        self._references: Union[Tuple[str, ...], None] = None
+        # {strict: (registry, tokens revision, expanded pattern, validator or None)}
+        self._validators: Dict[bool, Tuple] = {}
+        # Registry this Rule was registered in, None if it never was
+        self._registry: Union[Registry, None] = None
+
+    def __getstate__(self) -> Dict:
+        # Copies aren't registered anywhere, and registries can't be copied
+        state = self.__dict__.copy()
+        state["_registry"] = None
+        # Validators are cached per registry
+        state["_validators"] = {}
+        return state
 
     def data(self) -> Dict:
         """Collect all data for this object instance.
@@ -101,6 +291,8 @@ class Rule(Serializable):
         )
         return this
 
+    @instrumented("solve")
+    @_in_own_registry
     def solve(self, **values) -> AnyStr:
         """Given arguments are used to build a name.
 
@@ -113,7 +305,7 @@ class Rule(Serializable):
         result = None
 
         try:
-            result = self.__digits_pattern().format(**values)
+            result = self.__plan().digits_pattern.format(**values)
         except KeyError as why:
             raise SolvingError(
                 f"Arguments passed do not match with naming rule fields {self._pattern}\n{why}"
@@ -121,6 +313,61 @@ class Rule(Serializable):
 
         return result
 
+    @_in_own_registry
+    def might_match(self, name: AnyStr, strict: bool = False) -> bool:
+        """Cheap checks of name length, separators and fixed text in this Rule's
+        pattern, so names that can't match are skipped without running the regex.
+
+        Args:
+            name (str): Name string e.g.: C_helmet_001_MSH
+
+            strict (bool, optional): If False, fixed text is compared ignoring casing.
+
+        Returns:
+            bool: False if name can't match this Rule. True if it might, the regex
+            has the final word.
+        """
+        return self.__might_match(name, strict)
+
+    def __might_match(self, name: AnyStr, strict: bool = False) -> bool:
+        plan = self.__plan()
+        if len(name) < plan.min_length:
+            return False
+        if (
+            plan.max_length is not None
+            and self._anchor == self.ANCHOR_BOTH
+            and len(name) > plan.max_length
+        ):
+            return False
+        for separator, count in plan.separator_counts:
+            if name.count(separator) < count:
+                return False
+
+        literals = plan.literals
+        prefix = plan.prefix
+        suffix = plan.suffix
+        if not strict:
+            # Only ASCII casing can be compared reliably without the regex engine
+            if not name.isascii() or not plan.expanded_pattern.isascii():
+                return True
+            name = name.lower()
+            literals = [literal.lower() for literal in literals]
+            prefix = prefix.lower()
+            suffix = suffix.lower()
+        if self._anchor & self.ANCHOR_START and not name.startswith(prefix):
+            return False
+        if self._anchor & self.ANCHOR_END and not name.endswith(suffix):
+            return False
+        position = 0
+        for literal in literals:
+            position = name.find(literal, position)
+            if position < 0:
+                return False
+            position += len(literal)
+        return True
+
+    @instrumented("parse")
+    @_in_own_registry
     def parse(self, name: AnyStr) -> Union[Dict, None]:
         """Build and return dictionary with keys as tokens and values as given names.
 
@@ -135,11 +382,8 @@ class Rule(Serializable):
             dict: A dictionary with keys as tokens and values as given name parts.
             e.g.: {'side':'C', 'part':'helmet', 'number': 1, 'type':'MSH'}
         """
-        extract_tokens = self.__EXTRACT_FIELDS_REGEX.findall(self._pattern)
-        pattern_wout_tokens = self._pattern
-        for each in extract_tokens:
-            pattern_wout_tokens = pattern_wout_tokens.replace(each, "XYZ")
-        expected_separators = self.__SEPARATORS_REGEX.findall(pattern_wout_tokens)
+        plan = self.__plan()
+        expected_separators = plan.expected_separators
         if len(expected_separators) <= 0:
             logger.warning(
                 f"No separators used for rule '{self.name}', parsing is not possible."
@@ -148,33 +392,20 @@ class Rule(Serializable):
         name_separators = self.__SEPARATORS_REGEX.findall(name)
         if len(expected_separators) <= len(name_separators):
             parsed = {}
-            regex = self.__build_regex()
+            if not self.__might_match(name):
+                return parsed
+            regex = self.__compiled_regex()
             match = regex.search(name)
             if match:
-                name_parts = sorted(match.groupdict().items())
-                name_parts_str = ", ".join(
-                    [f"('{k[:-3]}': '{v}')" for k, v in name_parts]
-                )
-                logger.debug(f"Name parts: {name_parts_str}")
-                repeated_fields = {}
-                for each in self.fields:
-                    if each not in repeated_fields.keys():
-                        if self.fields.count(each) > 1:
-                            repeated_fields[each] = 1
-                if repeated_fields:
-                    logger.debug(f"Repeated tokens: {', '.join(repeated_fields.keys())}")
-
-                for key, value in name_parts:
-                    # Strip number that was added to make group name unique
-                    token_name = key[:-3]
+                name_parts = match.groupdict()
+                if logger.is_enabled_for(logging.DEBUG):
+                    self.__log_name_parts(plan, name_parts)
+
+                for group, token_name, key in plan.groups:
                     token = get_token(token_name)
                     if not token:
                         continue
-                    if token_name in repeated_fields.keys():
-                        counter = repeated_fields.get(token_name)
-                        repeated_fields[token_name] = counter + 1
-                        token_name = f"{token_name}{counter}"
-                    parsed[token_name] = token.parse(value)
+                    parsed[key] = token.parse(name_parts[group])
             return parsed
         else:
             raise ParsingError(
@@ -182,7 +413,86 @@ class Rule(Serializable):
                 f"and rule's pattern '{self._pattern}':'{len(expected_separators)}'."
             )
 
-    def validate(self, name: AnyStr, strict: bool = False, **validate_values) -> bool:  # noqa: C901
+    @instrumented("parse_many")
+    @_in_own_registry
+    def parse_many(  # noqa: C901
+        self,
+        names: Iterable[AnyStr],
+        columnar: bool = False,
+        errors: Union[List, None] = None,
+    ) -> Union[List[Union[Dict, None]], Dict[str, List]]:
+        """Parse many names reusing this Rule's plan, compiled regex and tokens.
+
+        Names that can't be parsed don't raise. They get None in the results, so
+        indexes keep matching the given names, and are reported in ``errors``.
+
+        Args:
+            names (iterable): Name strings e.g.: ['C_helmet_001_MSH', 'L_helmet_002_MSH']
+
+            columnar (bool, optional): If True, return a dictionary of lists with one
+            list of values per token instead of a list of dictionaries. Defaults to False.
+
+            errors (list, optional): If given, (index, name, error) tuples are appended
+            to it for every name that couldn't be parsed.
+
+        Returns:
+            list: A dictionary per name, same as parse() returns, or None for failures.
+
+            dict: If columnar, {token: [value, ...]} with None for failures.
+        """
+        plan = self.__plan()
+        regex = self.__compiled_regex()
+        resolved = list()
+        for group, token_name, key in plan.groups:
+            token = get_token(token_name)
+            if token:
+                resolved.append((group, key, token.parse))
+        expected_count = len(plan.expected_separators)
+        if expected_count <= 0:
+            logger.warning(
+                f"No separators used for rule '{self.name}', parsing is not possible."
+            )
+        find_separators = self.__SEPARATORS_REGEX.findall
+
+        results = {key: [] for _, key, _ in resolved} if columnar else []
+        for index, name in enumerate(names):
+            parsed = None
+            error = None
+            if expected_count <= 0:
+                error = ParsingError(f"No separators used for rule '{self.name}'.")
+            elif len(find_separators(name)) < expected_count:
+                error = ParsingError(
+                    f"Separators count mismatch between given name '{name}' "
+                    f"and rule's pattern '{self._pattern}':'{expected_count}'."
+                )
+            else:
+                match = regex.search(name) if self.__might_match(name) else None
+                if match is None:
+                    error = ParsingError(
+                        f"Name {name} does not match rule pattern '{self._pattern}'"
+                    )
+                else:
+                    name_parts = match.groupdict()
+                    try:
+                        parsed = {
+                            key: parse(name_parts[group])
+                            for group, key, parse in resolved
+                        }
+                    except (TokenError, ValueError) as why:
+                        error = why
+
+            if error is not None and errors is not None:
+                errors.append((index, name, error))
+            if columnar:
+                for key, column in results.items():
+                    column.append(None if parsed is None else parsed[key])
+            else:
+                results.append(parsed)
+        return results
+
+    @instrumented("validate")
+    @_in_own_registry
+    def validate(self, name: AnyStr, strict: bool = False, **validate_values) -> bool:
         """Validate if given name matches the rule pattern.
 
         Args:
@@ -191,147 +501,402 @@ class Rule(Serializable):
         Returns:
             bool: True if name matches the rule pattern, False otherwise.
         """
-        extract_tokens = self.__EXTRACT_FIELDS_REGEX.findall(self._pattern)
-        pattern_wout_tokens = self._pattern
-        for each in extract_tokens:
-            pattern_wout_tokens = pattern_wout_tokens.replace(each, "XYZ")
-        expected_separators = self.__SEPARATORS_REGEX.findall(pattern_wout_tokens)
+        valid = True
+        for failure in self.__failures(name, strict, validate_values, first_only=False):
+            self.__log_failure(name, failure)
+            valid = False
+        return valid
+
+    @instrumented("validate")
+    @_in_own_registry
+    def validate_result(
+        self, name: AnyStr, strict: bool = False, **validate_values
+    ) -> "ValidationResult":
+        """Validate if given name matches the rule pattern, same as validate(),
+        returning why it didn't instead of logging it.
+
+        Nothing is logged or formatted, so use it to audit many names and
+        aggregate failures by code, token or value.
+
+        Args:
+            name (str): Name string e.g.: C_helmet_001_MSH
+
+        Returns:
+            ValidationResult: First failure found, or a result with
+            ValidationCode.OK that is truthy if name matches the rule pattern.
+        """
+        for failure in self.__failures(name, strict, validate_values, first_only=True):
+            return failure
+        return ValidationResult(ValidationCode.OK, self._name)
+
+    def __failures(  # noqa: C901
+        self, name: AnyStr, strict: bool, validate_values: Dict, first_only: bool
+    ) -> Iterator["ValidationResult"]:
+        plan = self.__plan()
+        rule_name = self._name
+        expected_separators = plan.expected_separators
         if len(expected_separators) <= 0:
-            logger.warning(
-                f"No separators used for rule '{self.name}', parsing is not possible."
-            )
-            return False
+            yield ValidationResult(ValidationCode.NO_SEPARATORS, rule_name)
+            return
 
         name_separators = self.__SEPARATORS_REGEX.findall(name)
-        if not strict and len(expected_separators) > len(name_separators):
-            logger.warning(
-                f"Separators count mismatch between given name '{name}':'{len(name_separators)}' "
-                f"and rule's pattern '{self._pattern}':'{len(expected_separators)}'."
+        if (not strict and len(expected_separators) > len(name_separators)) or (
+            strict and len(expected_separators) != len(name_separators)
+        ):
+            yield ValidationResult(
+                ValidationCode.SEPARATORS_MISMATCH,
+                rule_name,
+                value=len(name_separators),
+                expected=len(expected_separators),
             )
-            return False
-        elif strict and len(expected_separators) != len(name_separators):
-            logger.warning(
-                f"Separators count mismatch between given name '{name}':'{len(name_separators)}' "
-                f"and rule's pattern '{self._pattern}':'{len(expected_separators)}'."
-            )
-            return False
+            return
 
-        regex = self.__build_regex(strict)
-        match = regex.search(name)
+        match = None
+        if self.__might_match(name, strict):
+            match = self.__compiled_regex(strict).search(name)
         if not match:
-            logger.warning(f"Name {name} does not match rule pattern '{self._pattern}'")
-            return False
+            yield ValidationResult(ValidationCode.NO_MATCH, rule_name)
+            return
+
+        if not validate_values:
+            validator = self.__validator(plan.expanded_pattern, strict)
+            # Only trusted if it splits name the same way, otherwise tokens are
+            # checked one by one below, also to find out why it failed
+            valid = validator.search(name) if validator is not None else None
+            if (
+                valid is not None
+                and valid.span() == match.span()
+                and valid.groups() == match.groups()
+            ):
+                return
 
         match_dict = match.groupdict()
-        name_parts = sorted(match_dict.items())
-        repeated_fields = {}
-        for each in self.fields:
-            if each not in repeated_fields.keys():
-                if self.fields.count(each) > 1:
-                    repeated_fields[each] = 1
-        if repeated_fields:
-            logger.debug(f"Repeated tokens: {', '.join(repeated_fields.keys())}")
+        debug = logger.is_enabled_for(logging.DEBUG)
+        if debug and plan.repeated_fields:
+            logger.debug("Repeated tokens: %s", ", ".join(plan.repeated_fields))
 
         # Validate values passed by the user
         if len(validate_values):
-            for key, value in name_parts:
-                # Strip number that was added to make group name unique
-                token_name = key[:-3]
+            for group, token_name, key in plan.groups:
                 token = get_token(token_name)
                 if not token:
                     continue
-                if token_name in repeated_fields.keys():
-                    counter = repeated_fields.get(token_name)
-                    repeated_fields[token_name] = counter + 1
-                    token_name = f"{token_name}{counter}"
-
-                if token_name not in validate_values.keys():
+                if key not in validate_values.keys():
                     continue
 
-                given_value = validate_values.get(token_name)
+                value = match_dict[group]
+                given_value = validate_values.get(key)
                 if value != given_value:
-                    logger.warning(
-                        f"Token '{token_name}' value '{value}' does not match '{given_value}'"
-                    )
+                    code = ValidationCode.VALUE_MISMATCH
                     if value.lower() == given_value.lower():
-                        logger.warning(
-                            f"Token '{token_name}' value '{value}' has "
-                            f"casing mismatches with '{given_value}'"
-                        )
-                    return False
+                        code = ValidationCode.CASING_MISMATCH
+                    yield ValidationResult(code, rule_name, key, value, given_value)
+                    return
 
-        name_parts_str = ", ".join([f"('{k[:-3]}': '{v}')" for k, v in name_parts])
-        logger.debug(f"Name parts: {name_parts_str}")
+        if debug:
+            self.__log_name_parts(plan, match_dict, repeated=False)
 
         has_tokens_with_options = False
-        for key, value in name_parts:
-            # Strip number that was added to make group name unique
-            token_name = key[:-3]
+        for group, token_name, _ in plan.groups:
             token = get_token(token_name)
             if not token.required:
                 has_tokens_with_options = True
                 break
         # If we don't have tokens with options this match is already valid
         if not has_tokens_with_options:
-            return True
+            return
 
-        matching_options = True
-        for key, value in name_parts:
-            # Strip number that was added to make group name unique
-            token_name = key[:-3]
+        for group, token_name, _ in plan.groups:
+            value = match_dict[group]
             token = get_token(token_name)
             if not token.required:
                 if not (
                     token.has_option_fullname(value)
                     or token.has_option_abbreviation(value)
                 ):
-                    logger.warning(f"Token {token_name} has no option {value}")
-                    matching_options = False
+                    yield ValidationResult(
+                        ValidationCode.UNKNOWN_OPTION, rule_name, token_name, value
+                    )
+                    if first_only:
+                        return
             if isinstance(token, TokenNumber):
                 if len(token.suffix):
                     if not value.endswith(token.suffix):
-                        logger.warning(
-                            f"Token {token_name}: {value} must end with {token.suffix}"
+                        yield ValidationResult(
+                            ValidationCode.MISSING_SUFFIX,
+                            rule_name,
+                            token_name,
+                            value,
+                            token.suffix,
                         )
-                        matching_options = False
+                        if first_only:
+                            return
                 if len(token.prefix):
                     if not value.startswith(token.prefix):
-                        logger.warning(
-                            f"Token {token_name}: {value} must start with {token.prefix}"
+                        yield ValidationResult(
+                            ValidationCode.MISSING_PREFIX,
+                            rule_name,
+                            token_name,
+                            value,
+                            token.prefix,
                         )
-                        matching_options = False
+                        if first_only:
+                            return
                 digits = value[len(token.prefix) : len(token.suffix) * -1]  # noqa: E203
                 if not len(token.suffix):
                     digits = value[len(token.prefix) :]  # noqa: E203
                 if not digits.isdigit():
-                    logger.warning(
-                        f"Token {token_name}: {value} must be digits with "
-                        f"prefix '{token.prefix}' and suffix '{token.suffix}'"
+                    yield ValidationResult(
+                        ValidationCode.NOT_DIGITS,
+                        rule_name,
+                        token_name,
+                        value,
+                        (token.prefix, token.suffix),
                     )
-                    matching_options = False
+                    if first_only:
+                        return
                     continue
                 hash_str = "#" * token.padding
                 limit = int(hash_str.replace("#", "9"))
                 if len(digits) != token.padding and int(digits) <= limit:
-                    logger.warning(
-                        f"Token {token_name}: {value} must have {token.padding} digits"
+                    yield ValidationResult(
+                        ValidationCode.PADDING,
+                        rule_name,
+                        token_name,
+                        value,
+                        token.padding,
                     )
-                    if int(digits) > limit:
-                        logger.debug(
-                            f"Token {token_name}: {value} is higher than {limit}. "
-                            "Consider increasing padding."
-                        )
-                    matching_options = False
+                    if first_only:
+                        return
+
+    def __log_failure(self, name: AnyStr, failure: "ValidationResult"):
+        code = failure.code
+        if code == ValidationCode.NO_SEPARATORS:
+            logger.warning(
+                "No separators used for rule '%s', parsing is not possible.", self.name
+            )
+        elif code == ValidationCode.SEPARATORS_MISMATCH:
+            logger.warning(
+                "Separators count mismatch between given name '%s':'%d' "
+                "and rule's pattern '%s':'%d'.",
+                name,
+                failure.value,
+                self._pattern,
+                failure.expected,
+            )
+        elif code == ValidationCode.NO_MATCH:
+            logger.warning(
+                "Name %s does not match rule pattern '%s'", name, self._pattern
+            )
+        elif code in (ValidationCode.VALUE_MISMATCH, ValidationCode.CASING_MISMATCH):
+            logger.warning(
+                "Token '%s' value '%s' does not match '%s'",
+                failure.token,
+                failure.value,
+                failure.expected,
+            )
+            if code == ValidationCode.CASING_MISMATCH:
+                logger.warning(
+                    "Token '%s' value '%s' has casing mismatches with '%s'",
+                    failure.token,
+                    failure.value,
+                    failure.expected,
+                )
+        elif code == ValidationCode.UNKNOWN_OPTION:
+            logger.warning("Token %s has no option %s", failure.token, failure.value)
+        elif code == ValidationCode.MISSING_SUFFIX:
+            logger.warning(
+                "Token %s: %s must end with %s",
+                failure.token,
+                failure.value,
+                failure.expected,
+            )
+        elif code == ValidationCode.MISSING_PREFIX:
+            logger.warning(
+                "Token %s: %s must start with %s",
+                failure.token,
+                failure.value,
+                failure.expected,
+            )
+        elif code == ValidationCode.NOT_DIGITS:
+            logger.warning(
+                "Token %s: %s must be digits with prefix '%s' and suffix '%s'",
+                failure.token,
+                failure.value,
+                *failure.expected,
+            )
+        elif code == ValidationCode.PADDING:
+            logger.warning(
+                "Token %s: %s must have %d digits",
+                failure.token,
+                failure.value,
+                failure.expected,
+            )
+
+    @_in_own_registry
+    def validator(self, strict: bool = False) -> Union[re.Pattern, None]:
+        """Regular expression that only matches names valid for this Rule, used by
+        validate() to accept names in a single match instead of checking their
+        values token by token.
+
+        Tokens with options become alternations of their full names and
+        abbreviations, and TokenNumber tokens their prefix, digits with padding and
+        suffix. It's rebuilt when this Rule, a referenced Rule or any Token changes.
+
+        It has a group per placeholder, like regex(). validate() only accepts a name
+        with it when it matches the same text and values regex() does, and checks
+        values token by token otherwise, so results are the same either way.
+
+        Args:
+            strict (bool, optional): If False, text outside tokens ignores casing.
+            Token values are always compared with their casing, same as validate().
+
+        Returns:
+            [re.Pattern]: Compiled expression, or None if this Rule can't have one:
+            it has no tokens with options, a missing token or a custom placeholder
+            expression. validate() checks those names token by token.
+        """
+        return self.__validator(self.__expand(()), strict)
+
+    def __validator(self, expanded_pattern: str, strict: bool) -> Union[re.Pattern, None]:
+        registry = get_registry()
+        revision = tokens_revision()
+        cached = self._validators.get(strict)
+        if (
+            cached is not None
+            and cached[0] is registry
+            and cached[1] == revision
+            and cached[2] == expanded_pattern
+        ):
+            return cached[3]
+        validator = self.__build_validator(expanded_pattern, strict)
+        if metrics.enabled:
+            metrics.count("validator_compiles", self._name)
+        self._validators[strict] = (registry, revision, expanded_pattern, validator)
+        return validator
+
+    def __build_validator(
+        self, expanded_pattern: str, strict: bool
+    ) -> Union[re.Pattern, None]:
+        expression = list()
+        has_tokens_with_options = False
+        position = 0
+        for match in self.__PLACEHOLDER_REGEX.finditer(expanded_pattern):
+            expression.append(re.escape(expanded_pattern[position : match.start()]))  # noqa: E203
+            position = match.end()
+            token = get_token(match.group("placeholder"))
+            if token is None or match.group("expression") is not None:
+                return None
+            if isinstance(token, TokenNumber):
+                expression.append(f"({self.__number_expression(token)})")
+            elif token.required:
+                expression.append(f"({self.__DEFAULT_EXPRESSION})")
+            else:
+                has_tokens_with_options = True
+                expression.append(f"({self.__options_expression(token)})")
+        expression.append(re.escape(expanded_pattern[position:]))
+        # Without option tokens validate() accepts any value for every token
+        if not has_tokens_with_options:
+            return None
+
+        expression = "".join(expression)
+        if self._anchor & self.ANCHOR_START:
+            expression = f"^{expression}"
+        if self._anchor & self.ANCHOR_END:
+            expression = f"{expression}$"
+        return self.__compile_regex(expression, strict)
+
+    @classmethod
+    def __options_expression(cls, token) -> str:
+        # Only values the default placeholder expression can match are valid,
+        # longest first so the longest option is tried first.
+        values = {
+            value
+            for option in token.options.items()
+            for value in option
+            if cls.__DEFAULT_REGEX.fullmatch(value)
+        }
+        if not values:
+            return "(?!)"
+        values = sorted(values, key=lambda value: (-len(value), value))
+        return f"(?-i:{'|'.join(re.escape(value) for value in values)})"
+
+    @classmethod
+    def __number_expression(cls, token: TokenNumber) -> str:
+        prefix = token.prefix
+        suffix = token.suffix
+        if (prefix and not cls.__DEFAULT_REGEX.fullmatch(prefix)) or (
+            suffix and not cls.__DEFAULT_REGEX.fullmatch(suffix)
+        ):
+            return "(?!)"
+        padding = token.padding
+        # Exactly padding digits, or a number too big for it, e.g.: 1234 for padding 3
+        digits = rf"(?:\d{{{padding}}}|0*(?!0)\d{{{padding + 1},}})"
+        if prefix:
+            digits = f"(?-i:{re.escape(prefix)}){digits}"
+        if suffix:
+            digits = f"{digits}(?-i:{re.escape(suffix)})"
+        return digits
+
+    @staticmethod
+    def __log_name_parts(plan: RulePlan, name_parts: Dict, repeated: bool = True):
+        logger.debug(
+            "Name parts: %s",
+            ", ".join(
+                f"('{token_name}': '{name_parts[group]}')"
+                for group, token_name, _ in plan.groups
+            ),
+        )
+        if repeated and plan.repeated_fields:
+            logger.debug("Repeated tokens: %s", ", ".join(plan.repeated_fields))
 
-        return matching_options
+    @_in_own_registry
+    def regex(self, strict: bool = False) -> re.Pattern:
+        """
+        Args:
+            strict (bool, optional): If False, the expression ignores casing.
 
-    def __build_regex(self, strict: bool = False) -> re.Pattern:
+        Returns:
+            [re.Pattern]: Compiled expression used to parse and validate names.
+        """
+        return self.__compiled_regex(strict)
+
+    def __compiled_regex(self, strict: bool = False) -> re.Pattern:
+        """Return the compiled regex for this rule, building it only once.
+
+        Compiled expressions are cached per (expanded pattern, anchor, strict),
+        so a change in this rule's pattern or in any referenced rule produces
+        a new key and a fresh compile.
+        """
+        expanded_pattern = self.__expand(())
+        key = (expanded_pattern, self._anchor, strict)
+        regex_cache = self._regex_cache
+        compiled = regex_cache.get(key)
+        if metrics.enabled:
+            metrics.count(
+                "regex_cache_misses" if compiled is None else "regex_cache_hits",
+                self._name,
+            )
+        if compiled is None:
+            if any(cached[0] != expanded_pattern for cached in list(regex_cache)):
+                # A referenced rule changed, drop expressions built from the old one
+                regex_cache = self._regex_cache = {}
+            expression = self._regex_sources.get(expanded_pattern)
+            if expression is None:
+                expression = self.__build_regex(expanded_pattern)
+            compiled = self.__compile_regex(expression, strict)
+            if metrics.enabled:
+                metrics.count("regex_compiles", self._name)
+            regex_cache[key] = compiled
+        return compiled
+
+    def __build_regex(self, expanded_pattern: str) -> str:
         # ? Taken from Lucidity by Martin Pengelly-Phillips
         # Escape non-placeholder components
         expression = re.sub(
             r"(?P<placeholder>{(.+?)(:(\\}|.)+?)?})|(?P<other>.+?)",
             self.__escape,
-            self.expanded_pattern(),
+            expanded_pattern,
         )
         # Replace placeholders with regex pattern
         expression = re.sub(
@@ -346,7 +911,10 @@ class Rule(Serializable):
 
             if bool(self._anchor & self.ANCHOR_END):
                 expression = f"{expression}$"
-        # Compile expression
+        return expression
+
+    @staticmethod
+    def __compile_regex(expression: str, strict: bool = False) -> re.Pattern:
         try:
             if strict:
                 compiled = re.compile(expression)
@@ -390,22 +958,59 @@ class Rule(Serializable):
 
         expression = match.group("expression")
         if expression is None:
-            expression = r"[\w_.\-/:]+"
+            expression = self.__DEFAULT_EXPRESSION
 
         # Un-escape potentially escaped characters in expression.
         expression = expression.replace("{", "{").replace("}", "}")
 
         return r"(?P<{0}>{1})".format(placeholder_name, expression)
 
+    @_in_own_registry
     def expanded_pattern(self):
         """Return pattern with all referenced rules expanded recursively.
 
+        Expansions of rules in current session are computed once, referenced
+        rules first, and kept until this rule or a rule it references changes.
+
+        Raises:
+            RuleError: If a referenced rule cannot be found or references form a cycle.
+
         Returns:
             [str]: Pattern with all referenced rules expanded recursively.
         """
+        return self.__expand(())
+
+    def __expand(self, visiting: Tuple[str, ...]) -> str:
+        registry = get_registry()
+        registered = registry.rules.get(self._name) is self
+        if registered:
+            expanded = registry.expansions.get(self._name)
+            if metrics.enabled:
+                metrics.count(
+                    "expansion_cache_misses"
+                    if expanded is None
+                    else "expansion_cache_hits",
+                    self._name,
+                )
+            if expanded is not None:
+                return expanded
+            generation = registry.generation
+        if self._name in visiting:
+            cycle = " -> ".join(visiting + (self._name,))
+            raise RuleError(f"Circular reference found: {cycle}")
         # ? Taken from Lucidity by Martin Pengelly-Phillips
-        return self.__RULE_REFERENCE_REGEX.sub(self.__expand_reference, self.pattern)
-
+        expanded = self.__RULE_REFERENCE_REGEX.sub(
+            functools.partial(self.__expand_reference, visiting=visiting + (self._name,)),
+            self.pattern,
+        )
+        if registered:
+            with registry.lock:
+                # Don't keep it if rules changed while expanding
+                if registry.generation == generation:
+                    registry.expansions[self._name] = expanded
+        return expanded
+
+    @_in_own_registry
     def expanded_pattern_validation(self, pattern):
         """Return pattern with all referenced rules expanded recursively from a given pattern
 
@@ -417,16 +1022,20 @@ class Rule(Serializable):
             [str]: Pattern with all referenced rules expanded recursively.
         """
         # ? Taken from Lucidity by Martin Pengelly-Phillips
-        return self.__RULE_REFERENCE_REGEX.sub(self.__expand_reference, pattern)
+        return self.__RULE_REFERENCE_REGEX.sub(
+            functools.partial(self.__expand_reference, visiting=(self._name,)), pattern
+        )
 
-    def __expand_reference(self, match):
+    def __expand_reference(self, match: re.Match, visiting: Tuple[str, ...] = ()):
         """Expand reference represented by *match*.
 
         Args:
             match (str): Template name to look for in repo.
 
+            visiting (tuple): Names of the rules being expanded, to detect cycles.
+
         Raises:
-            TemplateError: If pattern contains a reference that cannot be
+            RuleError: If pattern contains a reference that cannot be
             resolved.
 
         Returns:
@@ -441,7 +1050,7 @@ class Rule(Serializable):
                 "Failed to find reference {} in current repo.".format(reference)
             )
 
-        return rule.expanded_pattern()
+        return rule.__expand(visiting)
 
     def __escape(self, match: re.Match) -> AnyStr:
         """Escape matched 'other' group value."""
@@ -451,10 +1060,78 @@ class Rule(Serializable):
             return re.escape(groups.get("other"))
         return groups.get("placeholder")
 
-    def __digits_pattern(self):
+    def __build_plan(self, expanded_pattern: str) -> RulePlan:
+        fields = tuple(self.__FIELDS_REGEX.findall(expanded_pattern))
+        fields_count = Counter(fields)
+        repeated_fields = tuple(each for each, count in fields_count.items() if count > 1)
+
+        counters = dict.fromkeys(repeated_fields, 1)
+        fields_with_digits = list()
+        for each in fields:
+            if each in counters:
+                fields_with_digits.append(f"{each}{counters[each]}")
+                counters[each] += 1
+            else:
+                fields_with_digits.append(each)
+
+        extract_tokens = self.__EXTRACT_FIELDS_REGEX.findall(self._pattern)
+        pattern_wout_tokens = self._pattern
+        for each in extract_tokens:
+            pattern_wout_tokens = pattern_wout_tokens.replace(each, "XYZ")
+        expected_separators = tuple(self.__SEPARATORS_REGEX.findall(pattern_wout_tokens))
+
+        groups = list()
+        for group in sorted(self.__compiled_regex().groupindex):
+            # Strip number that was added to make group name unique
+            token_name = group[:-3]
+            key = token_name
+            if token_name in counters:
+                key = f"{token_name}{int(group[-3:])}"
+            groups.append((group, token_name, key))
+
+        literals = list()
+        min_length = 0
+        bounded = True
+        position = 0
+        for match in self.__PLACEHOLDER_REGEX.finditer(expanded_pattern):
+            if match.start() > position:
+                literals.append(expanded_pattern[position : match.start()])  # noqa: E203
+            position = match.end()
+            # Default placeholder expression matches one or more characters. Custom
+            # ones could match anything, even nothing.
+            if match.group("expression") is None:
+                min_length += 1
+            bounded = False
+        if position < len(expanded_pattern):
+            literals.append(expanded_pattern[position:])
+        prefix = literals[0] if literals and not expanded_pattern.startswith("{") else ""
+        suffix = literals[-1] if literals and not expanded_pattern.endswith("}") else ""
+        if bounded:
+            prefix = suffix = expanded_pattern
+        separator_counts = Counter(self.__SEPARATORS_REGEX.findall("".join(literals)))
+        min_length += sum(len(each) for each in literals)
+
+        return RulePlan(
+            expanded_pattern,
+            fields,
+            repeated_fields,
+            tuple(fields_with_digits),
+            expected_separators,
+            self.__digits_pattern(expanded_pattern, fields_count),
+            tuple(groups),
+            tuple(literals),
+            prefix,
+            suffix,
+            tuple(sorted(separator_counts.items())),
+            min_length,
+            min_length if bounded else None,
+        )
+
+    @staticmethod
+    def __digits_pattern(expanded_pattern: str, fields_count: Dict) -> str:
         # * This accounts for those cases where a token is used more than once in a rule
-        digits_pattern = deepcopy(self.expanded_pattern())
-        for each in list(set(self.fields)):
+        digits_pattern = expanded_pattern
+        for each in fields_count.keys():
             # ? This is going to be a bit more difficult to handle when nesting templates
             # ? due to the . character not being contemplated by the pattern
             regex_pattern = re.compile("{{{0}}}".format(each))
@@ -469,7 +1146,7 @@ class Rule(Serializable):
                         f"{digits_pattern[match - 1 :]}"
                     )
                     i += 1
-        logger.debug(f"Digits pattern to account for repeated fields: {digits_pattern}")
+        logger.debug("Digits pattern to account for repeated fields: %s", digits_pattern)
         return digits_pattern
 
     @property
@@ -481,6 +1158,7 @@ class Rule(Serializable):
         return self._pattern
 
     @pattern.setter
+    @_in_own_registry
     def pattern(self, pattern):
         """
         Some times we need to change the pattern dinamically, at runtime.
@@ -488,15 +1166,130 @@ class Rule(Serializable):
         if pattern == "":
             logger.error(f"Pattern cannot be empty for rule: {self.name}")
             return
-        self._pattern = pattern
+        registry = get_registry()
+        with registry.lock:
+            registered = registry.rules.get(self._name) is self
+            if registered:
+                cycle = _reference_cycle(self._name, self.__find_references(pattern))
+                if cycle:
+                    logger.error(f"Circular reference found: {' -> '.join(cycle)}")
+                    return
+            if registered:
+                _unindex_references(registry, self._name, self.references)
+            self._pattern = pattern
+            self._references = None
+            self.clear_compiled()
+            if registered:
+                _index_references(registry, self._name, self.references)
+                _registry_changed([self._name])
+
+    def clear_compiled(self):
+        """Drop this Rule's compiled expressions and plan, so they're built again on
+        next use.
+        """
+        # New dicts instead of clearing, so threads reading the old ones aren't affected
+        self._regex_cache = {}
+        self._regex_sources = {}
+        self._plan = None
+        self._validators = {}
+
+    @property
+    def references(self) -> Tuple[str, ...]:
+        """
+        Returns:
+            [tuple]: Names of the rules this Rule's pattern references directly.
+        """
+        if self._references is None:
+            self._references = self.__find_references(self._pattern)
+        return self._references
+
+    @classmethod
+    def __find_references(cls, pattern: str) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys(cls.__RULE_REFERENCE_REGEX.findall(pattern)))
+
+    @property
+    @_in_own_registry
+    def plan(self) -> RulePlan:
+        """Derived pattern data, built on first use and rebuilt only when this
+        Rule's pattern or any referenced rule changes.
+
+        Returns:
+            [RulePlan]: Precomputed fields, separators and solving pattern.
+        """
+        return self.__plan()
+
+    def __plan(self) -> RulePlan:
+        expanded_pattern = self.__expand(())
+        plan = self._plan
+        if plan is None or plan.expanded_pattern != expanded_pattern:
+            plan = self.__build_plan(expanded_pattern)
+            self._plan = plan
+        return plan
+
+    @_in_own_registry
+    def cache_data(self) -> Dict:
+        """Collect this Rule's plan and regex source so they can be stored on disk
+        and restored in another process with load_cache_data().
+
+        Returns:
+            dict: RulePlan fields plus 'regex', the source of the compiled expression.
+        """
+        retval = dict(self.__plan()._asdict())
+        retval["regex"] = self.__compiled_regex().pattern
+        return retval
+
+    @_in_own_registry
+    def load_cache_data(self, data: Dict) -> bool:
+        """Restore plan and regex source collected with cache_data(), skipping
+        pattern expansion and regex building for them.
+
+        If this Rule is in current session, the cached expanded pattern is used
+        until this Rule or a rule it references changes, so data must have been
+        collected from the same rules.
+
+        Args:
+            data (dict): Data as returned by cache_data()
+
+        Returns:
+            bool: True if successful, False if data is not valid cache data.
+        """
+        try:
+            plan = RulePlan(
+                data["expanded_pattern"],
+                tuple(data["fields"]),
+                tuple(data["repeated_fields"]),
+                tuple(data["fields_with_digits"]),
+                tuple(data["expected_separators"]),
+                data["digits_pattern"],
+                tuple(tuple(each) for each in data["groups"]),
+                tuple(data["literals"]),
+                data["prefix"],
+                data["suffix"],
+                tuple(tuple(each) for each in data["separator_counts"]),
+                data["min_length"],
+                data["max_length"],
+            )
+            regex_source = data["regex"]
+        except (KeyError, TypeError):
+            return False
+        if not isinstance(regex_source, str):
+            return False
+        self._plan = plan
+        self._regex_sources[plan.expanded_pattern] = regex_source
+        registry = get_registry()
+        with registry.lock:
+            if registry.rules.get(self._name) is self:
+                registry.expansions.setdefault(self._name, plan.expanded_pattern)
+        return True
 
     @property
+    @_in_own_registry
     def fields(self) -> Tuple:
         """
         Returns:
             [tuple]: Tuple of all Tokens found in this Rule's pattern
         """
-        return tuple(self.__FIELDS_REGEX.findall(self.expanded_pattern()))
+        return self.__plan().fields
 
     @property
     def anchor(self):
@@ -529,6 +1322,151 @@ class Rule(Serializable):
         self._nice_name = n
 
 
+class RuleSet(object):
+    """A group of rules to match names against, indexed by the literal text their
+    patterns start and end with and by the separators they need, so each name is
+    only matched against the rules it could belong to.
+
+    Args:
+        ``rules`` (iterable): Rule objects to classify names with.
+
+        ``strict`` (bool, optional): If False, matching ignores casing.
+    """
+
+    __CANDIDATES_CACHE_SIZE = 4096
+
+    def __init__(self, rules: Iterable[Rule], strict: bool = False):
+        self._rules: Tuple[Rule, ...] = tuple(rules)
+        self._strict: bool = strict
+        self._registry: Registry = get_registry()
+        # (registry generation, branches, first characters, last characters,
+        # (separator, most needed), {dispatch key: candidate branches}), replaced
+        # as a whole when rebuilt
+        self._compiled: Tuple = (None, (), frozenset(), frozenset(), (), {})
+
+    def __build(self) -> Tuple:
+        generation = self._registry.generation
+        branches = list()
+        for rule in self._rules:
+            plan = rule.plan
+            # Rules without separators can't be parsed
+            if not plan.expected_separators:
+                continue
+            regex = rule.regex(self._strict)
+            first = last = ""
+            if rule.anchor & Rule.ANCHOR_START:
+                first = self.__literal_char(plan.prefix[:1])
+            if rule.anchor & Rule.ANCHOR_END:
+                last = self.__literal_char(plan.suffix[-1:])
+            # Start anchored expressions can only match at the start
+            find = regex.match if rule.anchor & Rule.ANCHOR_START else regex.search
+            branches.append(
+                (rule, find, plan.groups, first, last, dict(plan.separator_counts))
+            )
+        firsts = frozenset(branch[3] for branch in branches if branch[3])
+        lasts = frozenset(branch[4] for branch in branches if branch[4])
+        # Most separators any rule needs, names with more are all the same to the index
+        separators = defaultdict(int)
+        for branch in branches:
+            for separator, count in branch[5].items():
+                separators[separator] = max(separators[separator], count)
+        self._compiled = (
+            generation,
+            tuple(branches),
+            firsts,
+            lasts,
+            tuple(sorted(separators.items())),
+            {},
+        )
+        return self._compiled
+
+    def __literal_char(self, char: str) -> str:
+        # Only ASCII casing can be compared reliably without the regex engine
+        if not self._strict:
+            if not char.isascii():
+                return ""
+            return char.lower()
+        return char
+
+    def __dispatch_char(self, char: str, indexed: frozenset) -> Union[str, None]:
+        # None if rules can't be told apart by this character
+        if not self._strict:
+            if not char.isascii():
+                return None
+            char = char.lower()
+        return char if char in indexed else ""
+
+    @staticmethod
+    def __candidates(branches: Tuple, separators: Tuple, dispatch_key: Tuple) -> Tuple:
+        first, last, separator_counts = dispatch_key
+        counts = {
+            separator: count
+            for (separator, _), count in zip(separators, separator_counts)
+        }
+        return tuple(
+            branch
+            for branch in branches
+            if (not branch[3] or first is None or branch[3] == first)
+            and (not branch[4] or last is None or branch[4] == last)
+            and all(counts[separator] >= count for separator, count in branch[5].items())
+        )
+
+    def match(self, name: AnyStr) -> List[Tuple[Rule, Dict]]:
+        """Find all rules in this set that parse given name.
+
+        Args:
+            name (str): Name string e.g.: C_helmet_001_MSH
+
+        Returns:
+            list: (Rule, parsed dictionary) for each matching rule, in set order.
+        """
+        compiled = self._compiled
+        if compiled[0] != self._registry.generation:
+            compiled = self.__build()
+        _, branches, firsts, lasts, separators, candidates_cache = compiled
+        dispatch_key = (
+            self.__dispatch_char(name[:1], firsts),
+            self.__dispatch_char(name[-1:], lasts),
+            tuple(min(name.count(separator), most) for separator, most in separators),
+        )
+        candidates = candidates_cache.get(dispatch_key)
+        if candidates is None:
+            candidates = self.__candidates(branches, separators, dispatch_key)
+            if len(candidates_cache) >= self.__CANDIDATES_CACHE_SIZE:
+                candidates_cache.clear()
+            candidates_cache[dispatch_key] = candidates
+        matched = list()
+        for rule, find, groups, *_ in candidates:
+            match = find(name)
+            if match is None:
+                continue
+            name_parts = match.groupdict()
+            parsed = {}
+            try:
+                for group, token_name, key in groups:
+                    token = self._registry.tokens.get(token_name)
+                    if not token:
+                        continue
+                    parsed[key] = token.parse(name_parts[group])
+            except (TokenError, ValueError):
+                # Value is not one of the token options, so the rule doesn't apply
+                continue
+            matched.append((rule, parsed))
+        return matched
+
+    @property
+    def rules(self) -> Tuple[Rule, ...]:
+        """
+        Returns:
+            [tuple]: Rule objects in this set.
+        """
+        return self._rules
+
+    @property
+    def strict(self) -> bool:
+        return self._strict
+
+
 def add_rule(
     name: str, pattern: str, anchor=Rule.ANCHOR_START, nice_name: str = ""
 ) -> Union[Rule, None]:
@@ -552,6 +1490,7 @@ def add_rule(
     Returns:
         Rule: The Rule object instance created for given name and fields. None if
     """
+    registry = get_registry()
     if pattern == "":
         logger.error(f"Pattern cannot be empty for rule: {name}")
         return
@@ -564,10 +1503,17 @@ def add_rule(
     rule = Rule(name, pattern, anchor)
     if len(nice_name):
         rule.nice_name = nice_name
-    _rules[name] = rule
-    if get_active_rule() is None:
-        set_active_rule(name)
-        logger.debug(f"No active rule found, setting this one as active: {name}")
+    with registry.lock:
+        cycle = _reference_cycle(name, rule.references)
+        if cycle:
+            raise RuleError(f"Circular reference found: {' -> '.join(cycle)}")
+        # Surface invalid patterns and missing references right away
+        rule.regex()
+        _registry_changed([name])
+        _register_rule(registry, rule)
+        if get_active_rule() is None:
+            set_active_rule(name)
+            logger.debug(f"No active rule found, setting this one as active: {name}")
     return rule
 
 
@@ -580,9 +1526,12 @@ def remove_rule(name: AnyStr) -> bool:
     Returns:
         bool: True if successful, False if a rule name was not found.
     """
-    if has_rule(name):
-        del _rules[name]
-        return True
+    registry = get_registry()
+    with registry.lock:
+        if has_rule(name):
+            _registry_changed([name])
+            _unregister_rule(registry, name)
+            return True
     return False
 
 
@@ -595,7 +1544,8 @@ def has_rule(name: AnyStr) -> bool:
     Returns:
         bool: True if rule with given name exists in current session, False otherwise.
     """
-    return name in _rules.keys()
+    registry = get_registry()
+    return name in registry.rules.keys() or name in registry.lazy_rules.keys()
 
 
 def update_rule_name(old_name, new_name):
@@ -610,13 +1560,18 @@ def update_rule_name(old_name, new_name):
         True if Rule name was updated, False if another rule
         has that name already or no current rule with old_name was found.
     """
-    if has_rule(old_name) and not has_rule(new_name):
-        rule_obj = _rules.pop(old_name)
-        rule_obj.name = new_name
-        _rules[new_name] = rule_obj
-        if _rules.get("_active") == old_name:
-            _rules["_active"] == new_name
-        return True
+    registry = get_registry()
+    with registry.lock:
+        if has_rule(old_name) and not has_rule(new_name):
+            get_rule(old_name)
+            _registry_changed([old_name])
+            rule_obj = _unregister_rule(registry, old_name)
+            rule_obj.name = new_name
+            _register_rule(registry, rule_obj)
+            _registry_changed([new_name])
+            if registry.rules.get("_active") == old_name:
+                registry.rules["_active"] == new_name
+            return True
     return False
 
 
@@ -626,8 +1581,14 @@ def reset_rules() -> bool:
     Returns:
         bool: True if clearing was successful.
     """
-    _rules.clear()
-    _rules["_active"] = None
+    registry = get_registry()
+    with registry.lock:
+        registry.rules.clear()
+        registry.rules["_active"] = None
+        registry.lazy_rules.clear()
+        registry.expansions.clear()
+        registry.dependents.clear()
+        _registry_changed()
     return True
 
 
@@ -638,8 +1599,11 @@ def get_active_rule() -> Rule:
     Returns:
         Rule: Rule object instance for currently active Rule.
     """
-    name = _rules.get("_active")
-    return _rules.get(name)
+    registry = get_registry()
+    name = registry.rules.get("_active")
+    if name is None:
+        return None
+    return get_rule(name)
 
 
 def set_active_rule(name: AnyStr) -> bool:
@@ -652,8 +1616,9 @@ def set_active_rule(name: AnyStr) -> bool:
     Returns:
         bool: True if successful, False otherwise.
     """
+    registry = get_registry()
     if has_rule(name):
-        _rules["_active"] = name
+        registry.rules["_active"] = name
         return True
     return False
 
@@ -692,20 +1657,211 @@ def get_rule(name: AnyStr) -> Rule:
     Returns:
         Rule: Rule object instance for given name.
     """
-    return _rules.get(name)
+    registry = get_registry()
+    rule = registry.rules.get(name)
+    if rule is None and name in registry.lazy_rules:
+        rule = _build_lazy_rule(name)
+    return rule
 
 
-def get_rules() -> Dict:
+def get_rules() -> Mapping[str, Rule]:
     """Get all Rule objects for current session.
 
+    The returned mapping is a read-only view, not a copy. It's shared between
+    callers and only rebuilt when rules are added, removed or renamed. Use
+    copy_rules() to get independent Rule objects.
+
+    Returns:
+        mapping: {rule_name:Rule}
+    """
+    registry = get_registry()
+    rules_view = registry.rules_view
+    if rules_view is None:
+        with registry.lock:
+            _build_lazy_rules()
+            rules_view = MappingProxyType(
+                {name: rule for name, rule in registry.rules.items() if name != "_active"}
+            )
+            registry.rules_view = rules_view
+    return rules_view
+
+
+def copy_rules() -> Dict[str, Rule]:
+    """Get a deep copy of all Rule objects for current session.
+
     Returns:
         dict: {rule_name:Rule}
     """
-    rules_copy = deepcopy(_rules)
+    registry = get_registry()
+    _build_lazy_rules()
+    with registry.lock:
+        rules_copy = deepcopy(registry.rules)
     del rules_copy["_active"]
     return rules_copy
 
 
+def get_rule_set(
+    with_rules: Union[Iterable[str], None] = None, strict: bool = False
+) -> RuleSet:
+    """Get a RuleSet for given rule names, reusing the one built before if rules
+    haven't changed since.
+
+    Args:
+        ``with_rules`` (list, optional): Rule names to include. Defaults to all
+        rules in current session.
+
+        ``strict`` (bool, optional): If False, matching ignores casing.
+
+    Raises:
+        RuleError: A given rule name could not be found in current session.
+
+    Returns:
+        RuleSet: Compiled set of rules.
+    """
+    registry = get_registry()
+    if with_rules is None:
+        with_rules = list(get_rules().keys())
+    key = (tuple(with_rules), strict)
+    rule_set = registry.rule_sets.get(key)
+    if rule_set is None:
+        missing = [name for name in key[0] if not has_rule(name)]
+        if missing:
+            raise RuleError(f"Rules {', '.join(missing)} not found in current session.")
+        rule_set = RuleSet([get_rule(name) for name in key[0]], strict)
+        registry.rule_sets[key] = rule_set
+    return rule_set
+
+
+def swap_rules(new_rules: Iterable[Rule], removed: Iterable[str] = ()) -> bool:
+    """Replace or add given Rule objects and remove given rule names from current
+    session in one step, so no caller sees part of the change.
+
+    Args:
+        ``new_rules`` (iterable): Rule objects to add, replacing rules with the same name.
+
+        ``removed`` (iterable, optional): Names of rules to remove.
+
+    Returns:
+        bool: True if successful.
+    """
+    registry = get_registry()
+    new_rules = list(new_rules)
+    removed = list(removed)
+    with registry.lock:
+        _registry_changed(removed + [rule.name for rule in new_rules])
+        for name in removed:
+            _unregister_rule(registry, name)
+        for rule in new_rules:
+            _register_rule(registry, rule)
+    return True
+
+
+def _registry_changed(changed: Iterable[str] = ()):
+    """Invalidate everything built from the set of rules, and the expansions and
+    compiled data of given rule names and every rule depending on them.
+
+    Callers must hold the registry lock.
+    """
+    registry = get_registry()
+    registry.generation += 1
+    registry.rules_view = None
+    registry.rule_sets.clear()
+    for name in _dependent_rules(changed):
+        registry.expansions.pop(name, None)
+        rule = registry.rules.get(name)
+        if rule is not None:
+            rule.clear_compiled()
+
+
+def _dependent_rules(names: Iterable[str]) -> List[str]:
+    """Given rule names plus the names of all rules referencing them, directly or not.
+
+    Returns:
+        list: Rule names, starting with the given ones.
+    """
+    registry = get_registry()
+    dependents = list(dict.fromkeys(names))
+    found = set(dependents)
+    index = 0
+    while index < len(dependents):
+        current = dependents[index]
+        index += 1
+        for name in registry.dependents.get(current, ()):
+            if name not in found:
+                found.add(name)
+                dependents.append(name)
+    return dependents
+
+
+def _register_rule(registry: Registry, rule: Rule):
+    """Put given rule in registry, replacing any rule with the same name, and
+    index the rules it references.
+
+    Callers must hold the registry lock.
+    """
+    name = rule.name
+    previous = registry.rules.get(name)
+    if isinstance(previous, Rule):
+        _unindex_references(registry, name, previous.references)
+    registry.lazy_rules.pop(name, None)
+    registry.rules[name] = rule
+    rule._registry = registry
+    _index_references(registry, name, rule.references)
+
+
+def _unregister_rule(registry: Registry, name: AnyStr) -> Union[Rule, None]:
+    """Remove rule with given name from registry and from the references index.
+
+    Callers must hold the registry lock.
+
+    Returns:
+        Rule: Removed Rule object, None if it wasn't built.
+    """
+    registry.lazy_rules.pop(name, None)
+    rule = registry.rules.pop(name, None)
+    if rule is not None:
+        _unindex_references(registry, name, rule.references)
+    return rule
+
+
+def _index_references(registry: Registry, name: AnyStr, references: Iterable[str]):
+    for reference in references:
+        registry.dependents.setdefault(reference, set()).add(name)
+
+
+def _unindex_references(registry: Registry, name: AnyStr, references: Iterable[str]):
+    for reference in references:
+        dependents = registry.dependents.get(reference)
+        if dependents is not None:
+            dependents.discard(name)
+            if not dependents:
+                del registry.dependents[reference]
+
+
+def _reference_cycle(name: AnyStr, references: Iterable[str]) -> Union[List[str], None]:
+    """Look for a cycle that would be created if rule ``name`` referenced given rules.
+
+    Returns:
+        list: Rule names forming the cycle, starting and ending with ``name``.
+        None if there's no cycle.
+    """
+    stack = [(reference, [name, reference]) for reference in references]
+    visited = set()
+    while stack:
+        current, path = stack.pop()
+        if current == name:
+            return path
+        if current in visited:
+            continue
+        visited.add(current)
+        rule = get_rule(current)
+        if rule is None:
+            continue
+        for reference in rule.references:
+            stack.append((reference, path + [reference]))
+    return None
+
+
 def save_rule(name: AnyStr, directory: Path) -> bool:
     """Saves given rule serialized to specified location.
 
@@ -724,6 +1880,7 @@ def save_rule(name: AnyStr, directory: Path) -> bool:
     filepath = directory / file_name
     with open(filepath, "w") as fp:
         json.dump(rule.data(), fp)
+    discard_session_snapshot(directory)
     return True
 
 
@@ -743,8 +1900,84 @@ def load_rule(filepath: Path) -> bool:
             data = json.load(fp)
     except Exception:
         return False
+    return load_rule_data(data)
+
+
+def load_rule_data(data: Dict) -> bool:
+    """Create Rule object in memory from its serialized data.
+
+    Args:
+        data (dict): Rule data as returned by Rule.data()
+
+    Returns:
+        bool: True if successful, False if data doesn't describe a rule.
+    """
+    registry = get_registry()
     new_rule = Rule.from_data(data)
     if new_rule:
-        _rules[new_rule.name] = new_rule
+        with registry.lock:
+            _registry_changed([new_rule.name])
+            _register_rule(registry, new_rule)
         return True
     return False
+
+
+def add_lazy_rule(
+    name: AnyStr, source: Union[Path, Dict], cache_data: Union[Dict, None] = None
+) -> bool:
+    """Register a rule that will only be loaded, built and compiled the first time
+    it's requested through get_rule(), get_active_rule() or any function using them.
+
+    Args:
+        ``name`` (str): The name of the rule.
+
+        ``source`` (Path or dict): Path to a .rule file, or the rule serialized data.
+
+        ``cache_data`` (dict, optional): Data as returned by Rule.cache_data() to
+        restore once the rule is built.
+
+    Returns:
+        bool: True if successful, False if a rule with given name is already built.
+    """
+    registry = get_registry()
+    with registry.lock:
+        if name in registry.rules.keys():
+            return False
+        registry.lazy_rules[name] = (source, cache_data)
+        _registry_changed()
+    return True
+
+
+def _build_lazy_rule(name: AnyStr) -> Union[Rule, None]:
+    registry = get_registry()
+    # Only one thread builds a given rule, others wait and get the built one
+    with registry.lock:
+        lazy_rule = registry.lazy_rules.pop(name, None)
+        if lazy_rule is None:
+            return registry.rules.get(name)
+        source, cache_data = lazy_rule
+        logger.debug(f"Building lazily loaded rule: {name}")
+        data = source
+        if isinstance(source, Path):
+            try:
+                with open(source) as fp:
+                    data = json.load(fp)
+            except Exception:
+                data = None
+        rule = Rule.from_data(data) if data is not None else None
+        if rule is not None:
+            # Nothing could be built from this rule before, so nothing to invalidate
+            _register_rule(registry, rule)
+        _registry_changed()
+        if rule is not None and cache_data is not None and rule.name == name:
+            rule.load_cache_data(cache_data)
+        if name not in registry.rules.keys():
+            logger.warning(f"Rule {name} could not be loaded from {source}")
+        return registry.rules.get(name)
+
+
+def _build_lazy_rules():
+    registry = get_registry()
+    with registry.lock:
+        for name in list(registry.lazy_rules.keys()):
+            _build_lazy_rule(name)
@@ -1,5 +1,20 @@
+from pathlib import Path
 from typing import Dict
 import copy
+import os
+
+# Whole session in a single file, written by naming.save_session()
+SESSION_SNAPSHOT_FILE = "vfxnaming.session"
+
+
+def discard_session_snapshot(directory: Path):
+    """Remove the session snapshot from given repo directory, if any. Files written
+    to it one by one aren't described by the snapshot anymore.
+    """
+    try:
+        os.remove(Path(directory) / SESSION_SNAPSHOT_FILE)
+    except FileNotFoundError:
+        pass
 
 
 class Serializable(object):
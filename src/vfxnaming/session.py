@@ -0,0 +1,171 @@
+import threading
+from pathlib import Path
+from typing import AnyStr, Dict, Iterator, List, Mapping, Tuple, Union
+
+import vfxnaming.naming as naming
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.registry import (
+    Registry,
+    activate_registry,
+    get_default_registry,
+    restore_registry,
+)
+
+
+class NamingSession(object):
+    """A naming convention loaded in memory with its own Tokens, Rules, active rule
+    and caches, so several of them can be kept in the same process.
+
+    Methods run against this session without changing what other sessions or
+    the module functions see. Use it as a context manager to make it the session
+    used by all vfxnaming module functions in the current thread:
+
+    .. code-block:: python
+
+        show = NamingSession('/path/to/show/repo')
+        show.parse('C-FRONT_L')
+
+        with show:
+            n.add_rule('filename', '{side}-{region}')
+
+    Rules keep looking up referenced rules and tokens in the session they were
+    added to, so Rule objects from get_rule() can be used outside of it.
+
+    Args:
+        ``repo`` (Path, optional): Repository to load into the new session.
+
+        ``registry`` (Registry, optional): Registry to work with instead of a new one.
+
+        ``load_kwargs``: Passed to load() along with repo.
+    """
+
+    def __init__(
+        self,
+        repo: Union[Path, None] = None,
+        registry: Union[Registry, None] = None,
+        **load_kwargs,
+    ):
+        self._registry: Registry = registry or Registry()
+        self._local = threading.local()
+        if repo is not None:
+            self.load(repo, **load_kwargs)
+
+    @classmethod
+    def default(cls) -> "NamingSession":
+        """
+        Returns:
+            NamingSession: Session working with the registry used by the module
+            functions when no other session is active.
+        """
+        return cls(registry=get_default_registry())
+
+    def __enter__(self) -> "NamingSession":
+        if not hasattr(self._local, "tokens"):
+            self._local.tokens = list()
+        self._local.tokens.append(activate_registry(self._registry))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        restore_registry(self._local.tokens.pop())
+
+    def parse(self, name: AnyStr, *args, **kwargs) -> Dict:
+        """See vfxnaming.naming.parse()"""
+        with self:
+            return naming.parse(name, *args, **kwargs)
+
+    def parse_many(self, names, *args, **kwargs) -> Union[List[Dict], Dict[str, List]]:
+        """See vfxnaming.naming.parse_many()"""
+        with self:
+            return naming.parse_many(names, *args, **kwargs)
+
+    def solve(self, *args, **kwargs) -> AnyStr:
+        """See vfxnaming.naming.solve()"""
+        with self:
+            return naming.solve(*args, **kwargs)
+
+    def solve_many(self, rows, *args, **kwargs) -> Union[List[AnyStr], Iterator[AnyStr]]:
+        """See vfxnaming.naming.solve_many()"""
+        with self:
+            result = naming.solve_many(rows, *args, **kwargs)
+        if isinstance(result, list):
+            return result
+        return self.__iterate(result)
+
+    def __iterate(self, iterator: Iterator) -> Iterator:
+        # Generators run lazily, activate this session every time one is resumed
+        while True:
+            with self:
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+            yield item
+
+    def validate(self, name: AnyStr, *args, **kwargs) -> List[rules.Rule]:
+        """See vfxnaming.naming.validate()"""
+        with self:
+            return naming.validate(name, *args, **kwargs)
+
+    def validate_many(self, names, *args, **kwargs) -> Union[List[int], Iterator[int]]:
+        """See vfxnaming.naming.validate_many()"""
+        with self:
+            result = naming.validate_many(names, *args, **kwargs)
+        if isinstance(result, list):
+            return result
+        return self.__iterate(result)
+
+    def classify(self, name: AnyStr, *args, **kwargs) -> List[Tuple[rules.Rule, Dict]]:
+        """See vfxnaming.naming.classify()"""
+        with self:
+            return naming.classify(name, *args, **kwargs)
+
+    def scan(
+        self, root: Path, *args, **kwargs
+    ) -> Iterator[Tuple[Path, rules.Rule, Dict]]:
+        """See vfxnaming.naming.scan()"""
+        with self:
+            result = naming.scan(root, *args, **kwargs)
+        return self.__iterate(result)
+
+    def load(self, repo: Union[Path, None] = None, **kwargs) -> bool:
+        """Load a repository into this session. See vfxnaming.naming.load_session()"""
+        with self:
+            return naming.load_session(repo, **kwargs)
+
+    def save(self, repo: Union[Path, None] = None, **kwargs):
+        """Save this session to a repository. See vfxnaming.naming.save_session()"""
+        with self:
+            return naming.save_session(repo, **kwargs)
+
+    def get_rule(self, name: AnyStr) -> Union[rules.Rule, None]:
+        with self:
+            return rules.get_rule(name)
+
+    def get_token(self, name: AnyStr) -> Union[tokens.Token, tokens.TokenNumber, None]:
+        with self:
+            return tokens.get_token(name)
+
+    def get_rules(self) -> Mapping[str, rules.Rule]:
+        """
+        Returns:
+            mapping: Read-only {rule_name:Rule} for this session.
+        """
+        with self:
+            return rules.get_rules()
+
+    def get_tokens(self) -> Dict:
+        """
+        Returns:
+            dict: {token_name:token_object} for this session.
+        """
+        with self:
+            return tokens.get_tokens()
+
+    def get_active_rule(self) -> Union[rules.Rule, None]:
+        with self:
+            return rules.get_active_rule()
+
+    @property
+    def registry(self) -> Registry:
+        return self._registry
@@ -1,13 +1,17 @@
 import copy
 import json
 from pathlib import Path
-from typing import AnyStr, Dict, Union
+from types import MappingProxyType
+from typing import AnyStr, Dict, Iterable, Mapping, Union
 
 from vfxnaming.error import TokenError
 from vfxnaming.logger import logger
-from vfxnaming.serialize import Serializable
+from vfxnaming.registry import get_registry
+from vfxnaming.serialize import Serializable, discard_session_snapshot
 
-_tokens = dict()
+# Increased every time a token is added, removed or its options change, in any
+# session. Rules compare it to know when what they built from tokens is outdated.
+_revision: int = 0
 
 
 class Token(Serializable):
@@ -32,6 +36,45 @@ class Token(Serializable):
         self._default = None
         self._options: Dict = {}
         self._fallback = ""
+        # Reverse and lowercase indexes, kept in sync with _options
+        self._abbreviations: Dict = {}
+        self._lowercase_options: Dict = {}
+
+    def data(self) -> Dict:
+        """Collect all data for this object instance.
+
+        Returns:
+            dict: {attribute:value}
+        """
+        retval = super(Token, self).data()
+        del retval["_abbreviations"]
+        del retval["_lowercase_options"]
+        return retval
+
+    @classmethod
+    def from_data(cls, data: Dict) -> "Token":
+        """Create object instance from give data. Used by Rule,
+        Token, Separator to create object instances from disk saved data.
+
+        Args:
+            data (dict): {attribute:value}
+
+        Returns:
+            Serializable: Object instance for Rule, Token or Separator.
+        """
+        this = super(Token, cls).from_data(data)
+        if this is not None:
+            this._index_options()
+        return this
+
+    def _index_options(self):
+        """Rebuild abbreviation and lowercase indexes from current options."""
+        _tokens_changed()
+        self._abbreviations = {}
+        self._lowercase_options = {}
+        for fullname, abbreviation in self._options.items():
+            self._abbreviations.setdefault(abbreviation, fullname)
+            self._lowercase_options.setdefault(fullname.lower(), fullname)
 
     def add_option(self, fullname: AnyStr, abbreviation: AnyStr) -> bool:
         """Add an option pair to this Token.
@@ -45,8 +88,11 @@ class Token(Serializable):
         """
         if fullname not in self._options.keys():
             self._options[fullname] = abbreviation
+            self._abbreviations.setdefault(abbreviation, fullname)
+            self._lowercase_options.setdefault(fullname.lower(), fullname)
             if len(self._options) == 1:
                 self._default = fullname
+            _tokens_changed()
             return True
         logger.debug(
             f"Option '{fullname}':'{self._options.get(fullname)}' already exists in Token '{self.name}'. "
@@ -66,6 +112,7 @@ class Token(Serializable):
         """
         if fullname in self._options.keys():
             self._options[fullname] = abbreviation
+            self._index_options()
             return True
         logger.debug(
             f"Option '{fullname}':'{self._options.get(fullname)}' doesn't exist in Token '{self.name}'. "
@@ -84,6 +131,7 @@ class Token(Serializable):
         """
         if fullname in self._options.keys():
             del self._options[fullname]
+            self._index_options()
             return True
         logger.debug(
             f"Option '{fullname}':'{self._options.get(fullname)}' doesn't exist in Token '{self.name}'"
@@ -92,8 +140,11 @@ class Token(Serializable):
 
     def clear_options(self):
         """Clears all the options for this token."""
+        _tokens_changed()
         self._default = None
-        self._options = {}
+        self._options.clear()
+        self._abbreviations = {}
+        self._lowercase_options = {}
 
     def has_option_fullname(self, fullname: AnyStr) -> bool:
         """Looks for given option full name in the options.
@@ -117,7 +168,7 @@ class Token(Serializable):
         Returns:
             [type]: [description]
         """
-        if abbreviation in self._options.values():
+        if abbreviation in self._abbreviations:
             return True
         return False
 
@@ -151,12 +202,11 @@ class Token(Serializable):
             )
         elif not self.required and name:
             if name not in self._options.keys():
-                lower_match = [k.lower() for k in self._options.keys()]
                 error_msg = (
                     f"Name '{name}' not found in Token '{self.name}'. "
                     f"Options: {', '.join(self._options.keys())}"
                 )
-                if name.lower() in lower_match:
+                if name.lower() in self._lowercase_options:
                     error_msg = (
                         f"Check casing of '{name}' against token '{self.name}' "
                         f"options: {', '.join(self._options.keys())}"
@@ -178,9 +228,9 @@ class Token(Serializable):
         if self.required:
             return value
         elif not self.required and len(self._options) >= 1:
-            for k, v in self._options.items():
-                if v == value:
-                    return k
+            fullname = self._abbreviations.get(value)
+            if fullname is not None:
+                return fullname
         raise TokenError(
             f"Value '{value}' not found in Token '{self.name}'. "
             f"Options: {', '.join(self._options.values())}"
@@ -227,12 +277,19 @@ class Token(Serializable):
         self._default = d
 
     @property
-    def options(self) -> Dict:
+    def options(self) -> Mapping:
+        """
+        Returns:
+            [mapping]: Read-only view of {"option_full_name":"abbreviation"}
+        """
+        return MappingProxyType(self._options)
+
+    def copy_options(self) -> Dict:
         """
         Returns:
-            [dict]: {"option_full_name":"abbreviation"}
+            [dict]: Independent copy of {"option_full_name":"abbreviation"}
         """
-        return copy.deepcopy(self._options)
+        return dict(self._options)
 
     @property
     def fallback(self) -> AnyStr:
@@ -326,10 +383,10 @@ class TokenNumber(Serializable):
 
             if prefix_index != -1 and self.prefix != "":
                 if value[:prefix_index] != self.prefix:
-                    logger.warning(f"Prefix '{self.prefix}' not found in '{value}'")
+                    logger.warning("Prefix '%s' not found in '%s'", self.prefix, value)
             if suffix_index != -1 and self.suffix != "":
                 if value[-suffix_index:] != self.suffix:
-                    logger.warning(f"Suffix '{self.suffix}' not found in '{value}'")
+                    logger.warning("Suffix '%s' not found in '%s'", self.suffix, value)
 
             if prefix_index == -1 and suffix_index >= 0:
                 return int(value[:-suffix_index])
@@ -379,6 +436,7 @@ class TokenNumber(Serializable):
         if p <= 0:
             p = 1
         self._options["padding"] = int(p)
+        _tokens_changed()
 
     @property
     def prefix(self) -> AnyStr:
@@ -388,6 +446,7 @@ class TokenNumber(Serializable):
     def prefix(self, this_prefix: AnyStr):
         if isinstance(this_prefix, str) and not this_prefix.isdigit():
             self._options["prefix"] = this_prefix
+            _tokens_changed()
         else:
             logger.warning(f"Prefix must be a string: {this_prefix}")
 
@@ -399,12 +458,24 @@ class TokenNumber(Serializable):
     def suffix(self, this_suffix: AnyStr):
         if isinstance(this_suffix, str) and not this_suffix.isdigit():
             self._options["suffix"] = this_suffix
+            _tokens_changed()
         else:
             logger.warning(f"Suffix must be a string: {this_suffix}")
 
     @property
-    def options(self) -> Dict:
-        return copy.deepcopy(self._options)
+    def options(self) -> Mapping:
+        """
+        Returns:
+            [mapping]: Read-only view of {"prefix": str, "suffix": str, "padding": int}
+        """
+        return MappingProxyType(self._options)
+
+    def copy_options(self) -> Dict:
+        """
+        Returns:
+            [dict]: Independent copy of {"prefix": str, "suffix": str, "padding": int}
+        """
+        return dict(self._options)
 
 
 def add_token(
@@ -456,7 +527,8 @@ def add_token(
         else:
             raise TokenError(f"Fallback must be a string. Got {type(fallback)}")
 
-    _tokens[name] = token
+    get_registry().tokens[name] = token
+    _tokens_changed()
     return token
 
 
@@ -492,7 +564,8 @@ def add_token_number(
     token.prefix = prefix
     token.suffix = suffix
     token.padding = padding
-    _tokens[name] = token
+    get_registry().tokens[name] = token
+    _tokens_changed()
     return token
 
 
@@ -506,11 +579,38 @@ def remove_token(name: AnyStr) -> bool:
         bool: True if successful, False if a rule name was not found.
     """
     if has_token(name):
-        del _tokens[name]
+        del get_registry().tokens[name]
+        _tokens_changed()
         return True
     return False
 
 
+def swap_tokens(
+    new_tokens: Iterable[Union[Token, TokenNumber]], removed: Iterable[str] = ()
+) -> bool:
+    """Replace or add given Token objects and remove given token names from current
+    session in one step, so no caller sees part of the change.
+
+    Args:
+        ``new_tokens`` (iterable): Token or TokenNumber objects to add, replacing
+        tokens with the same name.
+
+        ``removed`` (iterable, optional): Names of tokens to remove.
+
+    Returns:
+        bool: True if successful.
+    """
+    new_tokens = list(new_tokens)
+    registry = get_registry()
+    with registry.lock:
+        for name in removed:
+            registry.tokens.pop(name, None)
+        for token in new_tokens:
+            registry.tokens[token.name] = token
+        _tokens_changed()
+    return True
+
+
 def has_token(name: AnyStr) -> bool:
     """Test if current session has a token with given name.
 
@@ -520,7 +620,7 @@ def has_token(name: AnyStr) -> bool:
     Returns:
         bool: True if rule with given name exists in current session, False otherwise.
     """
-    return name in _tokens.keys()
+    return name in get_registry().tokens.keys()
 
 
 def update_token_name(old_name, new_name):
@@ -535,13 +635,16 @@ def update_token_name(old_name, new_name):
         True if Token name was updated, False if another token
         has that name already or no current template with old_name was found.
     """
-    if has_token(old_name) and not has_token(new_name):
-        token_obj = _tokens.pop(old_name)
-        token_obj.name = new_name
-        _tokens[new_name] = token_obj
-        if _tokens.get("_active") == old_name:
-            _tokens["_active"] == new_name
-        return True
+    registry = get_registry()
+    with registry.lock:
+        if has_token(old_name) and not has_token(new_name):
+            token_obj = registry.tokens.pop(old_name)
+            token_obj.name = new_name
+            registry.tokens[new_name] = token_obj
+            _tokens_changed()
+            if registry.tokens.get("_active") == old_name:
+                registry.tokens["_active"] == new_name
+            return True
     return False
 
 
@@ -551,7 +654,8 @@ def reset_tokens() -> bool:
     Returns:
         bool: True if clearing was successful.
     """
-    _tokens.clear()
+    get_registry().tokens.clear()
+    _tokens_changed()
     return True
 
 
@@ -564,7 +668,7 @@ def get_token(name: AnyStr) -> Union[Token, TokenNumber, None]:
     Returns:
         Rule: Token object instance for given name.
     """
-    return _tokens.get(name)
+    return get_registry().tokens.get(name)
 
 
 def get_token_options(token_name):
@@ -574,8 +678,8 @@ def get_token_options(token_name):
         ``token_name`` (str): The name of the token to query.
 
     Returns:
-        [dict]: Token options. None if no token with given name was found,
-        or token has no options.
+        [mapping]: Read-only view of Token options. None if no token with given
+        name was found, or token has no options.
     """
     if has_token(token_name):
         token_obj = get_token(token_name)
@@ -717,7 +821,7 @@ def get_tokens() -> Dict:
     Returns:
         dict: {token_name:token_object}
     """
-    return _tokens
+    return get_registry().tokens
 
 
 def validate_tokens():
@@ -749,6 +853,7 @@ def save_token(name: AnyStr, directory: Path) -> bool:
     filepath = directory / file_name
     with open(filepath, "w") as fp:
         json.dump(token.data(), fp)
+    discard_session_snapshot(directory)
     return True
 
 
@@ -769,13 +874,52 @@ def load_token(filepath: Path) -> bool:
             data = json.load(fp)
     except Exception:
         return False
-    class_name = data.get("_Serializable_classname")
-    logger.debug(f"Loading token type: {class_name}")
-    token_class = globals().get(class_name)
-    if token_class is None:
-        return False
-    token = getattr(token_class, "from_data")(data)
+    return load_token_data(data)
+
+
+def load_token_data(data: Dict) -> bool:
+    """Create Token or TokenNumber object in memory from its serialized data.
+
+    Args:
+        data (dict): Token data as returned by Token.data() or TokenNumber.data()
+
+    Returns:
+        bool: True if successful, False if data doesn't describe a token.
+    """
+    token = token_from_data(data)
     if token:
-        _tokens[token.name] = token
+        get_registry().tokens[token.name] = token
+        _tokens_changed()
         return True
     return False
+
+
+def tokens_revision() -> int:
+    """
+    Returns:
+        int: Number that changes every time a token is added, removed or updated.
+    """
+    return _revision
+
+
+def _tokens_changed():
+    global _revision
+    _revision += 1
+
+
+def token_from_data(data: Dict) -> Union[Token, TokenNumber, None]:
+    """Create Token or TokenNumber object from its serialized data, without adding
+    it to current session.
+
+    Args:
+        data (dict): Token data as returned by Token.data() or TokenNumber.data()
+
+    Returns:
+        Token: Token or TokenNumber object. None if data doesn't describe a token.
+    """
+    class_name = data.get("_Serializable_classname")
+    logger.debug(f"Loading token type: {class_name}")
+    if class_name not in ("Token", "TokenNumber"):
+        return None
+    token_class = globals().get(class_name)
+    return getattr(token_class, "from_data")(data)
@@ -0,0 +1,176 @@
+import json
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.error import RuleError, TokenError
+from vfxnaming.logger import logger
+from vfxnaming.naming import _repo_manifest, get_repo
+from vfxnaming.session import NamingSession
+
+
+class SessionWatcher(object):
+    """Keeps the current naming session in sync with a repository while it's edited.
+
+    The repo is polled for modification time and size changes of its .token, .rule
+    and vfxnaming.conf files. Only files that changed are read again, and all
+    objects they describe are swapped into the session at once. Compiled data of
+    rules not affected by the change is kept.
+
+    Call load_session() for the same repo before starting to watch it, or pass the
+    NamingSession it was loaded into.
+
+    Args:
+        ``repo`` (Path, optional): Absolute path to a repository. Defaults to get_repo().
+
+        ``interval`` (float, optional): Seconds between polls when running in the
+        background with start(). Defaults to 1.0.
+
+        ``on_change`` (callable, optional): Called with the dict returned by poll()
+        every time a change is applied.
+
+        ``session`` (NamingSession, optional): Session to apply changes to. Defaults
+        to the one active in the thread calling poll(), which for the background
+        thread is the default session.
+    """
+
+    def __init__(
+        self,
+        repo: Union[Path, None] = None,
+        interval: float = 1.0,
+        on_change: Union[Callable[[Dict[str, List[str]]], None], None] = None,
+        session: Union[NamingSession, None] = None,
+    ):
+        self._repo: Path = Path(repo or get_repo())
+        self._interval: float = interval
+        self._on_change = on_change
+        self._session = session
+        self._manifest: Dict[str, List[int]] = _repo_manifest(self._repo)
+        self._stop_event = threading.Event()
+        self._thread: Union[threading.Thread, None] = None
+
+    def poll(self) -> Dict[str, List[str]]:
+        """Look for changes in the repo once and apply them to current session.
+
+        Files that can't be read, e.g.: because they're still being written, are
+        left out and tried again on the next poll.
+
+        Returns:
+            dict: {'added': [...], 'changed': [...], 'removed': [...]} file paths
+            relative to the repo that were applied.
+        """
+        manifest = _repo_manifest(self._repo)
+        added = sorted(set(manifest.keys()) - set(self._manifest.keys()))
+        removed = sorted(set(self._manifest.keys()) - set(manifest.keys()))
+        changed = sorted(
+            relpath
+            for relpath in set(manifest.keys()) & set(self._manifest.keys())
+            if manifest[relpath] != self._manifest[relpath]
+        )
+        result = {"added": [], "changed": [], "removed": removed}
+        if not added and not removed and not changed:
+            return result
+
+        new_tokens = list()
+        new_rules = list()
+        config = None
+        for key, relpaths in (("added", added), ("changed", changed)):
+            for relpath in relpaths:
+                filepath = self._repo / relpath
+                try:
+                    with open(filepath) as fp:
+                        data = json.load(fp)
+                    if relpath.endswith(".token"):
+                        loaded = tokens.token_from_data(data)
+                        new_tokens.append(loaded)
+                    elif relpath.endswith(".rule"):
+                        loaded = rules.Rule.from_data(data)
+                        new_rules.append(loaded)
+                    else:
+                        loaded = config = data
+                except (Exception, RuleError, TokenError) as why:
+                    loaded = None
+                    logger.debug(f"Could not read {filepath}, will retry\n{why}")
+                if loaded is None:
+                    # Keep previous state so this file is looked at again next poll
+                    if relpath in self._manifest:
+                        manifest[relpath] = self._manifest[relpath]
+                    else:
+                        manifest.pop(relpath)
+                    continue
+                result[key].append(relpath)
+
+        logger.debug(f"Applying repo changes: {result}")
+        with self._session or nullcontext():
+            tokens.swap_tokens(
+                [token for token in new_tokens if token],
+                [Path(relpath).stem for relpath in removed if relpath.endswith(".token")],
+            )
+            rules.swap_rules(
+                [rule for rule in new_rules if rule],
+                [Path(relpath).stem for relpath in removed if relpath.endswith(".rule")],
+            )
+            if config is not None:
+                rules.set_active_rule(config.get("set_active_rule"))
+        self._manifest = manifest
+
+        if self._on_change is not None and any(result.values()):
+            self._on_change(result)
+        return result
+
+    def start(self) -> bool:
+        """Poll the repo in a background thread until stop() is called.
+
+        Returns:
+            bool: True if successful, False if already running.
+        """
+        if self.is_running:
+            return False
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self.__run, name="vfxnaming-watcher", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def stop(self, timeout: Union[float, None] = None) -> bool:
+        """Stop polling in the background.
+
+        Returns:
+            bool: True if successful, False if it wasn't running.
+        """
+        if not self.is_running:
+            return False
+        self._stop_event.set()
+        self._thread.join(timeout)
+        self._thread = None
+        return True
+
+    def __run(self):
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.poll()
+            except (Exception, RuleError, TokenError):
+                logger.exception(f"Failed to apply changes from repo: {self._repo}")
+
+    def __enter__(self) -> "SessionWatcher":
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def repo(self) -> Path:
+        return self._repo
+
+    @property
+    def interval(self) -> float:
+        return self._interval
@@ -0,0 +1,113 @@
+import logging
+
+import pytest
+
+from vfxnaming import naming as n
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.logger import get_batch_counts, logger, quiet_batch
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super(_ListHandler, self).__init__(logging.DEBUG)
+        self.records = list()
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class Test_QuietBatch:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("filename", "{side}-{region}_{side}")
+        rules.set_active_rule("filename")
+        self.handler = _ListHandler()
+        level = logger.logger_obj.level
+        logger.set_level(logging.INFO)
+        logger.logger_obj.addHandler(self.handler)
+        yield
+        logger.logger_obj.removeHandler(self.handler)
+        logger.set_level(level)
+
+    def test_summary(self):
+        names = ["nope", "C-FRONT_L", "C_FRONT_L", "X-FRONT_L"]
+        with quiet_batch() as counts:
+            results = [n.validate(name) for name in names * 10]
+            assert self.handler.records == []
+        assert [bool(result) for result in results[:4]] == [False, True, False, False]
+        assert counts[(logging.WARNING, "Name %s does not match rule pattern '%s'")] == 10
+        assert counts[(logging.INFO, "Name %s validated with rules: %s.")] == 10
+        assert get_batch_counts() is None
+        levels = [record.levelno for record in self.handler.records]
+        assert levels == [logging.WARNING, logging.INFO]
+        summary = self.handler.records[0].getMessage()
+        warnings = sum(
+            count for (level, _), count in counts.items() if level == logging.WARNING
+        )
+        assert summary.startswith(f"{warnings} messages held back during batch:")
+        assert "10 x Name %s does not match rule pattern '%s'" in summary
+
+    def test_nested(self):
+        with quiet_batch() as outer:
+            with quiet_batch() as inner:
+                n.validate("nope")
+            assert inner is outer
+            assert self.handler.records == []
+        assert len(self.handler.records) == 1
+
+    def test_errors_not_held_back(self):
+        with quiet_batch() as counts:
+            logger.error("Broken %s", "repo")
+        assert [record.getMessage() for record in self.handler.records] == ["Broken repo"]
+        assert not counts
+
+    def test_disabled_level_not_counted(self):
+        logger.set_level(logging.ERROR)
+        with quiet_batch() as counts:
+            n.validate("nope")
+        assert not counts
+        assert self.handler.records == []
+
+    def test_validate_many_workers(self):
+        names = ["nope", "C-FRONT_L"] * 5
+        with quiet_batch() as counts:
+            results = n.validate_many(names, workers=2, chunk_size=3)
+        assert results == [0, 1] * 5
+        separators_mismatch = (
+            "Separators count mismatch between given name '%s':'%d' "
+            "and rule's pattern '%s':'%d'."
+        )
+        assert counts[(logging.WARNING, separators_mismatch)] == 5
+        assert len(self.handler.records) == 1
+
+
+class Test_LazyFormatting:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        rules.add_rule("filename", "{side}_{side}")
+
+    def test_is_enabled_for(self):
+        level = logger.logger_obj.level
+        logger.set_level(logging.INFO)
+        assert logger.is_enabled_for(logging.INFO) is True
+        assert logger.is_enabled_for(logging.DEBUG) is False
+        logger.set_level(level)
+
+    def test_name_parts_not_built(self, monkeypatch):
+        rule = rules.get_rule("filename")
+        rule.plan
+        calls = list()
+        original = logger.debug
+        monkeypatch.setattr(logger, "debug", lambda *args: calls.append(args))
+        rule.parse("C_L")
+        rule.validate("C_L")
+        assert calls == []
+        monkeypatch.setattr(logger, "debug", original)
@@ -0,0 +1,90 @@
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from vfxnaming import naming as n
+import vfxnaming.metrics as metrics
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+
+
+class Test_Metrics:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("filename", "{@base}_{side}")
+        metrics.reset()
+        metrics.enable()
+        yield
+        metrics.disable()
+        metrics.reset()
+
+    def test_disabled(self):
+        metrics.disable()
+        n.parse("C-FRONT_L", rule="filename")
+        assert metrics.is_enabled() is False
+        assert metrics.get_metrics() == {
+            "operations": {},
+            "counters": {},
+            "cache_hit_rates": {},
+        }
+        assert metrics.to_prometheus() == ""
+
+    def test_operations(self):
+        for _ in range(3):
+            n.parse("C-FRONT_L", rule="filename")
+        n.solve(side="left", region="orbital", rule="base")
+        n.validate("C-FRONT_L", with_rules=["filename", "base"])
+        operations = metrics.get_metrics()["operations"]
+        assert operations["parse"]["filename"]["count"] == 3
+        assert operations["solve"]["base"]["count"] == 1
+        assert sorted(operations["validate"].keys()) == ["base", "filename"]
+        stats = operations["parse"]["filename"]
+        assert 0 < stats["p50"] <= stats["p90"] <= stats["p99"] <= stats["max_seconds"]
+        assert stats["total_seconds"] >= stats["max_seconds"]
+
+    def test_regex_counters(self):
+        rule = rules.get_rule("filename")
+        rule.clear_compiled()
+        for _ in range(4):
+            rule.parse("C-FRONT_L")
+        result = metrics.get_metrics()
+        assert result["counters"]["regex_compiles"]["filename"] == 1
+        assert result["counters"]["regex_cache_misses"]["filename"] == 1
+        assert result["counters"]["regex_cache_hits"]["filename"] >= 3
+        assert 0 < result["cache_hit_rates"]["regex"] < 1
+
+    def test_rules_cache_counters(self):
+        repo = Path(tempfile.mkdtemp())
+        cache_dir = repo / "cache"
+        n.save_session(repo)
+        n.load_session(repo, cache_dir=cache_dir)
+        n.load_session(repo, cache_dir=cache_dir)
+        counters = metrics.get_metrics()["counters"]
+        assert counters["rules_cache_misses"] == {"": 1}
+        assert counters["rules_cache_hits"] == {"": 1}
+
+    def test_prometheus(self):
+        n.parse("C-FRONT_L", rule="filename")
+        repo = Path(tempfile.mkdtemp())
+        n.save_session(repo)
+        n.load_session(repo, cache_dir=repo / "cache")
+        text = metrics.to_prometheus()
+        assert "# TYPE vfxnaming_calls_total counter" in text
+        assert 'vfxnaming_calls_total{operation="parse",rule="filename"} 1' in text
+        assert (
+            'vfxnaming_call_seconds{operation="parse",rule="filename",quantile="0.5"}'
+            in text
+        )
+        assert 'vfxnaming_call_seconds_count{operation="parse",rule="filename"} 1' in text
+        assert "vfxnaming_rules_cache_misses_total 1" in text
+
+    def test_labels_escaped(self):
+        metrics.metrics.count("regex_compiles", 'we"ird\\rule')
+        text = metrics.to_prometheus(prefix="naming")
+        assert 'naming_regex_compiles_total{rule="we\\"ird\\\\rule"} 1' in text
@@ -1,3 +1,8 @@
+import contextvars
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pytest
 import tempfile
@@ -6,7 +11,8 @@ from typing import Dict, List
 from vfxnaming import naming as n
 import vfxnaming.rules as rules
 import vfxnaming.tokens as tokens
-from vfxnaming.error import ParsingError, SolvingError, TokenError
+from vfxnaming.error import ParsingError, RuleError, SolvingError, TokenError
+from vfxnaming.registry import get_registry
 
 
 class Test_Solve:
@@ -136,6 +142,70 @@ class Test_Solve:
         assert solved == name
 
 
+class Test_SolveMany:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tokens.reset_tokens()
+        rules.reset_rules()
+        tokens.add_token("whatAffects")
+        tokens.add_token_number("digits")
+        tokens.add_token(
+            "category",
+            natural="natural",
+            practical="practical",
+            dramatic="dramatic",
+            default="natural",
+        )
+        tokens.add_token("type", lighting="LGT", animation="ANI", default="lighting")
+        rules.add_rule("lights", "{category}_{whatAffects}_{digits}_{type}")
+        rules.add_rule("sides", "{category}-{category}_{whatAffects}")
+
+    def test_rows(self):
+        errors = []
+        rows = [
+            {"whatAffects": "chars", "digits": 1},
+            {
+                "category": "dramatic",
+                "whatAffects": "env",
+                "digits": 12,
+                "type": "animation",
+            },
+            {"category": "natural", "digits": 3},
+            {"category": "whatever", "whatAffects": "env", "digits": 1},
+        ]
+        result = n.solve_many(rows, errors=errors)
+        assert result == [
+            "natural_chars_001_LGT",
+            "dramatic_env_012_ANI",
+            None,
+            None,
+        ]
+        assert [index for index, _, _ in errors] == [2, 3]
+        assert isinstance(errors[0][2], SolvingError)
+        assert isinstance(errors[1][2], TokenError)
+
+    def test_columns(self):
+        result = n.solve_many(
+            {"category1": ["practical", "dramatic"], "whatAffects": ["chars", "env"]},
+            rule="sides",
+        )
+        assert result == ["practical-natural_chars", "dramatic-natural_env"]
+
+    def test_unequal_columns(self):
+        with pytest.raises(SolvingError):
+            n.solve_many({"whatAffects": ["chars", "env"], "digits": [1]})
+
+    def test_generator(self):
+        rows = ({"whatAffects": name, "digits": 1} for name in ("chars", "env"))
+        result = n.solve_many(rows, as_generator=True)
+        assert not isinstance(result, list)
+        assert list(result) == ["natural_chars_001_LGT", "natural_env_001_LGT"]
+
+    def test_matches_solve(self):
+        rows = [{"whatAffects": "chars", "digits": 1, "type": "animation"}]
+        assert n.solve_many(rows) == [n.solve(**row) for row in rows]
+
+
 class Test_Parse:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -203,6 +273,76 @@ class Test_Parse:
         assert parsed is None
 
 
+class Test_ParseMany:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tokens.reset_tokens()
+        rules.reset_rules()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token(
+            "region",
+            orbital="ORBI",
+            parotidmasseter="PAROT",
+            mental="MENT",
+            frontal="FRONT",
+        )
+        tokens.add_token_number("digits")
+        rules.add_rule("filename", "{side}-{region}_{side}-{region}_{digits}")
+
+    def test_rows(self):
+        errors = []
+        result = n.parse_many(
+            ["C-FRONT_L-ORBI_001", "C-FRONT", "R-MENT_C-PAROT_012", "X-FRONT_L-ORBI_001"],
+            errors=errors,
+        )
+        assert result == [
+            {
+                "digits": 1,
+                "region1": "frontal",
+                "region2": "orbital",
+                "side1": "center",
+                "side2": "left",
+            },
+            None,
+            {
+                "digits": 12,
+                "region1": "mental",
+                "region2": "parotidmasseter",
+                "side1": "right",
+                "side2": "center",
+            },
+            None,
+        ]
+        assert [(index, name) for index, name, _ in errors] == [
+            (1, "C-FRONT"),
+            (3, "X-FRONT_L-ORBI_001"),
+        ]
+        assert isinstance(errors[0][2], ParsingError)
+        assert isinstance(errors[1][2], TokenError)
+
+    def test_columnar(self):
+        result = n.parse_many(
+            ["C-FRONT_L-ORBI_001", "C-FRONT", "R-MENT_C-PAROT_012"],
+            rule="filename",
+            columnar=True,
+        )
+        assert result == {
+            "digits": [1, None, 12],
+            "region1": ["frontal", None, "mental"],
+            "region2": ["orbital", None, "parotidmasseter"],
+            "side1": ["center", None, "right"],
+            "side2": ["left", None, "center"],
+        }
+
+    def test_matches_parse(self):
+        names = ["C-FRONT_L-ORBI_001", "R-MENT_C-PAROT_012"]
+        assert n.parse_many(names) == [n.parse(name) for name in names]
+
+    def test_missing_rule(self):
+        with pytest.raises(RuleError):
+            n.parse_many(["C-FRONT_L-ORBI_001"], rule="nope")
+
+
 class Test_Validate:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -318,6 +458,97 @@ class Test_Validate:
         assert len(validated) == expected
 
 
+class Test_Classify:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tokens.reset_tokens()
+        rules.reset_rules()
+        tokens.add_token("whatAffects")
+        tokens.add_token_number("digits")
+        tokens.add_token(
+            "category",
+            natural="natural",
+            practical="practical",
+            dramatic="dramatic",
+            default="natural",
+        )
+        tokens.add_token("type", lighting="LGT", animation="ANI", default="lighting")
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        rules.add_rule("lights", "{category}_{whatAffects}_{digits}_{type}")
+        rules.add_rule("lights_any", "{whatAffects}_{whatAffects}_{digits}_{type}")
+        rules.add_rule("lights_end", "{digits}_{type}", rules.Rule.ANCHOR_END)
+        rules.add_rule("sides", "{side}_{whatAffects}")
+        rules.add_rule("nosep", "{side}{whatAffects}")
+
+    def test_classify_all(self):
+        result = n.classify("dramatic_chars_001_LGT")
+        assert [rule.name for rule, _ in result] == ["lights", "lights_any", "lights_end"]
+        assert result[0][1] == {
+            "category": "dramatic",
+            "digits": 1,
+            "type": "lighting",
+            "whatAffects": "chars",
+        }
+        assert result[1][1] == {
+            "digits": 1,
+            "type": "lighting",
+            "whatAffects1": "dramatic",
+            "whatAffects2": "chars",
+        }
+        assert result[2][1] == {"digits": 1, "type": "lighting"}
+
+    def test_classify_options(self):
+        result = n.classify("whatever_chars_001_ANI")
+        assert [rule.name for rule, _ in result] == ["lights_any", "lights_end"]
+        result = n.classify("L_chars")
+        assert [rule.name for rule, _ in result] == ["sides"]
+        assert n.classify("X_chars") == []
+
+    def test_classify_with_rules(self):
+        result = n.classify("dramatic_chars_001_LGT", with_rules=["sides", "lights"])
+        assert [rule.name for rule, _ in result] == ["lights"]
+        with pytest.raises(RuleError):
+            n.classify("dramatic_chars_001_LGT", with_rules=["nope"])
+
+    def test_classify_strict(self):
+        rules.add_rule("hardcoded", "Always_{side}")
+        assert len(n.classify("always_L", with_rules=["hardcoded"])) == 1
+        assert n.classify("always_L", ["hardcoded"], strict=True) == []
+
+    def test_classify_matches_parse(self):
+        for name in ("dramatic_chars_001_LGT", "practical_env_012_ANI"):
+            for rule, parsed in n.classify(name):
+                assert rule.parse(name) == parsed
+
+    def test_classify_dispatch(self):
+        rules.add_rule("chars", "CHR_{side}_{whatAffects}")
+        rules.add_rule("props", "prp_{side}_{whatAffects}")
+        rules.add_rule("lit", "{whatAffects}_{digits}_LGT", rules.Rule.ANCHOR_END)
+        rule_set = rules.get_rule_set(["chars", "props", "lit", "sides"])
+        result = rule_set.match("chr_L_env")
+        assert [rule.name for rule, _ in result] == ["chars"]
+        assert result[0][1] == {"side": "left", "whatAffects": "env"}
+        assert [rule.name for rule, _ in rule_set.match("PRP_R_env")] == ["props"]
+        assert [rule.name for rule, _ in rule_set.match("L_env_001_lgt")] == ["lit"]
+        candidates = rule_set._compiled[5]
+        assert [rule.name for rule, *_ in candidates[("c", "", (2,))]] == [
+            "chars",
+            "sides",
+        ]
+        assert [rule.name for rule, *_ in candidates[("", "t", (2,))]] == ["lit", "sides"]
+        # Names with fewer separators than a rule needs never reach its regex
+        assert rule_set.match("chr_L") == []
+        assert [rule.name for rule, *_ in candidates[("c", "", (1,))]] == ["sides"]
+        assert rules.get_rule_set(["chars"], strict=True).match("chr_L_env") == []
+
+    def test_classify_after_changes(self):
+        rule_set = rules.get_rule_set(["sides"])
+        assert [rule.name for rule, _ in rule_set.match("L_chars")] == ["sides"]
+        rules.get_rule("sides").pattern = "{whatAffects}_{side}"
+        assert rule_set.match("L_chars") == []
+        assert [rule.name for rule, _ in rule_set.match("chars_L")] == ["sides"]
+
+
 class Test_ValidateHarcodedValues:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -819,3 +1050,611 @@ class Test_Serialization:
         assert rules.has_rule("lights") is True
         assert rules.has_rule("test") is True
         assert rules.get_active_rule().name == "lights"
+
+
+class Test_SessionSnapshot:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("whatAffects")
+        tokens.add_token_number("digits")
+        tokens.add_token("type", lighting="LGT", animation="ANI", default="lighting")
+        rules.add_rule("lights", "{whatAffects}_{digits}_{type}")
+        rules.add_rule("test", "{whatAffects}_{type}")
+        rules.set_active_rule("test")
+        self.repo = Path(tempfile.mkdtemp())
+        n.save_session(self.repo)
+
+    def test_snapshot_written(self):
+        assert (self.repo / n.SESSION_SNAPSHOT_FILE).is_file()
+
+    def test_load_from_snapshot(self, monkeypatch):
+        rules.reset_rules()
+        tokens.reset_tokens()
+
+        def fail_load(filepath):
+            raise AssertionError(f"{filepath} should have been loaded from the snapshot")
+
+        monkeypatch.setattr(tokens, "load_token", fail_load)
+        monkeypatch.setattr(rules, "load_rule", fail_load)
+        assert n.load_session(self.repo) is True
+        assert sorted(tokens.get_tokens().keys()) == ["digits", "type", "whatAffects"]
+        assert sorted(rules.get_rules().keys()) == ["lights", "test"]
+        assert rules.get_active_rule().name == "test"
+        assert n.solve(whatAffects="chars", digits=3) == "chars_LGT"
+
+    def test_outdated_snapshot(self):
+        rules.reset_rules()
+        rules.add_rule("lights", "{whatAffects}-{digits}-{type}")
+        rules.save_rule("lights", self.repo)
+        rules.reset_rules()
+        tokens.reset_tokens()
+        assert n.load_session(self.repo) is True
+        assert rules.get_rule("lights").pattern == "{whatAffects}-{digits}-{type}"
+        assert rules.has_rule("test") is True
+
+    def test_outdated_snapshot_added_file(self):
+        rules.add_rule("other", "{type}_{whatAffects}")
+        with open(self.repo / "other.rule", "w") as fp:
+            json.dump(rules.get_rule("other").data(), fp)
+        # Make sure the change is noticed even on coarse mtime filesystems
+        stat = self.repo.stat()
+        os.utime(self.repo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        rules.reset_rules()
+        assert n._load_session_snapshot(self.repo) is False
+        assert n.load_session(self.repo) is True
+        assert rules.has_rule("other") is True
+
+    def test_outdated_snapshot_subdirectory(self):
+        (self.repo / "nested").mkdir()
+        n.save_session(self.repo, override=False)
+        assert n._load_session_snapshot(self.repo) is True
+        rules.add_rule("other", "{type}_{whatAffects}")
+        rules.save_rule("other", self.repo / "nested")
+        stat = (self.repo / "nested").stat()
+        os.utime(self.repo / "nested", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert n._load_session_snapshot(self.repo) is False
+
+    def test_snapshot_no_repo_walk(self, monkeypatch):
+        def fail_walk(*args, **kwargs):
+            raise AssertionError("Repo files should not be listed to load the snapshot")
+
+        monkeypatch.setattr(n.os, "walk", fail_walk)
+        rules.reset_rules()
+        assert n._load_session_snapshot(self.repo) is True
+        assert sorted(rules.get_rules().keys()) == ["lights", "test"]
+
+    def test_corrupted_snapshot(self):
+        filepath = self.repo / n.SESSION_SNAPSHOT_FILE
+        stat = filepath.stat()
+        with open(filepath, "rb") as fp:
+            content = fp.read()
+        content = content.replace(b"{whatAffects}_{digits}_{type}", b"{whatAffects}")
+        with open(filepath, "wb") as fp:
+            fp.write(content)
+        # Same modification time, only the hash tells it changed
+        os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        rules.reset_rules()
+        assert n._load_session_snapshot(self.repo) is False
+        assert n.load_session(self.repo) is True
+        assert rules.get_rule("lights").pattern == "{whatAffects}_{digits}_{type}"
+
+    def test_unknown_files_skip_snapshot(self):
+        rules.remove_rule("lights")
+        n.save_session(self.repo, override=False)
+        assert (self.repo / n.SESSION_SNAPSHOT_FILE).exists() is False
+        rules.reset_rules()
+        n.load_session(self.repo)
+        assert rules.has_rule("lights") is True
+
+    def test_snapshot_disabled(self):
+        n.save_session(self.repo, snapshot=False)
+        assert (self.repo / n.SESSION_SNAPSHOT_FILE).exists() is False
+
+
+class Test_IncrementalSave:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("whatAffects")
+        tokens.add_token_number("digits")
+        tokens.add_token("type", lighting="LGT", animation="ANI", default="lighting")
+        rules.add_rule("lights", "{whatAffects}_{digits}_{type}")
+        rules.add_rule("test", "{whatAffects}_{type}")
+        self.repo = Path(tempfile.mkdtemp())
+        n.save_session(self.repo)
+
+    def test_no_changes(self):
+        changes = n.save_session(self.repo, incremental=True)
+        assert changes == {"added": [], "changed": [], "removed": []}
+
+    def test_changes(self):
+        untouched = (self.repo / "digits.token").stat().st_mtime_ns
+        rules.remove_rule("test")
+        rules.get_rule("lights").pattern = "{whatAffects}-{digits}-{type}"
+        tokens.add_token("side", center="C", left="L", default="center")
+        changes = n.save_session(self.repo, incremental=True)
+        assert changes == {
+            "added": ["side.token"],
+            "changed": ["lights.rule"],
+            "removed": ["test.rule"],
+        }
+        assert (self.repo / "digits.token").stat().st_mtime_ns == untouched
+        assert sorted(path.name for path in self.repo.iterdir()) == [
+            "digits.token",
+            "lights.rule",
+            "side.token",
+            "type.token",
+            "vfxnaming.conf",
+            "vfxnaming.session",
+            "whatAffects.token",
+        ]
+
+        rules.reset_rules()
+        tokens.reset_tokens()
+        n.load_session(self.repo, use_snapshot=False)
+        assert rules.get_rule("lights").pattern == "{whatAffects}-{digits}-{type}"
+        assert rules.has_rule("test") is False
+        assert tokens.has_token("side") is True
+
+    def test_nested_files(self):
+        (self.repo / "sub").mkdir()
+        os.replace(self.repo / "test.rule", self.repo / "sub" / "test.rule")
+        os.replace(self.repo / "type.token", self.repo / "sub" / "type.token")
+        changes = n.save_session(self.repo, incremental=True)
+        assert changes == {"added": [], "changed": [], "removed": []}
+
+        rules.get_rule("test").pattern = "{whatAffects}-{type}"
+        rules.remove_rule("lights")
+        tokens.remove_token("type")
+        tokens.add_token("type", lighting="LGT", default="lighting")
+        changes = n.save_session(self.repo, incremental=True, snapshot=False)
+        assert changes == {
+            "added": [],
+            "changed": ["sub/type.token", "sub/test.rule", "vfxnaming.conf"],
+            "removed": ["lights.rule"],
+        }
+        assert (self.repo / "test.rule").exists() is False
+        rules.reset_rules()
+        tokens.reset_tokens()
+        n.load_session(self.repo)
+        assert rules.get_rule("test").pattern == "{whatAffects}-{type}"
+        assert tokens.get_token("type").options == {"lighting": "LGT"}
+
+    def test_snapshot_updated(self):
+        rules.get_rule("test").pattern = "{whatAffects}-{type}"
+        n.save_session(self.repo, incremental=True)
+        rules.reset_rules()
+        tokens.reset_tokens()
+        assert n._load_session_snapshot(self.repo) is True
+        assert rules.get_rule("test").pattern == "{whatAffects}-{type}"
+
+
+class Test_ParallelLoad:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("type", lighting="LGT", animation="ANI", default="lighting")
+        tokens.add_token_number("digits")
+        for index in range(20):
+            tokens.add_token(f"token{index:02d}")
+            rules.add_rule(
+                f"rule{index:02d}", f"{{token{index:02d}}}_{{digits}}_{{type}}"
+            )
+        rules.set_active_rule("rule05")
+        self.repo = Path(tempfile.mkdtemp())
+        n.save_session(self.repo, snapshot=False)
+        self.expected_tokens = {
+            name: token.data() for name, token in tokens.get_tokens().items()
+        }
+        self.expected_rules = {
+            name: rule.data() for name, rule in rules.get_rules().items()
+        }
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_load(self, workers: int):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        assert n.load_session(self.repo, workers=workers) is True
+        loaded_tokens = {
+            name: token.data() for name, token in tokens.get_tokens().items()
+        }
+        loaded_rules = {name: rule.data() for name, rule in rules.get_rules().items()}
+        assert loaded_tokens == self.expected_tokens
+        assert loaded_rules == self.expected_rules
+        assert list(loaded_rules.keys()) == sorted(self.expected_rules.keys())
+        assert rules.get_active_rule().name == "rule05"
+
+    def test_unreadable_file(self):
+        with open(self.repo / "broken.token", "w") as fp:
+            fp.write("{not json")
+        rules.reset_rules()
+        tokens.reset_tokens()
+        assert n.load_session(self.repo, workers=4) is True
+        assert tokens.has_token("broken") is False
+        assert len(tokens.get_tokens()) == 22
+
+
+class Test_LazyLoad:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("z_base", "{side}-{region}")
+        rules.add_rule("a_filename", "{@z_base}_{side}")
+        rules.add_rule("other", "{region}_{side}")
+        rules.set_active_rule("a_filename")
+        self.repo = Path(tempfile.mkdtemp())
+
+    @pytest.mark.parametrize("snapshot", [True, False])
+    def test_lazy_load(self, snapshot: bool):
+        n.save_session(self.repo, snapshot=snapshot)
+        rules.reset_rules()
+        tokens.reset_tokens()
+        assert n.load_session(self.repo, lazy=True) is True
+        assert rules.has_rule("other") is True
+        assert [name for name in get_registry().rules.keys() if name != "_active"] == []
+
+        assert n.parse("C-FRONT_L") == {
+            "side1": "center",
+            "region": "frontal",
+            "side2": "left",
+        }
+        # Only the active rule and the rule it references were built
+        assert sorted(
+            name for name in get_registry().rules.keys() if name != "_active"
+        ) == [
+            "a_filename",
+            "z_base",
+        ]
+        assert sorted(rules.get_rules().keys()) == ["a_filename", "other", "z_base"]
+
+    def test_lazy_remove(self):
+        n.save_session(self.repo)
+        n.load_session(self.repo, lazy=True)
+        assert rules.remove_rule("other") is True
+        assert rules.has_rule("other") is False
+        assert rules.get_rule("other") is None
+
+
+class Test_RulesCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("z_base", "{side}-{region}")
+        rules.add_rule("a_filename", "{@z_base}_{side}")
+        rules.set_active_rule("a_filename")
+        self.repo = Path(tempfile.mkdtemp())
+        self.cache_dir = Path(tempfile.mkdtemp()) / "cache"
+
+    @pytest.mark.parametrize("use_snapshot", [True, False])
+    def test_cache_reused(self, use_snapshot: bool):
+        n.save_session(self.repo)
+        assert n.load_session(self.repo, use_snapshot, cache_dir=self.cache_dir) is True
+        cache_files = list(self.cache_dir.iterdir())
+        assert len(cache_files) == 1
+        with open(cache_files[0]) as fp:
+            cached = json.load(fp)["rules"]
+        assert cached["a_filename"]["expanded_pattern"] == "{side}-{region}_{side}"
+
+        assert n.load_session(self.repo, use_snapshot, cache_dir=self.cache_dir) is True
+        rule = rules.get_rule("a_filename")
+        # Plan and regex source come from the cache, not from building them again
+        assert rule._plan is not None
+        assert rule._regex_sources == {
+            "{side}-{region}_{side}": cached["a_filename"]["regex"]
+        }
+        assert n.parse("C-FRONT_L") == {
+            "side1": "center",
+            "region": "frontal",
+            "side2": "left",
+        }
+        assert n.solve(side1="center", region="frontal", side2="left") == "C-FRONT_L"
+
+    @pytest.mark.parametrize("lazy", [False, True])
+    def test_expansion_skipped(self, monkeypatch, lazy: bool):
+        n.save_session(self.repo)
+        n.load_session(self.repo, cache_dir=self.cache_dir)
+        assert n.load_session(self.repo, lazy=lazy, cache_dir=self.cache_dir) is True
+        if not lazy:
+            assert get_registry().expansions == {
+                "z_base": "{side}-{region}",
+                "a_filename": "{side}-{region}_{side}",
+            }
+
+        def expand_reference(*args, **kwargs):
+            raise AssertionError("Cached expanded pattern was not used")
+
+        monkeypatch.setattr(rules.Rule, "_Rule__expand_reference", expand_reference)
+        assert n.parse("C-FRONT_L")["region"] == "frontal"
+        assert n.solve(side1="center", region="frontal", side2="left") == "C-FRONT_L"
+        # Changes to a referenced rule still expand again
+        monkeypatch.undo()
+        rules.get_rule("z_base").pattern = "{side}.{region}"
+        assert n.parse("C.FRONT_L")["region"] == "frontal"
+
+    def test_cache_shared_by_snapshot_and_files(self):
+        n.save_session(self.repo)
+        n.load_session(self.repo, use_snapshot=True, cache_dir=self.cache_dir)
+        n.load_session(self.repo, use_snapshot=False, cache_dir=self.cache_dir)
+        assert len(list(self.cache_dir.iterdir())) == 1
+
+    def test_cache_keyed_by_rules_content(self):
+        n.save_session(self.repo)
+        n.load_session(self.repo, cache_dir=self.cache_dir)
+        rules.get_rule("z_base").pattern = "{side}.{region}"
+        n.save_session(self.repo)
+        n.load_session(self.repo, cache_dir=self.cache_dir)
+        assert len(list(self.cache_dir.iterdir())) == 2
+        assert n.parse("C.FRONT_L") == {
+            "side1": "center",
+            "region": "frontal",
+            "side2": "left",
+        }
+
+    def test_invalid_cache_ignored(self):
+        n.save_session(self.repo)
+        n.load_session(self.repo, cache_dir=self.cache_dir)
+        cache_file = list(self.cache_dir.iterdir())[0]
+        cache_file.write_text("{not json")
+        assert n.load_session(self.repo, cache_dir=self.cache_dir) is True
+        assert n.parse("C-FRONT_L")["region"] == "frontal"
+
+    def test_cache_from_env(self, monkeypatch):
+        monkeypatch.setenv(n.NAMING_CACHE_ENV, str(self.cache_dir))
+        n.save_session(self.repo)
+        n.load_session(self.repo)
+        assert len(list(self.cache_dir.iterdir())) == 1
+
+
+class Test_ThreadSafety:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("filename", "{side}-{region}")
+        rules.add_rule("other", "{region}_{side}")
+        rules.set_active_rule("filename")
+
+    def test_rule_argument(self):
+        assert n.parse("FRONT_L", rule="other") == {"side": "left", "region": "frontal"}
+        assert n.solve(side="left", region="frontal", rule="other") == "FRONT_L"
+        assert (
+            n.solve(side="left", region="frontal", rule=rules.get_rule("filename"))
+            == "L-FRONT"
+        )
+        with pytest.raises(RuleError):
+            n.parse("FRONT_L", rule="missing")
+        assert rules.get_active_rule().name == "filename"
+
+    def test_validate_keeps_active_rule(self, monkeypatch):
+        def fail(name):
+            raise AssertionError("validate must not change the active rule")
+
+        monkeypatch.setattr(rules, "set_active_rule", fail)
+        validated = n.validate("FRONT_L", with_rules=["filename", "other"])
+        assert [rule.name for rule in validated] == ["other"]
+
+    def test_concurrent_validate(self):
+        stop = threading.Event()
+
+        def edit_rules():
+            index = 0
+            while not stop.is_set():
+                rules.add_rule(f"extra_{index % 5}", "{side}.{region}")
+                rules.get_rule("filename").pattern = "{side}-{region}"
+                index += 1
+
+        def validate(index):
+            if index % 2:
+                return [
+                    rule.name for rule in n.validate("FRONT_L", ["filename", "other"])
+                ]
+            return [rule.name for rule in n.validate("L-FRONT", ["filename", "other"])]
+
+        writer = threading.Thread(target=edit_rules)
+        writer.start()
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(validate, range(400)))
+        finally:
+            stop.set()
+            writer.join()
+        assert results == [["filename"], ["other"]] * 200
+        assert rules.get_active_rule().name == "filename"
+
+    def test_concurrent_lazy_build(self):
+        repo = Path(tempfile.mkdtemp())
+        n.save_session(repo)
+        n.load_session(repo, lazy=True)
+        barrier = threading.Barrier(8)
+
+        def get_rule(_):
+            barrier.wait()
+            return rules.get_rule("other")
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            built = list(executor.map(get_rule, range(8)))
+        assert built[0] is not None
+        assert all(rule is built[0] for rule in built)
+
+
+class Test_ValidateMany:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        tokens.add_token_number("number")
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("filename", "{@base}_{number}")
+        rules.add_rule("other", "{region}_{side}")
+        rules.set_active_rule("filename")
+        self.names = ["C-FRONT_001", "FRONT_L", "nope", "L-ORBI_012", "ORBI_R"] * 7
+
+    def expected(self) -> List[int]:
+        return [
+            sum(
+                1 << index
+                for index, rule_name in enumerate(["filename", "other"])
+                if rules.get_rule(rule_name).validate(name)
+            )
+            for name in self.names
+        ]
+
+    def test_active_rule(self):
+        assert n.validate_many(["C-FRONT_001", "FRONT_L"]) == [1, 0]
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_validate_many(self, workers: int):
+        results = n.validate_many(
+            self.names, ["filename", "other"], workers=workers, chunk_size=3
+        )
+        assert results == self.expected()
+        assert results[:5] == [0b01, 0b10, 0, 0b01, 0b10]
+
+    def test_generator(self):
+        results = n.validate_many(
+            iter(self.names),
+            ["filename", rules.get_rule("other")],
+            workers=2,
+            chunk_size=4,
+            as_generator=True,
+        )
+        assert not isinstance(results, list)
+        assert list(results) == self.expected()
+
+    def test_missing_rule(self):
+        with pytest.raises(RuleError):
+            n.validate_many(self.names, ["missing"])
+
+    def test_worker_rules(self, monkeypatch):
+        monkeypatch.setattr(n, "_worker_rules", [])
+        validate = [rules.get_rule("filename"), rules.Rule("unregistered", "{side}")]
+        changed = rules.Rule("other", "{side}_{region}")
+        payload = {
+            "tokens": [token.data() for token in tokens.get_tokens().values()],
+            "rules": [rule.data() for rule in rules.get_rules().values()],
+            "validate": [rule.data() for rule in validate + [changed]],
+            "strict": False,
+        }
+
+        def init_worker():
+            n._init_validate_worker(payload)
+            registry = get_registry()
+            return [registry.rules.get(rule.name) is rule for rule in n._worker_rules]
+
+        # Registered rules are reused, so their expansions are memoized
+        assert contextvars.copy_context().run(init_worker) == [True, False, False]
+        assert n._worker_rules[2].pattern == "{side}_{region}"
+
+
+class Test_Scan:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        tokens.add_token("show", alpha="alpha", beta="beta")
+        tokens.add_token_number("version", prefix="v")
+        rules.add_rule("filename", "{side}-{region}.abc")
+        rules.add_rule("other", "{region}_{side}.abc")
+        rules.add_rule("path", "shows/{show}/publish/{side}_{version}.abc")
+        rules.set_active_rule("filename")
+        self.root = Path(tempfile.mkdtemp())
+        files = [
+            "C-FRONT.abc",
+            "nope.txt",
+            "assets/L-ORBI.abc",
+            "assets/deep/FRONT_R.abc",
+            "shows/alpha/publish/C_v001.abc",
+            "shows/beta/publish/L_v012.abc",
+            "shows/beta/work/R-FRONT.abc",
+        ]
+        for each in files:
+            filepath = self.root / each
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+            filepath.touch()
+
+    def relative(self, results) -> List:
+        return sorted(
+            (path.relative_to(self.root).as_posix(), rule.name, parsed)
+            for path, rule, parsed in results
+        )
+
+    def test_active_rule(self):
+        assert self.relative(n.scan(self.root)) == [
+            ("C-FRONT.abc", "filename", {"side": "center", "region": "frontal"}),
+            ("assets/L-ORBI.abc", "filename", {"side": "left", "region": "orbital"}),
+            (
+                "shows/beta/work/R-FRONT.abc",
+                "filename",
+                {"side": "right", "region": "frontal"},
+            ),
+        ]
+
+    def test_not_recursive(self):
+        results = self.relative(n.scan(self.root, ["filename", "other"], recursive=False))
+        assert [path for path, _, _ in results] == ["C-FRONT.abc"]
+
+    def test_many_rules(self):
+        results = self.relative(n.scan(self.root, ["filename", "other"]))
+        assert [(path, rule) for path, rule, _ in results] == [
+            ("C-FRONT.abc", "filename"),
+            ("assets/L-ORBI.abc", "filename"),
+            ("assets/deep/FRONT_R.abc", "other"),
+            ("shows/beta/work/R-FRONT.abc", "filename"),
+        ]
+
+    def test_is_lazy(self):
+        results = n.scan(self.root, ["filename"])
+        assert next(results)[1].name == "filename"
+        results.close()
+
+    @pytest.mark.parametrize("prune", [True, False])
+    def test_match_path(self, prune: bool, monkeypatch):
+        scanned = list()
+        original_scandir = os.scandir
+
+        def counting_scandir(path):
+            scanned.append(Path(path).relative_to(self.root).as_posix())
+            return original_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        results = self.relative(n.scan(self.root, ["path"], match_path=True, prune=prune))
+        assert results == [
+            (
+                "shows/alpha/publish/C_v001.abc",
+                "path",
+                {"show": "alpha", "side": "center", "version": 1},
+            ),
+            (
+                "shows/beta/publish/L_v012.abc",
+                "path",
+                {"show": "beta", "side": "left", "version": 12},
+            ),
+        ]
+        if prune:
+            assert sorted(scanned) == [
+                ".",
+                "shows",
+                "shows/alpha",
+                "shows/alpha/publish",
+                "shows/beta",
+                "shows/beta/publish",
+                "shows/beta/work",
+            ]
+        else:
+            assert "assets/deep" in scanned
@@ -1,4 +1,13 @@
+import copy
+import pickle
+import re
+from typing import Dict, Tuple
+
+from vfxnaming import naming as n
 import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.error import RuleError
+from vfxnaming.registry import get_registry
 
 import pytest
 
@@ -43,3 +52,517 @@ class Test_Rule:
         result = rules.get_active_rule()
         assert result is not None
         assert result is test_rule
+
+
+class Test_RuleRegexCache:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+
+    def test_regex_compiled_once(self, monkeypatch):
+        rule = rules.add_rule("filename", "{side}_{region}")
+        compiles = []
+        original_compile = re.compile
+
+        def counting_compile(*args, **kwargs):
+            compiles.append(args)
+            return original_compile(*args, **kwargs)
+
+        monkeypatch.setattr(re, "compile", counting_compile)
+        for _ in range(5):
+            assert rule.parse("C_FRONT") == {"side": "center", "region": "frontal"}
+            assert rule.validate("L_ORBI") is True
+        # add_rule already compiled the default expression, only strict is compiled here
+        assert rule.regex(strict=True) is rule.regex(strict=True)
+        assert len([each for each in compiles if "?P<side001>" in each[0]]) == 1
+        # Validation expression, compiled on first validate()
+        assert len([each for each in compiles if "(?-i:" in each[0]]) == 1
+
+    def test_pattern_change_invalidates(self):
+        rule = rules.add_rule("filename", "{side}_{region}")
+        assert rule.parse("C_FRONT") == {"side": "center", "region": "frontal"}
+        rule.pattern = "{region}-{side}"
+        assert rule.parse("FRONT-C") == {"side": "center", "region": "frontal"}
+
+    def test_reference_change_invalidates(self):
+        base = rules.add_rule("base", "{side}")
+        rule = rules.add_rule("filename", "{@base}_{region}")
+        assert rule.parse("C_FRONT") == {"side": "center", "region": "frontal"}
+        base.pattern = "{side}-{side}"
+        assert rule.parse("C-L_FRONT") == {
+            "side1": "center",
+            "side2": "left",
+            "region": "frontal",
+        }
+
+
+class Test_RulePlan:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+
+    def test_plan_data(self):
+        rule = rules.add_rule("filename", "{side}-{region}_{side}-{region}.png")
+        plan = rule.plan
+        assert plan.fields == ("side", "region", "side", "region")
+        assert plan.repeated_fields == ("side", "region")
+        assert plan.fields_with_digits == ("side1", "region1", "side2", "region2")
+        assert plan.expected_separators == ("-", "_", "-", ".")
+        assert plan.digits_pattern == "{side1}-{region1}_{side2}-{region2}.png"
+        assert [key for _, _, key in plan.groups] == [
+            "region1",
+            "region2",
+            "side1",
+            "side2",
+        ]
+
+    def test_plan_reused(self):
+        rule = rules.add_rule("filename", "{side}_{region}")
+        assert rule.plan is rule.plan
+
+    def test_plan_invalidated(self):
+        base = rules.add_rule("base", "{side}")
+        rule = rules.add_rule("filename", "{@base}_{region}")
+        plan = rule.plan
+        base.pattern = "{side}-{region}"
+        assert rule.plan is not plan
+        assert rule.fields == ("side", "region", "region")
+        rule.pattern = "{region}"
+        assert rule.fields == ("region",)
+
+
+class Test_GetRules:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        self.lights = rules.add_rule("lights", "{category}_{function}_{digits}")
+        rules.add_rule("test", "{category}_{function}")
+
+    def test_view(self):
+        all_rules = rules.get_rules()
+        assert list(all_rules.keys()) == ["lights", "test"]
+        assert all_rules["lights"] is self.lights
+        assert rules.get_rules() is all_rules
+        with pytest.raises(TypeError):
+            all_rules["other"] = self.lights
+
+    def test_view_rebuilt(self):
+        all_rules = rules.get_rules()
+        rules.add_rule("other", "{category}-{function}")
+        assert "other" in rules.get_rules()
+        assert "other" not in all_rules
+        rules.remove_rule("test")
+        assert list(rules.get_rules().keys()) == ["lights", "other"]
+
+    def test_copy_rules(self):
+        copied = rules.copy_rules()
+        assert list(copied.keys()) == ["lights", "test"]
+        assert copied["lights"] is not self.lights
+        assert copied["lights"].data() == self.lights.data()
+
+
+class Test_RuleReferences:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("filename", "{@base}_{side}")
+        rules.add_rule("path", "{@filename}/{region}")
+        rules.add_rule("other", "{region}_{side}")
+
+    def test_references(self):
+        assert rules.get_rule("path").references == ("filename",)
+        assert rules.get_rule("base").references == ()
+
+    @pytest.mark.parametrize(
+        "name,pattern",
+        [
+            ("selfish", "{@selfish}_{side}"),
+            ("base", "{@path}_{side}"),
+        ],
+    )
+    def test_cycle_rejected(self, name: str, pattern: str):
+        with pytest.raises(RuleError, match="Circular reference"):
+            rules.add_rule(name, pattern)
+
+    def test_cycle_rejected_on_pattern_change(self):
+        base = rules.get_rule("base")
+        base.pattern = "{@path}_{side}"
+        assert base.pattern == "{side}-{region}"
+
+    def test_cycle_from_data(self):
+        rules.load_rule_data(rules.Rule("a", "{@b}").data())
+        rules.load_rule_data(rules.Rule("b", "{@a}").data())
+        with pytest.raises(RuleError, match="Circular reference found: a -> b -> a"):
+            rules.get_rule("a").expanded_pattern()
+
+    def test_expansion_computed_once(self, monkeypatch):
+        assert (
+            rules.get_rule("path").expanded_pattern() == "{side}-{region}_{side}/{region}"
+        )
+        calls = []
+        original_get_rule = rules.get_rule
+
+        def counting_get_rule(name):
+            calls.append(name)
+            return original_get_rule(name)
+
+        monkeypatch.setattr(rules, "get_rule", counting_get_rule)
+        for _ in range(5):
+            rules.get_rule("path").expanded_pattern()
+        assert calls == ["path"] * 5
+
+    def test_targeted_invalidation(self):
+        for name in ("base", "filename", "path", "other"):
+            assert rules.get_rule(name).validate("C-FRONT_C/FRONT") in (True, False)
+        rules.get_rule("base").pattern = "{side}.{region}"
+        assert rules.get_rule("path")._regex_cache == {}
+        assert rules.get_rule("filename")._regex_cache == {}
+        assert rules.get_rule("other")._regex_cache != {}
+        assert rules.get_rule("path").parse("C.FRONT_L/ORBI") == {
+            "side1": "center",
+            "region1": "frontal",
+            "side2": "left",
+            "region2": "orbital",
+        }
+
+    def test_dependents_index(self):
+        registry = get_registry()
+        assert registry.dependents == {"base": {"filename"}, "filename": {"path"}}
+        rules.get_rule("path").pattern = "{@base}/{region}"
+        assert registry.dependents == {"base": {"filename", "path"}}
+        rules.update_rule_name("filename", "file")
+        rules.swap_rules([rules.Rule("other", "{@path}_{side}")])
+        assert registry.dependents == {"base": {"file", "path"}, "path": {"other"}}
+        rules.remove_rule("path")
+        assert registry.dependents == {"base": {"file"}, "path": {"other"}}
+        rules.reset_rules()
+        assert registry.dependents == {}
+
+    def test_bulk_load_invalidates_once(self, monkeypatch):
+        calls = []
+        original_dependent_rules = rules._dependent_rules
+
+        def counting_dependent_rules(names):
+            calls.append(list(names))
+            return original_dependent_rules(calls[-1])
+
+        monkeypatch.setattr(rules, "_dependent_rules", counting_dependent_rules)
+        datas = [
+            rules.Rule(f"rule{index}", "{@base}_{side}").data() for index in range(10)
+        ]
+        n._load_rules_data(datas)
+        assert len(calls) == 1
+        assert len(get_registry().dependents["base"]) == 11
+
+    def test_removed_reference(self):
+        rules.get_rule("path").expanded_pattern()
+        rules.remove_rule("base")
+        with pytest.raises(RuleError, match="Failed to find reference base"):
+            rules.get_rule("path").expanded_pattern()
+
+
+class Test_RulePrefilter:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        tokens.add_token_number("number")
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("mesh", "{@base}_{number}_MSH", rules.Rule.ANCHOR_BOTH)
+        rules.add_rule("lod", "lod.{number}", rules.Rule.ANCHOR_START)
+
+    def test_plan(self):
+        plan = rules.get_rule("mesh").plan
+        assert plan.literals == ("-", "_", "_MSH")
+        assert plan.prefix == ""
+        assert plan.suffix == "_MSH"
+        assert plan.separator_counts == (("-", 1), ("_", 2))
+        assert plan.min_length == 9
+        assert plan.max_length is None
+        assert rules.get_rule("lod").plan.prefix == "lod."
+
+    @pytest.mark.parametrize(
+        "rule_name,name,strict,expected",
+        [
+            ("mesh", "C-FRONT_001_MSH", False, True),
+            ("mesh", "c-front_001_msh", False, True),
+            ("mesh", "c-front_001_msh", True, False),
+            ("mesh", "C-FRONT_001_GEO", False, False),
+            ("mesh", "C_FRONT-001_MSH", False, False),
+            ("mesh", "C-F_1_MS", False, False),
+            ("lod", "LOD.1", False, True),
+            ("lod", "xlod.1", False, False),
+            # Anything not ASCII is left for the regex to decide
+            ("lod", "ŁOD.1", False, True),
+        ],
+    )
+    def test_might_match(self, rule_name: str, name: str, strict: bool, expected: bool):
+        assert rules.get_rule(rule_name).might_match(name, strict) is expected
+
+    @pytest.mark.parametrize(
+        "name,strict",
+        [
+            ("C-FRONT_001_MSH", False),
+            ("c-front_001_msh", False),
+            ("c-front_001_msh", True),
+            ("C-FRONT_001_GEO", False),
+            ("C-FRONT_001_MSH_", False),
+            ("X-FRONT_001_MSH", False),
+        ],
+    )
+    def test_never_rejects_regex_match(self, name: str, strict: bool):
+        rule = rules.get_rule("mesh")
+        if rule.regex(strict).search(name) is not None:
+            assert rule.might_match(name, strict) is True
+        else:
+            assert rule.validate(name, strict=strict) is False
+
+    def test_regex_skipped(self, monkeypatch):
+        rule = rules.get_rule("mesh")
+        rule.plan
+        monkeypatch.setattr(rule, "_regex_cache", {})
+        assert rule.parse("C-FRONT_001_GEO") == {}
+        assert rule.validate("C-FRONT_001_GEO") is False
+        assert rule._regex_cache == {}
+
+    def test_rule_set(self):
+        rule_set = rules.RuleSet([rules.get_rule("mesh"), rules.get_rule("lod")])
+        assert rule_set.match("C-FRONT_001_GEO") == []
+        assert [rule.name for rule, _ in rule_set.match("L-ORBI_002_MSH")] == ["mesh"]
+
+
+class Test_ValidationResult:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        tokens.add_token_number("number", prefix="v", suffix="x", padding=3)
+        rules.add_rule("filename", "{side}-{region}_{number}")
+        rules.add_rule("nope", "{side}")
+
+    @pytest.mark.parametrize(
+        "rule_name,name,validate_values,expected",
+        [
+            (
+                "filename",
+                "C-FRONT_v001x",
+                {},
+                (rules.ValidationCode.OK, None, None, None),
+            ),
+            ("nope", "C", {}, (rules.ValidationCode.NO_SEPARATORS, None, None, None)),
+            (
+                "filename",
+                "C-FRONT",
+                {},
+                (rules.ValidationCode.SEPARATORS_MISMATCH, None, 1, 2),
+            ),
+            (
+                "filename",
+                "C-FRONT_",
+                {},
+                (rules.ValidationCode.NO_MATCH, None, None, None),
+            ),
+            (
+                "filename",
+                "C-FRONT_v001x",
+                {"side": "L"},
+                (rules.ValidationCode.VALUE_MISMATCH, "side", "C", "L"),
+            ),
+            (
+                "filename",
+                "C-front_v001x",
+                {"region": "FRONT"},
+                (rules.ValidationCode.CASING_MISMATCH, "region", "front", "FRONT"),
+            ),
+            (
+                "filename",
+                "X-FRONT_v001x",
+                {},
+                (rules.ValidationCode.UNKNOWN_OPTION, "side", "X", None),
+            ),
+            (
+                "filename",
+                "C-FRONT_v001",
+                {},
+                (rules.ValidationCode.MISSING_SUFFIX, "number", "v001", "x"),
+            ),
+            (
+                "filename",
+                "C-FRONT_001x",
+                {},
+                (rules.ValidationCode.MISSING_PREFIX, "number", "001x", "v"),
+            ),
+            (
+                "filename",
+                "C-FRONT_vabcx",
+                {},
+                (rules.ValidationCode.NOT_DIGITS, "number", "vabcx", ("v", "x")),
+            ),
+            (
+                "filename",
+                "C-FRONT_v01x",
+                {},
+                (rules.ValidationCode.PADDING, "number", "v01x", 3),
+            ),
+        ],
+    )
+    def test_validate_result(
+        self, rule_name: str, name: str, validate_values: Dict, expected: Tuple
+    ):
+        rule = rules.get_rule(rule_name)
+        result = rule.validate_result(name, **validate_values)
+        assert (result.code, result.token, result.value, result.expected) == expected
+        assert result.rule == rule_name
+        assert bool(result) is (expected[0] == rules.ValidationCode.OK)
+        assert rule.validate(name, **validate_values) is bool(result)
+
+    def test_first_failure_only(self):
+        # Tokens are checked in group order: number, region, side
+        result = rules.get_rule("filename").validate_result("X-FRONT_v01x")
+        assert result.code == rules.ValidationCode.PADDING
+
+    def test_compact(self):
+        result = rules.get_rule("filename").validate_result("C-FRONT")
+        assert not hasattr(result, "__dict__")
+        assert result == pickle.loads(pickle.dumps(result))
+        assert repr(result) == (
+            "ValidationResult(SEPARATORS_MISMATCH, rule='filename', token=None, "
+            "value=1, expected=2)"
+        )
+
+    def test_nothing_logged(self, monkeypatch):
+        calls = list()
+        monkeypatch.setattr(rules.logger, "warning", lambda *args: calls.append(args))
+        rules.get_rule("filename").validate_result("X-FRONT_v01x")
+        assert calls == []
+        rules.get_rule("filename").validate("X-FRONT_v01x")
+        assert [args[0] for args in calls] == [
+            "Token %s: %s must have %d digits",
+            "Token %s has no option %s",
+        ]
+
+
+class Test_RuleValidator:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI", default="frontal")
+        tokens.add_token("description")
+        tokens.add_token_number("version", prefix="v", padding=3)
+        tokens.add_token_number("frame", suffix="f", padding=2)
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("filename", "{@base}_{description}_{version}.{frame}")
+        rules.add_rule("plain", "{description}_{version}")
+
+    @pytest.mark.parametrize(
+        "name",
+        [
+            "C-FRONT_hero_v001.01f",
+            "center-frontal_hero_v001.01f",
+            "c-front_hero_v001.01f",
+            "C-FRONT_hero_V001.01f",
+            "C-FRONT_hero_v01.01f",
+            "C-FRONT_hero_v1234.01f",
+            "C-FRONT_hero_v0012.01f",
+            "C-FRONT_hero_001.01f",
+            "C-FRONT_hero_vabc.01f",
+            "C-FRONT_hero_v001.01",
+            "C-FRONT_hero_v001.100f",
+            "X-FRONT_hero_v001.01f",
+            "C-FRONTAL_hero_v001.01f",
+            "C-FRONT_v001.01f",
+            "prefix_C-FRONT_hero_v001.01f",
+        ],
+    )
+    @pytest.mark.parametrize("strict", [False, True])
+    def test_same_as_token_checks(self, monkeypatch, name: str, strict: bool):
+        rule = rules.get_rule("filename")
+        assert rule.validator(strict) is not None
+        expected_result = rule.validate_result(name, strict)
+        expected = rule.validate(name, strict)
+        monkeypatch.setattr(rule, "_Rule__validator", lambda *args: None)
+        assert rule.validate(name, strict) is expected
+        assert rule.validate_result(name, strict) == expected_result
+
+    @pytest.mark.parametrize(
+        "pattern,name,expected",
+        [
+            ("{side}_{region}_{description}", "L_ORBI_hero", True),
+            ("{side}_{description}_{region}", "L_hero_ORBIX", False),
+            ("{side}_{description}_{version}", "L_hero_v001", True),
+            ("{side}_{description}_{version}", "L_hero_v001x", False),
+            ("{side}_{description}_{version}", "L_hero_v0001", False),
+            ("{side}_{description}", "L_x_y", False),
+        ],
+    )
+    def test_same_split(self, monkeypatch, pattern: str, name: str, expected: bool):
+        rules.add_rule("split", pattern)
+        rule = rules.get_rule("split")
+        assert rule.validator() is not None
+        assert rule.validate(name) is expected
+        monkeypatch.setattr(rule, "_Rule__validator", lambda *args: None)
+        assert rule.validate(name) is expected
+
+    def test_copy_after_validate(self):
+        rule = rules.get_rule("filename")
+        assert rule.validate("C-FRONT_hero_v001.01f") is True
+        copied = copy.deepcopy(rule)
+        assert copied.validate("C-FRONT_hero_v001.01f") is True
+        session = rules.copy_rules()
+        assert session["filename"].validate("C-FRONT_hero_v001.01f") is True
+
+    def test_no_python_checks(self, monkeypatch):
+        rule = rules.get_rule("filename")
+        rule.validator()
+        monkeypatch.setattr(rules, "get_token", None)
+        assert rule.validate("L-ORBI_hero_v002.03f") is True
+
+    def test_not_available(self):
+        assert rules.get_rule("plain").validator() is None
+        rules.add_rule("custom", "{side:[A-Z]}_{region}")
+        assert rules.get_rule("custom").validator() is None
+        rules.add_rule("missing", "{side}_{nope}")
+        assert rules.get_rule("missing").validator() is None
+
+    def test_validate_values(self):
+        rule = rules.get_rule("filename")
+        assert rule.validate("C-FRONT_hero_v001.01f", side="C") is True
+        assert rule.validate("C-FRONT_hero_v001.01f", side="L") is False
+
+    def test_token_changes(self):
+        rule = rules.get_rule("filename")
+        validator = rule.validator()
+        assert rule.validator() is validator
+        assert rule.validate("M-FRONT_hero_v001.01f") is False
+        tokens.get_token("side").add_option("middle", "M")
+        assert rule.validator() is not validator
+        assert rule.validate("M-FRONT_hero_v001.01f") is True
+        tokens.get_token("version").padding = 4
+        assert rule.validate("M-FRONT_hero_v001.01f") is False
+        tokens.remove_token("side")
+        tokens.add_token("side", left="L")
+        assert rule.validate("C-FRONT_hero_v0001.01f") is False
+        assert rule.validate("L-FRONT_hero_v0001.01f") is True
+
+    def test_reference_changes(self):
+        rule = rules.get_rule("filename")
+        assert rule.validate("C-FRONT_hero_v001.01f") is True
+        rules.get_rule("base").pattern = "{region}-{side}"
+        assert rule.validate("C-FRONT_hero_v001.01f") is False
+        assert rule.validate("FRONT-C_hero_v001.01f") is True
@@ -0,0 +1,109 @@
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.session import NamingSession
+
+
+class Test_NamingSession:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        rules.add_rule("default_rule", "{side}_default")
+
+        self.show_a = NamingSession()
+        with self.show_a:
+            tokens.add_token("side", center="C", left="L", right="R", default="center")
+            tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+            rules.add_rule("filename", "{side}-{region}")
+
+        self.show_b = NamingSession()
+        with self.show_b:
+            tokens.add_token("side", center="CTR", left="LFT", right="RGT")
+            tokens.add_token_number("number")
+            rules.add_rule("filename", "{side}_{number}")
+
+    def test_independent_sessions(self):
+        assert self.show_a.parse("L-ORBI") == {"side": "left", "region": "orbital"}
+        assert self.show_b.parse("LFT_012") == {"side": "left", "number": 12}
+        assert self.show_a.solve(side="left", region="orbital") == "L-ORBI"
+        assert self.show_b.solve(side="left", number=12) == "LFT_012"
+        assert self.show_a.validate("C-FRONT") == [self.show_a.get_rule("filename")]
+        assert self.show_b.validate("C-FRONT") == []
+        # Module functions keep working with the default session
+        assert rules.get_active_rule().name == "default_rule"
+        assert sorted(tokens.get_tokens().keys()) == ["side"]
+
+    def test_default(self):
+        default = NamingSession.default()
+        assert default.get_active_rule() is rules.get_active_rule()
+        assert default.parse("R_default") == {"side": "right"}
+
+    def test_nested(self):
+        with self.show_a:
+            with self.show_b:
+                assert rules.get_active_rule() is self.show_b.get_rule("filename")
+            assert rules.get_active_rule() is self.show_a.get_rule("filename")
+        assert rules.get_active_rule().name == "default_rule"
+
+    def test_many(self):
+        assert self.show_b.parse_many(["LFT_001", "RGT_002"], columnar=True) == {
+            "side": ["left", "right"],
+            "number": [1, 2],
+        }
+        rows = [{"side": "left", "number": 1}, {"side": "right", "number": 2}]
+        assert self.show_b.solve_many(rows) == ["LFT_001", "RGT_002"]
+        solved = self.show_b.solve_many(rows, as_generator=True)
+        assert list(solved) == ["LFT_001", "RGT_002"]
+        assert [rule.name for rule, _ in self.show_a.classify("C-FRONT")] == ["filename"]
+
+    def test_rules_bound_to_session(self):
+        with self.show_a:
+            rules.add_rule("base", "{side}_{region}")
+            rules.add_rule("path", "{@base}.{side}")
+        with self.show_b:
+            rules.add_rule("base", "{number}_{side}")
+        rules.add_rule("base", "{side}")
+        rule = self.show_a.get_rule("path")
+        expected = {"side1": "left", "region": "orbital", "side2": "right"}
+        assert rule.parse("L_ORBI.R") == expected
+        assert rule.validate("L_ORBI.R") is True
+        with self.show_b:
+            assert rule.parse("L_ORBI.R") == expected
+            assert rule.expanded_pattern() == "{side}_{region}.{side}"
+        assert rules.get_rule("default_rule").parse("R_default") == {"side": "right"}
+        # Copies aren't registered, they work with the active session
+        copied = rules.copy_rules()["default_rule"]
+        with self.show_b:
+            assert copied.parse("RGT_default") == {"side": "right"}
+
+    def test_load_save(self):
+        repo = Path(tempfile.mkdtemp())
+        self.show_b.save(repo)
+        loaded = NamingSession(repo)
+        assert sorted(loaded.get_rules().keys()) == ["filename"]
+        assert sorted(loaded.get_tokens().keys()) == ["number", "side"]
+        assert loaded.parse("RGT_007") == {"side": "right", "number": 7}
+        assert rules.get_active_rule().name == "default_rule"
+
+    def test_threads(self):
+        def parse_with(session: NamingSession, name: str):
+            return session.parse(name)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            jobs = [
+                executor.submit(parse_with, self.show_a, "L-ORBI")
+                if index % 2
+                else executor.submit(parse_with, self.show_b, "LFT_012")
+                for index in range(100)
+            ]
+            results = [job.result() for job in jobs]
+        assert results[0] == {"side": "left", "number": 12}
+        assert results[1] == {"side": "left", "region": "orbital"}
+        assert all(result == results[index % 2] for index, result in enumerate(results))
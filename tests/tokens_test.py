@@ -3,6 +3,7 @@ from typing import List
 from vfxnaming import naming as n
 import vfxnaming.rules as rules
 import vfxnaming.tokens as tokens
+from vfxnaming.error import TokenError
 
 import pytest
 
@@ -120,6 +121,81 @@ class Test_Token_Options:
         assert result is expected
 
 
+class Test_Token_OptionIndexes:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tokens.reset_tokens()
+        self.side = tokens.add_token(
+            "side", center="C", left="L", right="R", default="center"
+        )
+
+    def test_parse_after_changes(self):
+        assert self.side.parse("L") == "left"
+        self.side.update_option("left", "LFT")
+        assert self.side.parse("LFT") == "left"
+        assert self.side.has_option_abbreviation("L") is False
+        self.side.remove_option("left")
+        with pytest.raises(TokenError):
+            self.side.parse("LFT")
+        self.side.add_option("left", "L")
+        assert self.side.parse("L") == "left"
+
+    def test_shared_abbreviation(self):
+        self.side.add_option("middle", "C")
+        assert self.side.parse("C") == "center"
+        self.side.remove_option("center")
+        assert self.side.parse("C") == "middle"
+
+    def test_clear_options(self):
+        self.side.clear_options()
+        assert self.side.has_option_abbreviation("C") is False
+        assert self.side.has_option_fullname("center") is False
+
+    def test_solve_casing(self):
+        with pytest.raises(TokenError, match="Check casing"):
+            self.side.solve("Center")
+
+    def test_serialization(self):
+        data = self.side.data()
+        assert "_abbreviations" not in data
+        assert "_lowercase_options" not in data
+        token = tokens.Token.from_data(data)
+        assert token.parse("R") == "right"
+        assert token.has_option_abbreviation("C") is True
+
+
+class Test_Token_OptionsView:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        tokens.reset_tokens()
+        self.side = tokens.add_token(
+            "side", center="C", left="L", right="R", default="center"
+        )
+        self.number = tokens.add_token_number("number", prefix="v", padding=4)
+
+    def test_options_read_only(self):
+        options = self.side.options
+        assert options == {"center": "C", "left": "L", "right": "R"}
+        with pytest.raises(TypeError):
+            options["up"] = "U"
+        self.side.add_option("up", "U")
+        assert options["up"] == "U"
+        self.side.clear_options()
+        assert len(options) == 0
+
+    def test_copy_options(self):
+        options = self.side.copy_options()
+        options["up"] = "U"
+        assert self.side.has_option_fullname("up") is False
+
+    def test_token_number_options(self):
+        options = self.number.options
+        assert options["padding"] == 4
+        with pytest.raises(TypeError):
+            options["padding"] = 2
+        assert self.number.copy_options() == {"prefix": "v", "suffix": "", "padding": 4}
+
+
 class Test_TokenFallback:
     @pytest.fixture(autouse=True)
     def setup(self):
@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+from vfxnaming import naming as n
+import vfxnaming.rules as rules
+import vfxnaming.tokens as tokens
+from vfxnaming.watcher import SessionWatcher
+
+
+def _write(filepath: Path, data):
+    with open(filepath, "w") as fp:
+        json.dump(data, fp)
+    # Make sure the change is noticed even on coarse mtime filesystems
+    stat = filepath.stat()
+    os.utime(filepath, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class Test_SessionWatcher:
+    @pytest.fixture(autouse=True)
+    def setup(self):
+        rules.reset_rules()
+        tokens.reset_tokens()
+        tokens.add_token("side", center="C", left="L", right="R", default="center")
+        tokens.add_token("region", frontal="FRONT", orbital="ORBI")
+        rules.add_rule("base", "{side}-{region}")
+        rules.add_rule("filename", "{@base}_{side}")
+        rules.add_rule("other", "{region}_{side}")
+        rules.set_active_rule("filename")
+        self.repo = Path(tempfile.mkdtemp())
+        n.save_session(self.repo)
+        n.load_session(self.repo)
+        self.watcher = SessionWatcher(self.repo)
+
+    def test_no_changes(self):
+        assert self.watcher.poll() == {"added": [], "changed": [], "removed": []}
+
+    def test_changed_rule(self):
+        other = rules.get_rule("other")
+        other.regex()
+        data = rules.get_rule("base").data()
+        data["_pattern"] = "{side}.{region}"
+        _write(self.repo / "base.rule", data)
+
+        assert self.watcher.poll() == {
+            "added": [],
+            "changed": ["base.rule"],
+            "removed": [],
+        }
+        assert rules.get_rule("base").pattern == "{side}.{region}"
+        assert n.parse("C.FRONT_L") == {
+            "side1": "center",
+            "region": "frontal",
+            "side2": "left",
+        }
+        # Rules not in the changed file are kept as they were
+        assert rules.get_rule("other") is other
+
+    def test_added_and_removed(self):
+        tokens.add_token("type", mesh="MSH")
+        tokens.save_token("type", self.repo)
+        rules.add_rule("typed", "{side}_{type}")
+        rules.save_rule("typed", self.repo)
+        rules.remove_rule("typed")
+        tokens.remove_token("type")
+        os.remove(self.repo / "other.rule")
+
+        assert self.watcher.poll() == {
+            "added": ["type.token", "typed.rule"],
+            "changed": [],
+            "removed": ["other.rule"],
+        }
+        assert rules.has_rule("other") is False
+        assert rules.get_rule("typed").parse("C_MSH") == {
+            "side": "center",
+            "type": "mesh",
+        }
+
+    def test_unreadable_file_retried(self):
+        with open(self.repo / "broken.rule", "w") as fp:
+            fp.write("{")
+        assert self.watcher.poll()["added"] == []
+        assert rules.has_rule("broken") is False
+
+        _write(self.repo / "broken.rule", rules.Rule("broken", "{side}").data())
+        assert self.watcher.poll()["added"] == ["broken.rule"]
+        assert rules.has_rule("broken") is True
+
+    def test_invalid_file_retried(self):
+        data = rules.Rule("broken", "{side}").data()
+        data["_pattern"] = ""
+        _write(self.repo / "broken.rule", data)
+        assert self.watcher.poll()["added"] == []
+        assert rules.has_rule("broken") is False
+
+        data["_pattern"] = "{side}"
+        _write(self.repo / "broken.rule", data)
+        assert self.watcher.poll()["added"] == ["broken.rule"]
+        assert rules.has_rule("broken") is True
+
+    def test_background_keeps_running(self):
+        changes = list()
+        watcher = SessionWatcher(self.repo, interval=0.01, on_change=changes.append)
+        with watcher:
+            data = rules.Rule("broken", "{side}").data()
+            data["_pattern"] = ""
+            _write(self.repo / "broken.rule", data)
+            time.sleep(0.1)
+            assert watcher.is_running is True
+            _write(self.repo / "vfxnaming.conf", {"set_active_rule": "other"})
+            for _ in range(200):
+                if changes:
+                    break
+                time.sleep(0.01)
+            assert watcher.is_running is True
+        assert changes == [{"added": [], "changed": ["vfxnaming.conf"], "removed": []}]
+
+    def test_config_changed(self):
+        _write(self.repo / "vfxnaming.conf", {"set_active_rule": "other"})
+        self.watcher.poll()
+        assert rules.get_active_rule().name == "other"
+
+    def test_background(self):
+        changes = list()
+        watcher = SessionWatcher(self.repo, interval=0.01, on_change=changes.append)
+        with watcher:
+            assert watcher.is_running is True
+            _write(self.repo / "vfxnaming.conf", {"set_active_rule": "other"})
+            for _ in range(200):
+                if changes:
+                    break
+                time.sleep(0.01)
+        assert watcher.is_running is False
+        assert changes == [{"added": [], "changed": ["vfxnaming.conf"], "removed": []}]
+        assert rules.get_active_rule().name == "other"